@@ -1,4 +1,3 @@
-import requests
 import json
 import os
 import time
@@ -17,6 +16,7 @@ from settings_ui import SettingsUI
 from story_generation_menu.main_menu import StoryGenerationMenu
 from folder_manager import FolderManager
 from logging_config import LoggingConfig
+from ollama_client import get_ollama_client, configure_ollama_client
 
 import datetime
 
@@ -36,6 +36,9 @@ class OllamaStoryTeller:
         # Initialize settings manager first
         self.settings = SettingsManager()
         
+        # Configure the shared pooled Ollama client from settings
+        configure_ollama_client(self.settings.settings)
+        
         # Updated folder structure - multiscene organization
         self.blueprint_folder = "multiscene/blueprints"
         self.storyboard_folder = "multiscene/storyboards" 
@@ -93,7 +96,8 @@ class OllamaStoryTeller:
         }
         
         # Initialize folder manager
-        self.folder_manager = FolderManager(self.app_folders)
+        # Folder sizes are rescanned on a worker thread so the main menu doesn't wait on large folders
+        self.folder_manager = FolderManager(self.app_folders, background_refresh=True)
         
         # Initialize logging configuration manager
         self.logging_config = LoggingConfig(self.settings, self.stories_folder)
@@ -142,14 +146,25 @@ class OllamaStoryTeller:
             
         # ... existing F5-TTS settings loading code unchanged ...
         self.f5tts_handler.f5tts_server_url = self.settings.get("f5tts_server_url")
+        self.f5tts_handler.f5tts_server_pool = list(self.settings.get("f5tts_server_pool", []) or [])
         self.f5tts_handler.f5tts_selected_ref = self.settings.get("f5tts_selected_ref")
         self.f5tts_handler.f5tts_ref_text = self.settings.get("f5tts_ref_text")
         self.f5tts_handler.f5tts_remove_silence = self.settings.get("f5tts_remove_silence")
         self.f5tts_handler.f5tts_cross_fade = self.settings.get("f5tts_cross_fade")
         self.f5tts_handler.f5tts_nfe = self.settings.get("f5tts_nfe")
         self.f5tts_handler.f5tts_speed = self.settings.get("f5tts_speed")
-        self.f5tts_handler.tts_timing_data = self.settings.get("f5tts_timing_data")
+        self.f5tts_handler.f5tts_chunk_chars = self.settings.get("f5tts_chunk_chars", 1500)
+        self.f5tts_handler.f5tts_parallel_chunks = self.settings.get("f5tts_parallel_chunks", 2)
+        self.f5tts_handler.f5tts_chunk_retries = self.settings.get("f5tts_chunk_retries", 2)
+        self.f5tts_handler.f5tts_audio_cache_enabled = self.settings.get("f5tts_audio_cache_enabled", True)
+        self.f5tts_handler.f5tts_audio_cache_mb = self.settings.get("f5tts_audio_cache_mb", 500)
         self.f5tts_handler.tts_processed_count = self.settings.get("f5tts_processed_count")
+        
+        # Timing samples used to live in the settings file - move them into the timing model
+        legacy_timing_data = self.settings.get("f5tts_timing_data")
+        if legacy_timing_data:
+            self.f5tts_handler.timing_model.import_samples(self.f5tts_handler.get_timing_key(), legacy_timing_data)
+            self.settings.set("f5tts_timing_data", [])
     def _get_current_llm_settings(self):
         """Get current LLM settings for analyzer and generators"""
         return {
@@ -174,13 +189,13 @@ class OllamaStoryTeller:
         """Save F5-TTS settings from handler"""
         f5tts_updates = {
             "f5tts_server_url": self.f5tts_handler.f5tts_server_url,
+            "f5tts_server_pool": self.f5tts_handler.f5tts_server_pool,
             "f5tts_selected_ref": self.f5tts_handler.f5tts_selected_ref,
             "f5tts_ref_text": self.f5tts_handler.f5tts_ref_text,
             "f5tts_remove_silence": self.f5tts_handler.f5tts_remove_silence,
             "f5tts_cross_fade": self.f5tts_handler.f5tts_cross_fade,
             "f5tts_nfe": self.f5tts_handler.f5tts_nfe,
             "f5tts_speed": self.f5tts_handler.f5tts_speed,
-            "f5tts_timing_data": self.f5tts_handler.tts_timing_data,
             "f5tts_processed_count": self.f5tts_handler.tts_processed_count
         }
         self.settings.update_multiple(f5tts_updates, save_immediately=True)
@@ -191,14 +206,8 @@ class OllamaStoryTeller:
             self.settings.set("auto_generate_audio", False)
     def get_available_models(self):
         """Get list of available Ollama models"""
-        try:
-            response = requests.get("http://localhost:11434/api/tags")
-            if response.status_code == 200:
-                models_data = response.json()
-                return [model['name'] for model in models_data.get('models', [])]
-            return ["llama2", "dolphin3:latest", "mistral"]
-        except:
-            return ["llama2", "dolphin3:latest", "mistral"]
+        models = get_ollama_client().list_models(timeout=None)
+        return models or ["llama2", "dolphin3:latest", "mistral"]
 
     def get_available_blueprints(self):
         """Get list of available story blueprints"""
@@ -357,10 +366,16 @@ class OllamaStoryTeller:
             print(f"12. Instruct mode (instruction prompts): {instruct_status}")
             
             print("13. Prompt Logging & Debugging")
-            print("14. Back to main menu")
+            stream_status = "Enabled" if self.settings.get("stream_generation", False) else "Disabled"
+            print(f"14. Token streaming (save scenes as they generate): {stream_status}")
+            cache_status = "Enabled" if self.settings.get("response_cache_enabled", True) else "Disabled"
+            print(f"15. Response cache (seeded runs): {cache_status}")
+            layout_status = "Cache-friendly (/api/chat)" if self.settings.get("scene_prompt_layout", "classic") == "cache_friendly" else "Classic"
+            print(f"16. Scene prompt layout: {layout_status}")
+            print("17. Back to main menu")
             
             try:
-                choice = input(f"\nSelect option (1-14): ").strip()
+                choice = input(f"\nSelect option (1-17): ").strip()
                 
                 if choice == "1":
                     self.select_model()
@@ -389,9 +404,15 @@ class OllamaStoryTeller:
                 elif choice == "13":
                     self.logging_config.configure_logging_settings()
                 elif choice == "14":
+                    self.settings_ui.toggle_stream_generation()
+                elif choice == "15":
+                    self.settings_ui.configure_response_cache()
+                elif choice == "16":
+                    self.settings_ui.toggle_scene_prompt_layout()
+                elif choice == "17":
                     break
                 else:
-                    print("Invalid option. Please select 1-14.")
+                    print("Invalid option. Please select 1-17.")
                     input("Press Enter to continue...")
                     
             except Exception as e:
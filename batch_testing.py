@@ -335,7 +335,7 @@ class BatchTester:
                 'user_prompt': user_prompt
             }
             
-            filepath = self.model_tester.save_test_result(result, test_info, session_folder)
+            filepath, _ = self.model_tester.save_test_result(result, test_info, session_folder)
             results.append({
                 'model': model,
                 'result': result,
@@ -0,0 +1,126 @@
+"""Measure how much Ollama's prompt cache saves with the cache-friendly scene layout.
+
+Sends the same short "scenes" twice through APIHandler:
+  classic        - scene instructions first, story bible after them (prefix changes every scene)
+  cache_friendly - system prompt + bible as a fixed /api/chat prefix, scene text last
+
+and prints prompt_eval_count / prompt_eval_duration for each call. Ollama only
+counts and times the prompt tokens it could not reuse from its KV cache, so the
+later scenes of the cache-friendly run should drop sharply.
+
+    python benchmark_prompt_cache.py --model llama3.1:8b --scenes 5 --bible my_bible.txt
+"""
+import argparse
+
+from ollama_client import configure_ollama_client
+from generators.api_handler import APIHandler
+from token_metrics import TokenMetrics
+
+SYSTEM_PROMPT = "You are a skilled fiction writer. Write vivid, consistent narrative prose."
+
+SAMPLE_BIBLE_SECTION = """## Characters
+- **Mara Vell** (34): harbor pilot, stubborn, keeps her late brother's compass.
+- **Ilya Storn** (41): customs officer who owes Mara a favor he would rather forget.
+- **Tessa Quill** (19): runaway apprentice cartographer hiding aboard the Gull.
+
+## Setting
+The port city of Saltmarrow, built on terraces above a tidal bay. Fog every morning,
+bells from the lighthouse every quarter hour, smugglers in the lower docks.
+
+## Plot
+Mara must guide a stolen survey ship out of the bay before the customs blockade closes.
+"""
+
+
+def build_bible(path):
+    """Bible from a file, or a sample padded to a realistic size (~3k tokens)"""
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return "\n".join(SAMPLE_BIBLE_SECTION for _ in range(12))
+
+
+def scene_description(scene_number):
+    return (f"Scene {scene_number}: Mara, Ilya and Tessa face a new obstacle in the fog "
+            f"(complication #{scene_number}) and argue about whether to turn back.")
+
+
+def build_prompts(layout, bible, scene_number, total_scenes, max_tokens):
+    """(system_prompt, user_prompt) in the same order SceneWriter uses for each layout"""
+    request = f"Write this scene in full narrative prose ({max_tokens} tokens max):\n\nSCENE TO WRITE:\n{scene_description(scene_number)}\n"
+    context = f"\nSCENE CONTEXT: Scene {scene_number} of {total_scenes}"
+    if layout == "cache_friendly":
+        return f"{SYSTEM_PROMPT}\n\nSTORY BIBLE (for consistency):\n{bible}", request + context
+    return SYSTEM_PROMPT, f"{request}\nSTORY BIBLE (for consistency):\n{bible}\n{context}"
+
+
+def run_layout(layout, args, bible):
+    """Write every scene with one layout; returns the per-scene TokenMetrics"""
+    handler = APIHandler({
+        'model': args.model,
+        'temperature': 0.8,
+        'keep_alive': args.keep_alive,
+        'context_window': args.context_window,
+        'use_response_cache': False,  # Cached responses have no timings
+    })
+
+    print(f"\n{'='*60}\n{layout.upper()} LAYOUT\n{'='*60}")
+    results = []
+    for scene_number in range(1, args.scenes + 1):
+        system_prompt, user_prompt = build_prompts(layout, bible, scene_number, args.scenes, args.max_tokens)
+        response = handler.make_api_call_with_system_prompt(
+            system_prompt, user_prompt, args.max_tokens,
+            stage=f"benchmark_{layout}", use_chat=(layout == "cache_friendly")
+        )
+        metrics = handler.get_last_metrics()
+        if not response or not metrics:
+            print(f"❌ Scene {scene_number} failed - stopping this layout")
+            break
+        results.append(metrics)
+        print(f"   Scene {scene_number}: prompt_eval_count={metrics.prompt_eval_count:,} "
+              f"prompt_eval_duration={metrics.prompt_eval_duration / 1e9:.2f}s")
+    return results
+
+
+def summarize(layout, results):
+    if not results:
+        print(f"   {layout:<15} no results")
+        return
+    total = TokenMetrics.combine(results)
+    later = results[1:] or results
+    later_seconds = sum(m.prompt_eval_duration for m in later) / len(later) / 1e9
+    later_tokens = sum(m.prompt_eval_count for m in later) / len(later)
+    print(f"   {layout:<15} total prefill {total.prompt_eval_duration / 1e9:7.2f}s | "
+          f"scene 1: {results[0].prompt_eval_count:,} tok {results[0].prompt_eval_duration / 1e9:.2f}s | "
+          f"later avg: {later_tokens:,.0f} tok {later_seconds:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare prompt processing time of the scene prompt layouts")
+    parser.add_argument("--model", required=True, help="Ollama model name")
+    parser.add_argument("--scenes", type=int, default=5, help="Scenes per layout (default 5)")
+    parser.add_argument("--bible", help="Story bible text file (default: built-in sample)")
+    parser.add_argument("--max-tokens", type=int, default=64, help="num_predict per scene - kept small, only prefill matters")
+    parser.add_argument("--context-window", type=int, default=8192, help="num_ctx for every call")
+    parser.add_argument("--keep-alive", default="30m", help="Ollama keep_alive")
+    parser.add_argument("--host", help="Ollama host (default: localhost)")
+    args = parser.parse_args()
+
+    configure_ollama_client({'ollama_host': args.host, 'response_cache_enabled': False})
+    bible = build_bible(args.bible)
+    print(f"📖 Bible: {len(bible):,} chars | {args.scenes} scenes per layout | model {args.model}")
+
+    results = {layout: run_layout(layout, args, bible) for layout in ("classic", "cache_friendly")}
+
+    print(f"\n{'='*60}\nSUMMARY (prompt processing)\n{'='*60}")
+    for layout, layout_results in results.items():
+        summarize(layout, layout_results)
+
+    classic = sum(m.prompt_eval_duration for m in results["classic"])
+    friendly = sum(m.prompt_eval_duration for m in results["cache_friendly"])
+    if classic and friendly:
+        print(f"\n♻️ Cache-friendly layout spent {(1 - friendly / classic) * 100:.0f}% less time on prompt processing")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ import os
 import json
 import requests
 from datetime import datetime
+
+from ollama_client import get_ollama_client
 from .menu_handlers import MenuHandlers
 from .config import *
 
@@ -503,8 +505,6 @@ class BlueprintCreator:
     def call_ollama_api(self, model, prompt, max_tokens):
         """Call Ollama API to generate blueprint"""
         try:
-            url = "http://localhost:11434/api/generate"
-            
             data = {
                 "model": model,
                 "prompt": prompt,
@@ -518,7 +518,7 @@ class BlueprintCreator:
             
             print("🔄 Generating blueprint... (this may take a few minutes)")
             
-            response = requests.post(url, json=data, timeout=300)  # 5 minute timeout
+            response = get_ollama_client().post("/api/generate", data, timeout=300)  # 5 minute timeout
             
             if response.status_code == 200:
                 result = response.json()
@@ -666,7 +666,7 @@ class BlueprintCreator:
 def check_ollama_connection():
     """Check if Ollama is running and accessible"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = get_ollama_client().get("/api/tags", timeout=5)
         return response.status_code == 200
     except:
         return False
@@ -675,7 +675,7 @@ def check_ollama_connection():
 def get_available_ollama_models():
     """Get list of available Ollama models"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=10)
+        response = get_ollama_client().get("/api/tags", timeout=10)
         if response.status_code == 200:
             data = response.json()
             return [model['name'] for model in data.get('models', [])]
@@ -1,6 +1,6 @@
 """Configuration and constants for blueprint creation"""
 
-import requests
+from ollama_client import get_ollama_client
 import json
 
 GENRES = [
@@ -128,7 +128,7 @@ def get_model_description(model):
 def get_available_ollama_models():
     """Get list of locally installed Ollama models"""
     try:
-        response = requests.get("http://localhost:11434/api/tags")
+        response = get_ollama_client().get("/api/tags")
         if response.status_code == 200:
             data = response.json()
             models = []
@@ -152,7 +152,7 @@ def get_default_models():
 def check_ollama_connection():
     """Check if Ollama is running and accessible"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = get_ollama_client().get("/api/tags", timeout=5)
         return response.status_code == 200
     except:
         return False
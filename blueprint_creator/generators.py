@@ -1,6 +1,6 @@
 """Blueprint generation logic using Ollama"""
 
-import requests
+from ollama_client import get_ollama_client
 from .config import get_time_estimate, check_ollama_connection
 
 class BlueprintGenerator:
@@ -283,8 +283,6 @@ class BlueprintGenerator:
 
     def call_ollama_for_blueprint(self, prompt, model, blueprint_data):
         """Call Ollama API to generate blueprint content with dynamic settings"""
-        url = "http://localhost:11434/api/generate"
-        
         # Get optimized settings based on blueprint requirements
         generation_options = self.configure_generation_settings(blueprint_data)
         
@@ -296,7 +294,7 @@ class BlueprintGenerator:
         }
         
         try:
-            response = requests.post(url, json=data)
+            response = get_ollama_client().post("/api/generate", data)
             response.raise_for_status()
             result = response.json()
             return result.get("response", "No response generated")
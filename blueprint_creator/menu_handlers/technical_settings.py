@@ -1,6 +1,6 @@
 """Technical settings handlers"""
 from ..config import *
-import requests
+from ollama_client import get_ollama_client
 import time
 
 class TechnicalSettingsHandler:
@@ -16,7 +16,7 @@ class TechnicalSettingsHandler:
 
         # Fast model fetching - no extra details
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
+            response = get_ollama_client().get("/api/tags", timeout=5)
             if response.status_code == 200:
                 models_data = response.json()
                 available_models = [model['name'] for model in models_data.get('models', [])]
@@ -161,7 +161,7 @@ class TechnicalSettingsHandler:
     def _check_ollama_connection(self):
         """Check if Ollama is running and accessible"""
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
+            response = get_ollama_client().get("/api/tags", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -169,7 +169,7 @@ class TechnicalSettingsHandler:
     def _get_available_ollama_models(self):
         """Get list of available Ollama models"""
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
+            response = get_ollama_client().get("/api/tags", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 return [model['name'] for model in data.get('models', [])]
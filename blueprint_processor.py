@@ -1,6 +1,7 @@
-import requests
 import json
 
+from ollama_client import get_ollama_client
+
 class BlueprintProcessor:
     """Handles blueprint modifications like gender swapping"""
     
@@ -30,13 +31,22 @@ class BlueprintProcessor:
         
         return blueprint_content
     
+    def _build_options(self):
+        """Ollama options matching story generation (same sampling, same seed)"""
+        options = {
+            "temperature": self.ollama_settings.get('temperature', 0.8),  # Use same as story
+            "top_p": self.ollama_settings.get('top_p', 0.9),
+            "top_k": self.ollama_settings.get('top_k', 40),
+            "repeat_penalty": self.ollama_settings.get('repeat_penalty', 1.1),
+            "num_predict": self.ollama_settings.get('max_tokens', 4096)  # Use same as story
+        }
+        if self.ollama_settings.get('seed') is not None:
+            options["seed"] = self.ollama_settings['seed']
+        return options
+    
     def _check_ollama_connection(self):
         """Check if Ollama server is running"""
-        try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        return get_ollama_client().is_available()
     
     def _apply_smart_gender_swap(self, blueprint_content, swap_mode):
         """Apply intelligent gender swapping using same settings as story generation"""
@@ -91,32 +101,19 @@ Return the modified blueprint with intelligent gender swaps applied. Maintain th
             print("🧠 Processing gender swap (this may take several minutes like story generation)...")
             
             # Use the SAME settings as story generation - no timeout
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": self.ollama_settings['model'],
-                    "system": system_prompt,
-                    "prompt": user_prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": self.ollama_settings.get('temperature', 0.8),  # Use same as story
-                        "top_p": self.ollama_settings.get('top_p', 0.9),
-                        "top_k": self.ollama_settings.get('top_k', 40),
-                        "repeat_penalty": self.ollama_settings.get('repeat_penalty', 1.1),
-                        "num_predict": self.ollama_settings.get('max_tokens', 4096)  # Use same as story
-                    }
-                }
-                # NO timeout parameter - let it take as long as it needs, just like story generation
-            )
+            # NO timeout parameter - let it take as long as it needs, just like story generation
+            # Seeded runs come back from the response cache when the blueprint hasn't changed
+            result = get_ollama_client().generate({
+                "model": self.ollama_settings['model'],
+                "system": system_prompt,
+                "prompt": user_prompt,
+                "stream": False,
+                "options": self._build_options()
+            })
             
-            if response.status_code == 200:
-                result = response.json()
-                modified_blueprint = result.get('response', blueprint_content)
-                print("✅ Smart gender swap applied to blueprint")
-                return modified_blueprint
-            else:
-                print(f"❌ Error processing blueprint: {response.status_code}")
-                return blueprint_content
+            modified_blueprint = result.get('response', blueprint_content)
+            print("✅ Smart gender swap applied to blueprint")
+            return modified_blueprint
                 
         except Exception as e:
             print(f"❌ Error applying gender swap: {e}")
@@ -154,31 +151,17 @@ Return the modified blueprint with protagonist gender changed to {target_gender}
         try:
             print(f"🧠 Processing protagonist gender change to {target_gender}...")
             
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": self.ollama_settings['model'],
-                    "system": system_prompt,
-                    "prompt": user_prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": self.ollama_settings.get('temperature', 0.8),
-                        "top_p": self.ollama_settings.get('top_p', 0.9),
-                        "top_k": self.ollama_settings.get('top_k', 40),
-                        "repeat_penalty": self.ollama_settings.get('repeat_penalty', 1.1),
-                        "num_predict": self.ollama_settings.get('max_tokens', 4096)
-                    }
-                }
-            )
+            result = get_ollama_client().generate({
+                "model": self.ollama_settings['model'],
+                "system": system_prompt,
+                "prompt": user_prompt,
+                "stream": False,
+                "options": self._build_options()
+            })
             
-            if response.status_code == 200:
-                result = response.json()
-                modified_blueprint = result.get('response', blueprint_content)
-                print(f"✅ Protagonist gender forced to {target_gender}")
-                return modified_blueprint
-            else:
-                print(f"❌ Error processing blueprint: {response.status_code}")
-                return blueprint_content
+            modified_blueprint = result.get('response', blueprint_content)
+            print(f"✅ Protagonist gender forced to {target_gender}")
+            return modified_blueprint
                 
         except Exception as e:
             print(f"❌ Error forcing gender: {e}")
@@ -0,0 +1,232 @@
+import re
+import wave
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# Saved stories mark scenes with runs of '=' and "Scene N" header lines
+SCENE_SEPARATOR = re.compile(r'={10,}')
+SCENE_HEADER = re.compile(r'^(?=Scene \d+\s*$)', re.MULTILINE)
+SENTENCE_END = re.compile(r'(?<=[.!?…])["\'”’)\]]*\s+')
+
+
+def split_text_for_tts(text, max_chars=1500):
+    """Split a story into TTS chunks of at most max_chars
+
+    Chunks never span a scene boundary ('=====' runs are dropped, "Scene N"
+    headers start a new chunk). Inside a scene, whole paragraphs are
+    packed together; a paragraph that is too long is split at sentence ends
+    (and a single huge sentence at the last space before the limit).
+
+    Where a chunk ends is decided by paragraph content, not a running total:
+    a chunk always closes after a paragraph that _is_chunk_boundary() picks
+    (about one per max_chars characters of text). Editing a paragraph
+    therefore only changes the chunks between the boundaries around it, and
+    the rest of the scene keeps its audio cache entries.
+    """
+    scenes = []
+    for block in SCENE_SEPARATOR.split(text):
+        scenes.extend(SCENE_HEADER.split(block))
+
+    chunks = []
+    for scene in scenes:
+        current = ""
+        for paragraph in (p.strip() for p in re.split(r'\n\s*\n', scene)):
+            if not paragraph:
+                continue
+            for piece in _split_paragraph(paragraph, max_chars):
+                if current and len(current) + 2 + len(piece) > max_chars:
+                    chunks.append(current)
+                    current = piece
+                else:
+                    current = f"{current}\n\n{piece}" if current else piece
+            if _is_chunk_boundary(paragraph, max_chars):
+                chunks.append(current)
+                current = ""
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def _is_chunk_boundary(paragraph, max_chars):
+    """True if a chunk should end after this paragraph - depends only on its text
+
+    The chance grows with the paragraph's length, so a boundary comes about
+    every max_chars characters whatever the paragraph sizes are.
+    """
+    digest = hashlib.sha256(paragraph.encode('utf-8')).digest()
+    position = int.from_bytes(digest[:8], 'big') / 2 ** 64
+    return position < len(paragraph) / max_chars
+
+
+def _split_paragraph(paragraph, max_chars):
+    if len(paragraph) <= max_chars:
+        return [paragraph]
+
+    pieces, current = [], ""
+    for sentence in SENTENCE_END.split(paragraph):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def read_wav(path):
+    """Return (float32 samples shaped (frames, channels), sample_rate, sample_width)"""
+    with wave.open(path, 'rb') as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768
+    elif sample_width == 4:
+        samples = np.frombuffer(frames, dtype='<i4').astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width * 8} bit")
+    return samples.reshape(-1, channels), sample_rate, sample_width
+
+
+def write_wav(path, samples, sample_rate, sample_width=2):
+    """Write float samples (frames, channels) as 16/32-bit PCM"""
+    samples = np.clip(samples, -1.0, 1.0)
+    if sample_width == 4:
+        data = (samples * 2147483647).astype('<i4')
+    else:
+        sample_width = 2
+        data = (samples * 32767).astype('<i2')
+
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(samples.shape[1])
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(data.tobytes())
+
+
+def concatenate_with_cross_fade(segments, sample_rate, cross_fade_seconds):
+    """Join audio segments, overlapping each join by cross_fade_seconds with a linear fade"""
+    fade_frames = int(round(cross_fade_seconds * sample_rate))
+    total_frames = sum(len(s) for s in segments)
+    output = np.zeros((total_frames, segments[0].shape[1]), dtype=np.float32)
+
+    position = 0
+    for index, segment in enumerate(segments):
+        overlap = 0
+        if index and fade_frames:
+            # Never overlap more than half of either side of the join
+            overlap = min(fade_frames, position // 2, len(segment) // 2)
+        if overlap:
+            start = position - overlap
+            fade_in = np.linspace(0.0, 1.0, overlap, dtype=np.float32)[:, None]
+            output[start:position] = output[start:position] * (1.0 - fade_in) + segment[:overlap] * fade_in
+            output[position:position + len(segment) - overlap] = segment[overlap:]
+            position += len(segment) - overlap
+        else:
+            output[position:position + len(segment)] = segment
+            position += len(segment)
+
+    return output[:position]
+
+
+class ChunkedTTSSynthesizer:
+    """Synthesizes a long text as concurrent chunks and stitches the WAVs.
+
+    synthesize_chunk(text) must return the path of a WAV file for that text.
+    Chunks are submitted to a bounded thread pool; chunks that fail are retried
+    (only those) up to max_retries more rounds before giving up.
+    """
+
+    def __init__(self, synthesize_chunk, max_workers=2, max_chars=1500, cross_fade=0.15, max_retries=2):
+        self.synthesize_chunk = synthesize_chunk
+        self.max_workers = max(1, max_workers)
+        self.max_chars = max_chars
+        self.cross_fade = cross_fade or 0.0
+        self.max_retries = max_retries
+
+    def synthesize(self, text, output_path):
+        """Write the whole text to output_path; returns True on success"""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("Chunked TTS needs numpy: pip install numpy")
+
+        chunks = split_text_for_tts(text, self.max_chars)
+        if not chunks:
+            print("❌ Nothing to synthesize")
+            return False
+
+        print(f"🧩 Split into {len(chunks)} chunks (≤{self.max_chars:,} chars), {self.max_workers} at a time")
+        chunk_paths = self._synthesize_all(chunks)
+        if chunk_paths is None:
+            return False
+
+        segments = []
+        sample_rate = sample_width = None
+        for index, path in enumerate(chunk_paths, 1):
+            samples, rate, width = read_wav(path)
+            if sample_rate is None:
+                sample_rate, sample_width = rate, width
+            elif rate != sample_rate or samples.shape[1] != segments[0].shape[1]:
+                print(f"❌ Chunk {index} audio format differs ({rate} Hz) from chunk 1 ({sample_rate} Hz)")
+                return False
+            segments.append(samples)
+
+        audio = concatenate_with_cross_fade(segments, sample_rate, self.cross_fade)
+        write_wav(output_path, audio, sample_rate, sample_width)
+        print(f"🔗 Joined {len(segments)} chunks ({len(audio) / sample_rate:.1f}s of audio, "
+              f"{self.cross_fade:.2f}s cross-fade)")
+        return True
+
+    def _synthesize_all(self, chunks):
+        """Return WAV paths in chunk order, or None if some chunk kept failing"""
+        results = {}
+        pending = list(range(len(chunks)))
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                print(f"🔄 Retrying {len(pending)} failed chunk(s) (attempt {attempt + 1})")
+            failed = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._run_chunk, index, chunks[index]): index for index in pending}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                        print(f"   ✅ Chunk {index + 1}/{len(chunks)} done ({len(results)}/{len(chunks)})")
+                    except Exception as e:
+                        failed.append(index)
+                        print(f"   ❌ Chunk {index + 1}/{len(chunks)} failed: {e}")
+            if not failed:
+                return [results[index] for index in range(len(chunks))]
+            pending = sorted(failed)
+
+        print(f"❌ {len(pending)} chunk(s) still failing after {self.max_retries} retries: "
+              f"{', '.join(str(index + 1) for index in pending)}")
+        return None
+
+    def _run_chunk(self, index, text):
+        path = self.synthesize_chunk(text)
+        if not path:
+            raise RuntimeError("no audio returned")
+        return path
@@ -2,17 +2,33 @@ import os
 import glob
 import time
 import shutil
+import tempfile
+import threading
+import urllib.parse
 from datetime import datetime
 
 # Move the imports inside a try-catch block
 try:
+    import httpx  # Installed with gradio-client
+    import gradio_client
     from gradio_client import Client, handle_file
     GRADIO_AVAILABLE = True
 except ImportError:
     GRADIO_AVAILABLE = False
+    gradio_client = None
     Client = None
     handle_file = None
 
+# Reference upload reuse follows gradio-client's own upload and file= URL handling,
+# checked against this release (the one the readme installs). Other versions send
+# the reference file with every request through the public handle_file() API.
+UPLOAD_REUSE_GRADIO_CLIENT = "1.11."
+
+from f5tts_chunked import ChunkedTTSSynthesizer, split_text_for_tts, NUMPY_AVAILABLE
+from tts_audio_cache import TTSAudioCache
+from tts_server_pool import TTSServerPool
+from tts_duration_model import TTSDurationModel
+
 class F5TTSHandler:
     def __init__(self, audio_folder="multiscene/audio"):  # Updated parameter name for clarity
         if not GRADIO_AVAILABLE:
@@ -27,18 +43,33 @@ class F5TTSHandler:
         
         # F5-TTS settings
         self.f5tts_server_url = "http://127.0.0.1:7860"
+        self.f5tts_server_pool = []        # Extra servers; requests are spread over all of them
         self.f5tts_selected_ref = None
         self.f5tts_ref_text = ""
         self.f5tts_remove_silence = False
         self.f5tts_cross_fade = 0.15
         self.f5tts_nfe = 16
         self.f5tts_speed = 1.0
+        self.f5tts_chunk_chars = 1500      # Longer texts are split and synthesized in parallel (0 = never)
+        self.f5tts_parallel_chunks = 2     # Chunk requests in flight at once
+        self.f5tts_chunk_retries = 2       # Extra attempts for chunks that failed
+        self.f5tts_audio_cache_enabled = True  # Reuse audio of unchanged chunks
+        self.f5tts_audio_cache_mb = 500
         self.selected_story_file = None
         self.selected_story_path = None  # Track full path of selected file
         
-        # Timing data for estimation
-        self.tts_timing_data = []
+        # Timing model for estimates, kept across sessions
+        self.timing_model = TTSDurationModel(os.path.join(self.audio_folder, "tts_timing_model.json"))
         self.tts_processed_count = 0
+        self.audio_cache = TTSAudioCache(os.path.join(self.audio_folder, "cache"))
+        
+        # Live Gradio clients and reference uploads, reused for the whole session
+        self._clients = {}               # server url -> (Client, seconds it took to connect)
+        self._reference_uploads = {}     # (server url, ref path, mtime) -> (server file url, upload seconds)
+        self._upload_reuse_failed = set()  # Servers that refused a reused upload - always send the file
+        self._connection_lock = threading.Lock()
+        self._seconds_saved = 0.0        # Connect/upload time skipped during the current _call_f5tts_api
+        self.server_pool = TTSServerPool(self._probe_server)
         
         # Create audio folder
         os.makedirs(self.audio_folder, exist_ok=True)
@@ -105,6 +136,8 @@ class F5TTSHandler:
         
         # Show current settings
         print(f"1. Server URL: {self.f5tts_server_url}")
+        if self.f5tts_server_pool:
+            print(f"   + {len(self.f5tts_server_pool)} more server(s) in the pool")
         print(f"2. F5-TTS reference audio: {self.f5tts_selected_ref or 'None selected'}")
         print(f"3. Remove silence: {self.f5tts_remove_silence}")
         print(f"4. Cross-fade: {self.f5tts_cross_fade}")
@@ -112,9 +145,10 @@ class F5TTSHandler:
         print(f"6. Speed: {self.f5tts_speed}")
         print(f"7. Chosen text file: {self.selected_story_file or 'None selected'}")
         print("8. Generate Audio File")
-        print("9. Back to main menu")
+        print("9. Server pool & throughput")
+        print("10. Back to main menu")
         
-        print("\nSelect option (1-9): ", end="")
+        print("\nSelect option (1-10): ", end="")
     
     def set_server_url(self):
         """Set F5-TTS server URL"""
@@ -132,6 +166,55 @@ class F5TTSHandler:
         
         input("Press Enter to continue...")
     
+    def manage_server_pool(self):
+        """Add/remove extra F5-TTS servers and show per-server throughput"""
+        while True:
+            self._sync_server_pool()
+            print("\n" + "="*60)
+            print("F5-TTS SERVER POOL")
+            print("="*60)
+            print("Requests go to the server with the fewest requests in flight;")
+            print("work of a server that stops responding moves to the others.\n")
+            self.server_pool.show_stats()
+            
+            print("\n1. Add server")
+            print("2. Remove server")
+            print("3. Check all servers now")
+            print("4. Back")
+            choice = input("Select (1-4): ").strip()
+            
+            if choice == "1":
+                new_url = input("Server URL (e.g. http://192.168.1.20:7860): ").strip()
+                if new_url:
+                    if not new_url.startswith("http"):
+                        new_url = "http://" + new_url
+                    if new_url in self.get_server_urls():
+                        print("❌ Server is already in the pool")
+                    else:
+                        self.f5tts_server_pool.append(new_url)
+                        print(f"✓ Added {new_url}")
+            elif choice == "2":
+                if not self.f5tts_server_pool:
+                    print("❌ No extra servers (the main server is set with option 1 of the F5-TTS menu)")
+                    continue
+                for i, url in enumerate(self.f5tts_server_pool, 1):
+                    print(f"{i}. {url}")
+                try:
+                    index = int(input(f"Remove server (1-{len(self.f5tts_server_pool)}): ")) - 1
+                    if 0 <= index < len(self.f5tts_server_pool):
+                        print(f"✓ Removed {self.f5tts_server_pool.pop(index)}")
+                    else:
+                        print("❌ Invalid choice.")
+                except ValueError:
+                    print("❌ Invalid input.")
+            elif choice == "3":
+                for url, healthy in self.server_pool.probe_all().items():
+                    print(f"{'✅' if healthy else '❌'} {url}")
+            elif choice == "4":
+                break
+            else:
+                print("❌ Invalid choice")
+    
     def select_reference_audio(self):
         """Select reference audio file with automatic .txt pairing"""
         try:
@@ -421,7 +504,31 @@ class F5TTSHandler:
         print("-" * 50)
         
         # Generate output filename with new naming convention
-        story_name = os.path.splitext(self.selected_story_file)[0]  # Remove .txt extension
+        output_path = self.get_audio_output_path(self.selected_story_file)
+        if not output_path:
+            print("❌ Too many existing audio files with similar names!")
+            input("Press Enter to continue...")
+            return
+        
+        final_filename = os.path.basename(output_path)
+        print(f"🎧 Output filename: {final_filename}")
+        print(f"🎧 Full path: {output_path}")
+        print("⏳ This may take several minutes for long stories...")
+        
+        # Call F5-TTS API
+        success = self._call_f5tts_api(story_content, output_path)
+        
+        if success:
+            print(f"✅ Audio generation completed successfully!")
+            print(f"📁 Saved to: {output_path}")
+        else:
+            print(f"❌ Audio generation failed.")
+        
+        input("Press Enter to continue...")
+    
+    def get_audio_output_path(self, story_file_name):
+        """storyname.referencename.wav in the audio folder (.01, .02... if taken); None if all taken"""
+        story_name = os.path.splitext(os.path.basename(story_file_name))[0]  # Remove .txt extension
         
         # Limit story name to 30 characters
         if len(story_name) > 30:
@@ -431,8 +538,7 @@ class F5TTSHandler:
         ref_audio_basename = os.path.splitext(os.path.basename(self.f5tts_selected_ref))[0]
         
         # Create base filename: storyname.referencename.wav
-        base_filename = f"{story_name}.{ref_audio_basename}.wav"
-        output_path = os.path.join(self.audio_folder, base_filename)
+        output_path = os.path.join(self.audio_folder, f"{story_name}.{ref_audio_basename}.wav")
         
         # Check if file exists and add .01, .02, etc. if needed
         counter = 1
@@ -443,121 +549,87 @@ class F5TTSHandler:
             
             # Safety check to prevent infinite loop
             if counter > 99:
-                print("❌ Too many existing audio files with similar names!")
-                input("Press Enter to continue...")
-                return
-        
-        final_filename = os.path.basename(output_path)
-        print(f"🎧 Output filename: {final_filename}")
-        print(f"🎧 Full path: {output_path}")
-        print("⏳ This may take several minutes for long stories...")
-        
-        # Call F5-TTS API
-        success = self._call_f5tts_api(story_content, output_path)
+                return None
         
-        if success:
-            print(f"✅ Audio generation completed successfully!")
-            print(f"📁 Saved to: {output_path}")
-        else:
-            print(f"❌ Audio generation failed.")
-        
-        input("Press Enter to continue...")
+        return output_path
     
     def _call_f5tts_api(self, text_content, output_path):
         """
         Call F5-TTS API to generate audio using gradio client
         """
+        start_time = time.time()
         try:
+            # The reference clip is hashed for the cache key and sent to the server
+            if not self.f5tts_selected_ref or not os.path.isfile(self.f5tts_selected_ref):
+                print(f"❌ Reference audio not found: {self.f5tts_selected_ref}")
+                return False
+            
             # Count words and characters for timing info
             number_of_words = len(text_content.split())
             char_count = len(text_content)
             
-            # Calculate estimated processing time based on historical data
-            estimated_time = None
-            if self.tts_timing_data:
-                if len(self.tts_timing_data) >= 3:
-                    # Calculate average time per character
-                    total_chars = sum(item[0] for item in self.tts_timing_data)
-                    total_time = sum(item[1] for item in self.tts_timing_data)
-                    avg_time_per_char = total_time / total_chars
-                    estimated_time = avg_time_per_char * char_count
-                    print(f"📊 Estimated processing time: {estimated_time:.1f} seconds")
-                else:
-                    # Simple estimation based on most recent processing
-                    recent_time_per_char = self.tts_timing_data[-1][1] / self.tts_timing_data[-1][0]
-                    estimated_time = recent_time_per_char * char_count
-                    print(f"📊 Estimated processing time: {estimated_time:.1f} seconds")
-            else:
-                print("📊 First time processing - will establish timing baseline")
+            # With the audio cache every chunk is looked up first, so unchanged ones are reused
+            use_cache = self._audio_cache_active()
+            use_chunks = NUMPY_AVAILABLE and self.f5tts_chunk_chars and (use_cache or char_count > self.f5tts_chunk_chars)
+            
+            # Only chunks missing from the cache take server time
+            synth_char_count = self._uncached_char_count(text_content) if use_cache else char_count
             
-            # Determine if we should recalibrate timing
-            should_recalibrate = (char_count >= 3000 and char_count <= 4000) or not self.tts_timing_data
-            if should_recalibrate:
-                print("🔧 Character count in calibration range - will update timing model")
+            # Estimate from earlier runs with the same server/NFE/speed/chunking
+            timing_key = self.get_timing_key(use_chunks)
+            estimate = self.timing_model.estimate(timing_key, synth_char_count) if synth_char_count else None
+            estimated_time = estimate[0] if estimate else None
+            if synth_char_count:
+                self._print_estimate(estimate, timing_key)
             
             print(f"📝 Processing {number_of_words} words ({char_count:,} characters)")
             
             start_time = time.time()
+            self._seconds_saved = 0.0
+            self._sync_server_pool()
             
-            # Create Gradio client
-            client = Client(self.f5tts_server_url)
-            
-            # Call F5-TTS API
-            result = client.predict(
-                ref_audio_input=handle_file(self.f5tts_selected_ref),
-                ref_text_input=self.f5tts_ref_text,
-                gen_text_input=text_content,
-                remove_silence=self.f5tts_remove_silence,
-                cross_fade_duration_slider=float(self.f5tts_cross_fade),
-                nfe_slider=int(self.f5tts_nfe),
-                speed_slider=float(self.f5tts_speed),
-                api_name="/basic_tts",
-            )
+            if use_chunks:
+                # Long text: several smaller requests in parallel, stitched together locally
+                cache_hits_dir = tempfile.mkdtemp(prefix="f5tts_cache_hits_") if use_cache else None
+                synthesizer = ChunkedTTSSynthesizer(
+                    (lambda text: self._synthesize_cached_chunk(text, cache_hits_dir)) if use_cache
+                    else self._synthesize_chunk,
+                    max_workers=int(self.f5tts_parallel_chunks or 1) * max(1, self.server_pool.healthy_count()),
+                    max_chars=int(self.f5tts_chunk_chars),
+                    cross_fade=float(self.f5tts_cross_fade),
+                    max_retries=int(self.f5tts_chunk_retries)
+                )
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                try:
+                    success = synthesizer.synthesize(text_content, output_path)
+                finally:
+                    if cache_hits_dir:
+                        shutil.rmtree(cache_hits_dir, ignore_errors=True)
+            else:
+                success = self._synthesize_single(text_content, output_path)
             
             end_time = time.time()
             elapsed_time = end_time - start_time
             
-            # Update timing data
-            if should_recalibrate:
-                self.tts_timing_data.append((char_count, elapsed_time))
-                # Keep only the last 5 timing data points
-                if len(self.tts_timing_data) > 5:
-                    self.tts_timing_data.pop(0)
+            if not success:
+                return False
             
+            if synth_char_count:
+                self.timing_model.record(timing_key, synth_char_count, elapsed_time)
             self.tts_processed_count += 1
             
             print(f"⏱️  Processing completed in {elapsed_time:.1f} seconds")
+            if self._seconds_saved >= 0.1:
+                print(f"♻️  Reused F5-TTS connection/reference upload: est. ~{self._seconds_saved:.1f} seconds saved "
+                      f"(first connect/upload times, not measured per request)")
             
-            if estimated_time is not None:
+            if estimated_time:
                 error_percentage = abs(estimated_time - elapsed_time) / elapsed_time * 100
                 print(f"📊 Estimation accuracy: {100 - error_percentage:.1f}%")
             
-            # Get the generated audio file path
-            source_audio_path = result[0]
-            
-            if not os.path.exists(source_audio_path):
-                print(f"❌ Generated audio file not found: {source_audio_path}")
-                return False
-            
-            # Copy the file to our desired location
-            try:
-                # Ensure output directory exists
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                
-                # Copy the generated audio file
-                shutil.copy2(source_audio_path, output_path)
-                
-                if os.path.exists(output_path):
-                    file_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
-                    print(f"💾 Audio file saved successfully ({file_size:.1f}MB)")
-                    return True
-                else:
-                    print(f"❌ Failed to save audio file to: {output_path}")
-                    return False
-                    
-            except Exception as copy_error:
-                print(f"❌ Error copying audio file: {copy_error}")
-                return False
+            file_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
+            print(f"💾 Audio file saved successfully ({file_size:.1f}MB)")
+            return True
             
         except Exception as e:
             end_time = time.time()
@@ -567,6 +639,229 @@ class F5TTSHandler:
             print("❌ Make sure F5-TTS is installed and running on the specified server URL")
             return False
     
+    def _audio_cache_active(self):
+        """Apply the cache settings; True if unchanged chunks can come from the cache"""
+        self.audio_cache.enabled = bool(self.f5tts_audio_cache_enabled)
+        self.audio_cache.max_bytes = int(float(self.f5tts_audio_cache_mb or 0) * 1024 * 1024)
+        return NUMPY_AVAILABLE and self.audio_cache.enabled and bool(self.f5tts_chunk_chars)
+    
+    def _audio_cache_key(self, text):
+        """Cache key: chunk text + reference audio content + every setting that changes the sound"""
+        params = {
+            'ref_text': self.f5tts_ref_text,
+            'remove_silence': bool(self.f5tts_remove_silence),
+            'cross_fade': float(self.f5tts_cross_fade),
+            'nfe': int(self.f5tts_nfe),
+            'speed': float(self.f5tts_speed),
+        }
+        return TTSAudioCache.make_key(text, self.audio_cache.file_hash(self.f5tts_selected_ref), params)
+    
+    def _uncached_char_count(self, text_content):
+        """Characters of the chunks that are not in the audio cache yet"""
+        chunks = split_text_for_tts(text_content, int(self.f5tts_chunk_chars))
+        missing = [c for c in chunks if not self.audio_cache.contains(self._audio_cache_key(c))]
+        if len(missing) < len(chunks):
+            print(f"♻️  {len(chunks) - len(missing)}/{len(chunks)} chunks already in the audio cache")
+        return sum(len(c) for c in missing)
+    
+    def _synthesize_cached_chunk(self, text, hits_dir):
+        """_synthesize_chunk that reuses the audio of chunks voiced before with the same settings
+        
+        A hit is copied into hits_dir (removed after the join), so eviction by
+        another worker can't delete it before the chunks are stitched together.
+        """
+        key = self._audio_cache_key(text)
+        cached_path = self.audio_cache.get(key, os.path.join(hits_dir, f"{key}.wav"))
+        if cached_path:
+            return cached_path
+        source_audio_path = self._synthesize_chunk(text)
+        self.audio_cache.put(key, source_audio_path)
+        return source_audio_path
+    
+    def get_timing_key(self, use_chunks=False):
+        """Timing model key for the current server/NFE/speed settings"""
+        parallel_chunks = int(self.f5tts_parallel_chunks or 1) if use_chunks else 1
+        servers = " + ".join(self.get_server_urls())
+        return TTSDurationModel.make_key(servers, self.f5tts_nfe, self.f5tts_speed, parallel_chunks)
+    
+    def estimate_duration(self, char_count):
+        """(seconds, low, high) for a text of char_count characters with the current settings, or None"""
+        use_chunks = NUMPY_AVAILABLE and self.f5tts_chunk_chars and (
+            self._audio_cache_active() or char_count > self.f5tts_chunk_chars)
+        return self.timing_model.estimate(self.get_timing_key(use_chunks), char_count)
+    
+    def _print_estimate(self, estimate, timing_key):
+        if not estimate:
+            print("📊 First run with these settings - will establish timing baseline")
+            return
+        seconds, low, high = estimate
+        if low is None:
+            print(f"📊 Estimated processing time: {seconds:.1f} seconds ({self.timing_model.describe(timing_key)})")
+        else:
+            print(f"📊 Estimated processing time: {seconds:.1f} seconds (95%: {low:.1f}-{high:.1f}s)")
+            print(f"   Timing model: {self.timing_model.describe(timing_key)}")
+    
+    def get_server_urls(self):
+        """Main server URL followed by the extra pool servers"""
+        return list(dict.fromkeys(url for url in [self.f5tts_server_url] + list(self.f5tts_server_pool or []) if url))
+    
+    def _sync_server_pool(self):
+        self.server_pool.set_servers(self.get_server_urls())
+    
+    @staticmethod
+    def _probe_server(server_url):
+        """Health probe: the Gradio app answers its root page"""
+        try:
+            return httpx.get(server_url, timeout=5).status_code < 500
+        except Exception:
+            return False
+    
+    def _synthesize_chunk(self, text):
+        """One /basic_tts request on the least busy pool server; returns the path of the WAV it produced"""
+        while True:
+            server_url = self.server_pool.acquire()
+            start_time = time.time()
+            try:
+                path = self._synthesize_on_server(server_url, text)
+            except Exception:
+                self.server_pool.release(server_url, ok=False)
+                # A dead node's request goes to another server; a real error is raised as before
+                if len(self.server_pool.urls) > 1 and self.server_pool.check_failed_server(server_url):
+                    continue
+                raise
+            self.server_pool.release(server_url, len(text), time.time() - start_time)
+            return path
+    
+    def _synthesize_on_server(self, server_url, text):
+        client, saved = self._get_client(server_url)
+        ref_audio, upload_saved = self._get_reference_audio(client, server_url)
+        
+        try:
+            result = self._predict(client, ref_audio, text)
+        except Exception:
+            self._forget_server(server_url)  # Server may have restarted - reconnect next time
+            if upload_saved is None or not self._probe_server(server_url):
+                raise
+            # The server refused the file we uploaded earlier - send the file itself from now on
+            print("⚠️ F5-TTS server did not accept the reused reference upload - uploading it with each request")
+            self._upload_reuse_failed.add(server_url)
+            client, saved = self._get_client(server_url)
+            ref_audio, upload_saved = handle_file(self.f5tts_selected_ref), None
+            result = self._predict(client, ref_audio, text)
+        
+        with self._connection_lock:
+            self._seconds_saved += saved + (upload_saved or 0.0)
+        return result[0]
+    
+    def _predict(self, client, ref_audio, text):
+        return client.predict(
+            ref_audio_input=ref_audio,
+            ref_text_input=self.f5tts_ref_text,
+            gen_text_input=text,
+            remove_silence=self.f5tts_remove_silence,
+            cross_fade_duration_slider=float(self.f5tts_cross_fade),
+            nfe_slider=int(self.f5tts_nfe),
+            speed_slider=float(self.f5tts_speed),
+            api_name="/basic_tts",
+        )
+    
+    def _get_client(self, server_url):
+        """(client, seconds saved) - connects once per server URL, later calls save the connect time"""
+        with self._connection_lock:
+            if server_url in self._clients:
+                client, connect_seconds = self._clients[server_url]
+                return client, connect_seconds
+            
+            start_time = time.time()
+            client = Client(server_url)
+            self._clients[server_url] = (client, time.time() - start_time)
+            return client, 0.0
+    
+    def _get_reference_audio(self, client, server_url):
+        """(ref_audio_input, seconds saved or None) - the reference clip is uploaded once per server
+        
+        Later requests send the server-side file URL instead of the file. None means the
+        file is sent with the request as before (upload failed or the server refused reuse).
+        """
+        ref_path = os.path.abspath(self.f5tts_selected_ref)
+        if server_url in self._upload_reuse_failed or not self._upload_reuse_supported():
+            return handle_file(ref_path), None
+        
+        key = (server_url, ref_path, os.path.getmtime(ref_path))
+        with self._connection_lock:
+            if key in self._reference_uploads:
+                file_url, upload_seconds = self._reference_uploads[key]
+                return handle_file(file_url), upload_seconds
+            
+            start_time = time.time()
+            try:
+                file_url = self._upload_reference(client, ref_path)
+            except Exception as e:
+                print(f"⚠️ Could not pre-upload reference audio ({e}) - sending it with each request")
+                self._upload_reuse_failed.add(server_url)
+                return handle_file(ref_path), None
+            self._reference_uploads[key] = (file_url, time.time() - start_time)
+            return handle_file(file_url), 0.0
+    
+    @staticmethod
+    def _upload_reuse_supported():
+        """True for the gradio-client release the reference upload reuse was checked against"""
+        return getattr(gradio_client, '__version__', '').startswith(UPLOAD_REUSE_GRADIO_CLIENT)
+    
+    @staticmethod
+    def _upload_reference(client, ref_path):
+        """Upload a file the way gradio-client 1.11 does before a predict; returns its server-side URL
+        
+        handle_file() of that URL is passed through by predict() without another upload.
+        """
+        with open(ref_path, 'rb') as f:
+            response = httpx.post(
+                client.upload_url,
+                headers=client.headers,
+                cookies=client.cookies,
+                verify=client.ssl_verify,
+                files=[("files", (os.path.basename(ref_path), f))],
+                **{'timeout': 60, **client.httpx_kwargs},
+            )
+        response.raise_for_status()
+        server_path = response.json()[0]
+        # Same file= URL gradio-client builds when it downloads a server file
+        return urllib.parse.urljoin(client.src_prefixed, f"file={server_path}")
+    
+    def _forget_server(self, server_url):
+        """Drop the client and uploads of a server so the next request starts fresh"""
+        with self._connection_lock:
+            self._clients.pop(server_url, None)
+            for key in [key for key in self._reference_uploads if key[0] == server_url]:
+                del self._reference_uploads[key]
+    
+    def _synthesize_single(self, text_content, output_path):
+        """Whole text in one request (short texts, or numpy not installed)"""
+        # Get the generated audio file path
+        source_audio_path = self._synthesize_chunk(text_content)
+        
+        if not os.path.exists(source_audio_path):
+            print(f"❌ Generated audio file not found: {source_audio_path}")
+            return False
+        
+        # Copy the file to our desired location
+        try:
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            
+            # Copy the generated audio file
+            shutil.copy2(source_audio_path, output_path)
+            
+            if os.path.exists(output_path):
+                return True
+            else:
+                print(f"❌ Failed to save audio file to: {output_path}")
+                return False
+                
+        except Exception as copy_error:
+            print(f"❌ Error copying audio file: {copy_error}")
+            return False
+    
     def run_f5tts_menu(self):
         """Run the F5-TTS menu loop"""
         while True:
@@ -592,9 +887,11 @@ class F5TTSHandler:
                 elif choice == "8":
                     self.generate_audio_file()
                 elif choice == "9":
+                    self.manage_server_pool()
+                elif choice == "10":
                     break
                 else:
-                    print("❌ Invalid option. Please select 1-9.")
+                    print("❌ Invalid option. Please select 1-10.")
                     input("Press Enter to continue...")
                     
             except KeyboardInterrupt:
@@ -1,9 +1,14 @@
 import os
 import datetime
 import glob
+import threading
+import time
 
 class FolderManager:
-    def __init__(self, app_folders):
+    MENU_WAIT = 0.5  # Seconds the menu waits for the first background scan
+    CACHE_SECONDS = 60  # A directory's cached totals are rescanned at least this often
+
+    def __init__(self, app_folders, background_refresh=False):
         """
         Initialize with dictionary of folder names and paths
         app_folders = {
@@ -13,27 +18,69 @@ class FolderManager:
         }
         """
         self.app_folders = app_folders
+        # With background_refresh the main menu shows the last stats while a worker thread rescans
+        self.background_refresh = background_refresh
+        self._dir_cache = {}  # directory path -> (mtime_ns, size, file count, latest mtime, subdirectories, scanned at)
+        self._scan_lock = threading.Lock()
+        self._last_stats = None
+        self._refresh_thread = None
+
+    def _scan_directory(self, path):
+        """(size, file_count, latest_mtime) of a directory tree in one os.scandir pass
+
+        Each directory's own files are cached with the directory mtime, which
+        changes when files are added, removed or renamed. An unchanged
+        directory costs one stat; its subdirectories are still checked.
+        Files that grow in place don't touch the directory mtime, so cached
+        entries are also rescanned after CACHE_SECONDS.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._dir_cache.pop(path, None)
+            return 0, 0, 0
+
+        now = time.time()
+        cached = self._dir_cache.get(path)
+        if cached and cached[0] == mtime and now - cached[5] < self.CACHE_SECONDS:
+            _, size, count, latest, subdirs, _ = cached
+        else:
+            size = count = 0
+            latest = 0
+            subdirs = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                            elif entry.is_file():
+                                stat = entry.stat()
+                                size += stat.st_size
+                                count += 1
+                                latest = max(latest, stat.st_mtime)
+                        except OSError:
+                            # Skip files that can't be accessed
+                            continue
+            except OSError:
+                # If we can't access the folder, count it as empty
+                return 0, 0, 0
+            self._dir_cache[path] = (mtime, size, count, latest, tuple(subdirs), now)
+
+        for subdir in subdirs:
+            sub_size, sub_count, sub_latest = self._scan_directory(subdir)
+            size += sub_size
+            count += sub_count
+            latest = max(latest, sub_latest)
+        return size, count, latest
+
+    def _folder_totals(self, folder_path):
+        with self._scan_lock:
+            return self._scan_directory(os.path.abspath(folder_path))
 
     def get_folder_size(self, folder_path):
         """Calculate total size of a folder in bytes"""
-        if not os.path.exists(folder_path):
-            return 0
-        
-        total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(folder_path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except (OSError, FileNotFoundError):
-                        # Skip files that can't be accessed
-                        continue
-        except (OSError, PermissionError):
-            # If we can't access the folder, return 0
-            return 0
-        
-        return total_size
+        return self._folder_totals(folder_path)[0]
 
     def format_size(self, size_bytes):
         """Convert bytes to human readable format"""
@@ -63,17 +110,7 @@ class FolderManager:
 
     def count_files_in_folder(self, folder_path):
         """Count total files in a folder"""
-        if not os.path.exists(folder_path):
-            return 0
-        
-        file_count = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(folder_path):
-                file_count += len(filenames)
-        except (OSError, PermissionError):
-            return 0
-        
-        return file_count
+        return self._folder_totals(folder_path)[1]
 
     def get_folder_stats(self):
         """Get statistics for all app folders"""
@@ -81,12 +118,12 @@ class FolderManager:
         total_size = 0
         
         for folder_name, folder_path in self.app_folders.items():
-            size = self.get_folder_size(folder_path)
-            file_count = self.count_files_in_folder(folder_path)
+            size, file_count, latest_mtime = self._folder_totals(folder_path)
             stats[folder_name] = {
                 'size': size,
                 'formatted_size': self.format_size(size),
-                'file_count': file_count
+                'file_count': file_count,
+                'latest_mtime': latest_mtime
             }
             total_size += size
         
@@ -95,8 +132,26 @@ class FolderManager:
             'formatted_size': self.format_size(total_size)
         }
         
+        self._last_stats = stats
         return stats
 
+    def refresh_stats_in_background(self):
+        """Start recomputing the folder stats on a worker thread (if one isn't running)"""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return self._refresh_thread
+        self._refresh_thread = threading.Thread(target=self.get_folder_stats, name="FolderStats", daemon=True)
+        self._refresh_thread.start()
+        return self._refresh_thread
+
+    def _menu_stats(self):
+        """Stats for the main menu; with background_refresh the menu waits at most MENU_WAIT seconds"""
+        if not self.background_refresh:
+            return self.get_folder_stats()
+        thread = self.refresh_stats_in_background()
+        if self._last_stats is None:
+            thread.join(self.MENU_WAIT)
+        return self._last_stats
+
     def display_folder_stats_in_menu(self, current_model, current_blueprint):
         """Display folder usage statistics in the main menu"""
         print("\n" + "="*70)
@@ -110,7 +165,10 @@ class FolderManager:
         print("\nFolder Usage:")
         print("-" * 70)
         
-        stats = self.get_folder_stats()
+        stats = self._menu_stats()
+        if stats is None:
+            print("Scanning folders... (sizes appear on the next menu refresh)")
+            return
         
         # Display each folder with aligned formatting
         for folder_name, folder_stats in stats.items():
@@ -150,24 +208,11 @@ class FolderManager:
                 if os.path.exists(folder_path):
                     print(f"   Status: Exists")
                     
-                    # Show recent activity (optional)
-                    try:
-                        # Get most recent file modification time
-                        latest_time = 0
-                        for root, dirs, files in os.walk(folder_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                try:
-                                    mtime = os.path.getmtime(file_path)
-                                    latest_time = max(latest_time, mtime)
-                                except OSError:
-                                    continue
-                        
-                        if latest_time > 0:
-                            modified = datetime.datetime.fromtimestamp(latest_time)
-                            print(f"   Last Activity: {modified.strftime('%Y-%m-%d %H:%M:%S')}")
-                    except:
-                        pass
+                    # Most recent file modification time (from the same scan)
+                    latest_time = folder_stats.get('latest_mtime', 0)
+                    if latest_time > 0:
+                        modified = datetime.datetime.fromtimestamp(latest_time)
+                        print(f"   Last Activity: {modified.strftime('%Y-%m-%d %H:%M:%S')}")
                 else:
                     print(f"   Status: Does not exist")
         
@@ -1,7 +1,14 @@
 import os
-import requests
+import time
+import threading
 from datetime import datetime
 
+from ollama_client import get_ollama_client
+from token_metrics import TokenMetrics
+
+# Used when neither the settings nor /api/show give a context size
+DEFAULT_CONTEXT_WINDOW = 8192
+
 class APIHandler:
     def __init__(self, llm_settings, prompt_logger=None):
         self.llm_settings = llm_settings
@@ -13,32 +20,70 @@ class APIHandler:
         # Extract the new mode settings
         self.thinking_mode_enabled = llm_settings.get('thinking_mode_enabled', False)
         self.instruct_mode_enabled = llm_settings.get('instruct_mode_enabled', False)
+        
+        # Token streaming: feedback while long scenes generate, tokens reach disk as they arrive
+        self.stream_enabled = llm_settings.get('stream_generation', False)
+        self.stream_progress_interval = 500  # Print a progress line every N streamed tokens
+        
+        # Set to False to always hit Ollama even for seeded requests
+        self.use_response_cache = llm_settings.get('use_response_cache', True)
+        
+        # e.g. "30m" - how long Ollama keeps the model loaded after a call
+        self.keep_alive = llm_settings.get('keep_alive')
+        
+        # One num_ctx for every call - changing it between calls makes Ollama reload the model
+        self._context_window = None
+        
+        # Measured token metrics for every call (scenes may run on several threads)
+        self.metrics_history = []
+        self._metrics_lock = threading.Lock()
+        self._last_call = threading.local()
     
-    def make_api_call_with_system_prompt(self, system_prompt, user_prompt, max_tokens, stage="unknown"):
-        """Make API call with system prompt and log the exchange"""
+    def make_api_call_with_system_prompt(self, system_prompt, user_prompt, max_tokens, stage="unknown", on_token=None,
+                                         use_chat=False):
+        """Make API call with system prompt and log the exchange
+        
+        on_token: optional callable receiving each streamed text chunk (forces streaming)
+        use_chat: send system/user as separate /api/chat messages so a system prompt shared
+                  by several calls stays an identical prefix Ollama can reuse from its KV cache
+        """
+        
+        self._last_call.metrics = None
         
         try:
-            # Prepare the API request
-            url = "http://localhost:11434/api/generate"
-            
             # Apply instruct mode formatting if enabled
             if self.instruct_mode_enabled:
                 system_prompt = self._format_instruct_system_prompt(system_prompt)
                 user_prompt = self._format_instruct_user_prompt(user_prompt)
             
-            # Build the full prompt (system + user)
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{user_prompt}"
+            if use_chat:
+                # Static content first: thinking control + system prompt form the shared prefix
+                system_content = system_prompt or ""
+                if not self.thinking_mode_enabled:
+                    system_content = self._add_no_thinking_instructions(system_content)
+                
+                messages = []
+                if system_content:
+                    messages.append({"role": "system", "content": system_content})
+                messages.append({"role": "user", "content": user_prompt})
+                api_path = "/api/chat"
+                payload = {"messages": messages}
             else:
-                full_prompt = user_prompt
-            
-            # Add thinking mode control
-            if not self.thinking_mode_enabled:
-                full_prompt = self._add_no_thinking_instructions(full_prompt)
+                # Build the full prompt (system + user)
+                if system_prompt:
+                    full_prompt = f"{system_prompt}\n\n{user_prompt}"
+                else:
+                    full_prompt = user_prompt
+                
+                # Add thinking mode control
+                if not self.thinking_mode_enabled:
+                    full_prompt = self._add_no_thinking_instructions(full_prompt)
+                api_path = "/api/generate"
+                payload = {"prompt": full_prompt}
             
             data = {
                 "model": self.llm_settings['model'],
-                "prompt": full_prompt,
+                **payload,
                 "stream": False,
                 "options": {
                     "num_predict": max_tokens,
@@ -66,22 +111,51 @@ class APIHandler:
                     data["options"]["thinking"] = False
                     data["options"]["show_thoughts"] = False
             
+            data["options"]["num_ctx"] = self.get_context_window()
+            
+            # Keep the model (and its prompt cache) loaded between calls
+            if self.keep_alive:
+                data["keep_alive"] = self.keep_alive
+            
             # Add seed if specified
             seed = self.llm_settings.get('seed')
             if seed is not None:
                 data["options"]["seed"] = seed
             
-            # Make the API call with configurable timeout
+            # Make the API call with configurable timeout over the shared pooled session
+            client = get_ollama_client()
             if self.request_timeout:
                 print(f"   ⏱️ Using {self.request_timeout}s timeout")
-                response = requests.post(url, json=data, timeout=self.request_timeout)
             else:
                 print(f"   ♾️ Using no timeout (unlimited wait)")
-                response = requests.post(url, json=data)
             
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get('response', '')
+            # Seeded / temperature 0 requests may already have a cached answer
+            cached = client.cached_result(data) if self.use_response_cache else None
+            if cached is not None:
+                result = cached
+                response_text = self._response_text(client, result)
+                status_ok = True
+                print(f"   💾 [{stage}] Response cache hit - skipped generation")
+                if on_token:
+                    on_token(response_text)
+            elif self.stream_enabled or on_token:
+                response_text, result = self._stream_generate(client, data, stage, on_token, api_path)
+                status_ok = True
+                if self.use_response_cache:
+                    client.cache_result(data, dict(result, response=response_text))
+            else:
+                response = client.post(api_path, data, timeout=self.request_timeout)
+                status_ok = response.status_code == 200
+                if status_ok:
+                    result = response.json()
+                    response_text = self._response_text(client, result)
+                    if self.use_response_cache:
+                        client.cache_result(data, result)
+            
+            if status_ok:
+                metrics = self._record_metrics(result, stage, cached=cached is not None)
+                if cached is None and metrics.has_data:
+                    print(f"   🚀 Ollama: {metrics.summary()}")
                 
                 # Post-process if thinking mode is disabled (fallback cleanup)
                 if not self.thinking_mode_enabled:
@@ -94,7 +168,8 @@ class APIHandler:
                         system_prompt=system_prompt,
                         user_prompt=user_prompt,
                         response=response_text,
-                        max_tokens=max_tokens
+                        max_tokens=max_tokens,
+                        metrics=metrics
                     )
                 
                 return response_text
@@ -130,6 +205,79 @@ class APIHandler:
             
             return None
     
+    @staticmethod
+    def _response_text(client, result):
+        """Text of a /api/generate or /api/chat result (cached streamed results store 'response')"""
+        if 'response' in result:
+            return result['response']
+        return client.chunk_text(result)
+    
+    def _stream_generate(self, client, data, stage, on_token=None, api_path="/api/generate"):
+        """Stream /api/generate or /api/chat; returns (full_text, final_chunk_with_metrics)"""
+        full_response = []
+        final_chunk = {}
+        token_count = 0
+        start_time = time.time()
+        
+        for chunk in client.stream(api_path, data, timeout=self.request_timeout):
+            text = client.chunk_text(chunk)
+            if text:
+                full_response.append(text)
+                token_count += 1
+                if on_token:
+                    on_token(text)
+                
+                if token_count % self.stream_progress_interval == 0:
+                    elapsed = time.time() - start_time
+                    rate = token_count / elapsed if elapsed > 0 else 0
+                    print(f"   ✍️ [{stage}] {token_count:,} tokens streamed ({rate:.1f} tokens/sec)")
+            
+            if chunk.get('done', False):
+                final_chunk = chunk
+        
+        return "".join(full_response), final_chunk
+    
+    def get_context_window(self):
+        """Context size sent as num_ctx (context_window setting, else the model's own, capped)"""
+        if self._context_window is None:
+            configured = self.llm_settings.get('context_window') or 0
+            if configured:
+                self._context_window = configured
+            else:
+                model_max = get_ollama_client().get_context_length(self.llm_settings['model'])
+                cap = self.llm_settings.get('context_window_cap') or DEFAULT_CONTEXT_WINDOW
+                self._context_window = min(model_max, cap) if model_max else DEFAULT_CONTEXT_WINDOW
+                source = f"model supports {model_max:,}" if model_max else "model size unknown"
+                print(f"   📐 Context window: {self._context_window:,} tokens ({source})")
+        return self._context_window
+    
+    def _record_metrics(self, result, stage, cached=False):
+        """Capture Ollama's token counts/timings for this call"""
+        metrics = TokenMetrics.from_response(result, stage=stage, cached=cached)
+        self._last_call.metrics = metrics
+        with self._metrics_lock:
+            self.metrics_history.append(metrics)
+        return metrics
+    
+    def get_last_metrics(self):
+        """Metrics of the last successful call made on the current thread (or None)"""
+        return getattr(self._last_call, 'metrics', None)
+    
+    def get_stage_metrics(self):
+        """Return {stage: combined TokenMetrics} for every call made so far"""
+        with self._metrics_lock:
+            history = list(self.metrics_history)
+        
+        stages = {}
+        for metrics in history:
+            stages.setdefault(metrics.stage, []).append(metrics)
+        return {stage: TokenMetrics.combine(items, stage=stage) for stage, items in stages.items()}
+    
+    def reset_metrics(self):
+        """Start a fresh metrics history (one per story)"""
+        with self._metrics_lock:
+            self.metrics_history = []
+    
     def make_api_call(self, prompt, max_tokens, stage="unknown"):
         """Make API call without system prompt"""
         return self.make_api_call_with_system_prompt(None, prompt, max_tokens, stage)
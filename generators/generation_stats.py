@@ -1,14 +1,22 @@
 import time
+import threading
+
+from token_metrics import TokenMetrics
 
 class GenerationStats:
-    def __init__(self):
+    def __init__(self, story_number=None, progress_listener=None):
+        # Optional hooks so a BatchProgress can aggregate several concurrent stories
+        self.story_number = story_number
+        self.progress_listener = progress_listener
         self.stats = {
             'total_scenes': 0,
             'completed_scenes': 0,
             'start_time': None,
             'scene_times': [],
             'total_words': 0,
-            'total_characters': 0
+            'total_characters': 0,
+            'token_metrics': TokenMetrics(),  # Measured by Ollama, summed over scenes
+            'scene_metrics': []  # Per scene, in completion order (prefill trend)
         }
     
     def start_generation(self, total_scenes):
@@ -19,13 +27,24 @@ class GenerationStats:
         self.stats['scene_times'] = []
         self.stats['total_words'] = 0
         self.stats['total_characters'] = 0
+        self.stats['token_metrics'] = TokenMetrics()
+        self.stats['scene_metrics'] = []
+        
+        if self.progress_listener:
+            self.progress_listener.scenes_planned(self.story_number, total_scenes)
     
-    def complete_scene(self, scene_time, word_count, char_count):
-        """Record completion of a scene"""
+    def complete_scene(self, scene_time, word_count, char_count, metrics=None):
+        """Record completion of a scene (metrics: TokenMetrics from Ollama, if available)"""
         self.stats['completed_scenes'] += 1
         self.stats['scene_times'].append(scene_time)
         self.stats['total_words'] += word_count
         self.stats['total_characters'] += char_count
+        if metrics:
+            self.stats['token_metrics'] += metrics
+            self.stats['scene_metrics'].append(metrics)
+        
+        if self.progress_listener:
+            self.progress_listener.scene_completed(self.story_number, word_count)
     
     def show_progress(self):
         """Show current generation progress"""
@@ -52,10 +71,13 @@ class GenerationStats:
             print(f"\n📊 Progress: [{bar}] {completed}/{total} ({percentage:.1f}%)")
             print(f"⏱️ Elapsed: {self._format_time(elapsed_time)} | Est. remaining: {self._format_time(estimated_time_left)}")
             print(f"📝 Total words so far: {self.stats['total_words']:,}")
+            token_metrics = self.stats['token_metrics']
+            if token_metrics.eval_count:
+                print(f"🔢 Tokens generated so far: {token_metrics.eval_count:,}")
         else:
             print(f"\n📊 Progress: [{bar}] {completed}/{total} ({percentage:.1f}%)")
 
-    def show_scene_completion(self, scene_num, scene_time, word_count, char_count):
+    def show_scene_completion(self, scene_num, scene_time, word_count, char_count, metrics=None):
         """Show individual scene completion statistics"""
         print(f"   ✅ Scene {scene_num} completed:")
         print(f"      ⏱️ Time: {self._format_time(scene_time)}")
@@ -65,9 +87,15 @@ class GenerationStats:
         if scene_time > 0:
             words_per_minute = (word_count / scene_time) * 60
             print(f"      🚀 Speed: {words_per_minute:.1f} words/minute")
+        
+        if metrics and metrics.has_data:
+            print(f"      🔢 Tokens: {metrics.summary()}")
 
-    def show_final_stats(self, total_time):
-        """Show final generation statistics"""
+    def show_final_stats(self, total_time, stage_metrics=None):
+        """Show final generation statistics
+        
+        stage_metrics: optional {stage: TokenMetrics} covering every Ollama call of the story
+        """
         print(f"\n🎉 STORY GENERATION COMPLETE!")
         print("="*50)
         print(f"⏱️ Total time: {self._format_time(total_time)}")
@@ -88,8 +116,39 @@ class GenerationStats:
             if total_time > 0:
                 words_per_minute = (self.stats['total_words'] / total_time) * 60
                 print(f"🚀 Overall speed: {words_per_minute:.1f} words/minute")
+        
+        token_metrics = self.stats['token_metrics']
+        if token_metrics.has_data:
+            print(f"🔢 Scene tokens: {token_metrics.summary()}")
+            self._show_prefill_trend()
+        
+        if stage_metrics:
+            print("📊 Measured throughput by stage:")
+            for stage, metrics in stage_metrics.items():
+                if metrics.has_data:
+                    print(f"   {stage:<18} {metrics.calls} call(s) | {metrics.summary()}")
+
+    def _show_prefill_trend(self):
+        """Compare prompt processing of the first scene with the later ones
+        
+        Ollama's prompt_eval_count leaves out prefix tokens reused from its cache, so a
+        drop after scene 1 shows the prompt prefix is being reused.
+        """
+        timed = [m for m in self.stats['scene_metrics'] if m.prompt_eval_duration and not m.cached_calls]
+        if len(timed) < 2:
+            return
+        
+        first, later = timed[0], timed[1:]
+        later_tokens = sum(m.prompt_eval_count for m in later) / len(later)
+        later_seconds = sum(m.prompt_eval_duration for m in later) / len(later) / 1e9
+        first_seconds = first.prompt_eval_duration / 1e9
+        drop = (1 - later_seconds / first_seconds) * 100 if first_seconds else 0.0
+        
+        print(f"♻️ Prompt processing: first scene {first.prompt_eval_count:,} tok in {first_seconds:.2f}s | "
+              f"later scenes avg {later_tokens:,.0f} tok in {later_seconds:.2f}s ({drop:.0f}% less time)")
 
-    def _format_time(self, seconds):
+    @staticmethod
+    def _format_time(seconds):
         """Format time in a readable way"""
         if seconds < 60:
             return f"{seconds:.1f}s"
@@ -101,3 +160,84 @@ class GenerationStats:
             hours = int(seconds // 3600)
             minutes = int((seconds % 3600) // 60)
             return f"{hours}h {minutes}m"
+
+
+class BatchProgress:
+    """Thread-safe aggregated progress for several stories generated concurrently"""
+    
+    def __init__(self, total_stories):
+        self.total_stories = total_stories
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+        self.stories = {}  # story_number -> progress dict
+    
+    def _story(self, story_number):
+        """Get (or create) the progress record for one story - caller holds the lock"""
+        if story_number not in self.stories:
+            self.stories[story_number] = {
+                'status': 'waiting',
+                'completed_scenes': 0,
+                'total_scenes': 0,
+                'words': 0,
+                'start_time': None,
+                'end_time': None,
+                'error': None,
+                'story_filename': None
+            }
+        return self.stories[story_number]
+    
+    def story_started(self, story_number):
+        """Mark a story as picked up by a worker"""
+        with self.lock:
+            story = self._story(story_number)
+            story['status'] = 'bible & plan'
+            story['start_time'] = time.time()
+        self.show()
+    
+    def scenes_planned(self, story_number, total_scenes):
+        """Called by GenerationStats when the scene list is known"""
+        with self.lock:
+            story = self._story(story_number)
+            story['status'] = 'writing'
+            story['total_scenes'] = total_scenes
+        self.show()
+    
+    def scene_completed(self, story_number, word_count):
+        """Called by GenerationStats after each finished scene"""
+        with self.lock:
+            story = self._story(story_number)
+            story['completed_scenes'] += 1
+            story['words'] += word_count
+        self.show()
+    
+    def story_finished(self, story_number, story_filename=None, error=None):
+        """Record the outcome of one story"""
+        with self.lock:
+            story = self._story(story_number)
+            story['end_time'] = time.time()
+            story['story_filename'] = story_filename
+            story['error'] = error
+            story['status'] = 'done' if story_filename else 'failed'
+        self.show()
+    
+    def show(self):
+        """Print one combined progress block for all stories"""
+        with self.lock:
+            finished = sum(1 for s in self.stories.values() if s['status'] in ('done', 'failed'))
+            elapsed = time.time() - self.start_time
+            
+            lines = [f"\n📚 Batch progress: {finished}/{self.total_stories} stories finished | Elapsed: {GenerationStats._format_time(elapsed)}"]
+            for story_number in sorted(self.stories):
+                story = self.stories[story_number]
+                if story['total_scenes']:
+                    scenes = f"{story['completed_scenes']}/{story['total_scenes']} scenes"
+                else:
+                    scenes = "-"
+                icon = {'done': '✅', 'failed': '❌', 'writing': '✍️'}.get(story['status'], '⏳')
+                lines.append(f"   {icon} Story {story_number}: {story['status']:<12} {scenes:<14} {story['words']:,} words")
+            print("\n".join(lines))
+    
+    def get_failures(self):
+        """Return {story_number: error} for stories that did not complete"""
+        with self.lock:
+            return {n: s['error'] or 'Unknown error' for n, s in self.stories.items() if s['status'] == 'failed'}
@@ -0,0 +1,64 @@
+import os
+import threading
+from datetime import datetime
+
+class PartialStoryWriter:
+    """Appends story text to a per-story partial file while it is being generated.
+
+    If generation fails halfway, every finished scene (and the tokens of the
+    scene that was in progress) are still on disk in stories/partial/.
+    """
+
+    def __init__(self, stories_folder, blueprint_name, story_number):
+        self.partial_folder = os.path.join(stories_folder, 'partial')
+        os.makedirs(self.partial_folder, exist_ok=True)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base_name = blueprint_name.replace('.story.txt', '')
+        self.path = os.path.join(self.partial_folder, f"{base_name}_{timestamp}_v{story_number}.partial.txt")
+
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(f"PARTIAL STORY - Started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._file.write(f"Blueprint: {blueprint_name} | Version: {story_number}\n")
+        self._file.flush()
+
+    def begin_scene(self, scene_number):
+        """Write the scene header before streaming its tokens"""
+        with self._lock:
+            self._file.write(f"\n\n{'='*50}\n\nScene {scene_number}\n\n")
+            self._file.flush()
+
+    def write(self, text):
+        """Append streamed tokens as they arrive"""
+        if not text:
+            return
+        with self._lock:
+            self._file.write(text)
+            self._file.flush()
+
+    def write_scene(self, scene_number, content):
+        """Append a whole finished scene (used when scenes are written concurrently)"""
+        with self._lock:
+            self._file.write(f"\n\n{'='*50}\n\nScene {scene_number}\n\n{content}")
+            self._file.flush()
+
+    def mark_failed(self, scene_number, reason="generation failed"):
+        """Record where generation stopped"""
+        with self._lock:
+            self._file.write(f"\n\n[GENERATION STOPPED AT SCENE {scene_number}: {reason}]\n")
+            self._file.flush()
+
+    def close(self):
+        """Close the partial file and keep it on disk"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def discard(self):
+        """Close and delete the partial file once the final story is saved"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
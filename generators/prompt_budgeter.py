@@ -0,0 +1,241 @@
+import re
+from .story_utils import StoryUtils
+
+class PromptBudgeter:
+    """Fits each scene prompt into the model's context window.
+
+    The story bible is split into sections. Core sections (premise, plot, tone,
+    style...) are always kept. Character/location sections only keep the
+    entries named in the scene description. If the prompt still doesn't fit
+    next to the scene's output budget, the bible is truncated from the end.
+    When the output budget leaves no room for even the bible's opening
+    (premise, characters), num_predict is capped instead of dropping it.
+    Everything dropped is reported so it can be logged.
+    """
+
+    # Sections whose entries are individual characters / places
+    ENTITY_SECTION_KEYWORDS = (
+        'character', 'cast', 'protagonist', 'antagonist', 'supporting',
+        'location', 'setting', 'place', 'relationship'
+    )
+
+    # Capitalized words that are never names
+    NAME_STOPWORDS = {
+        'The', 'And', 'But', 'For', 'With', 'From', 'Into', 'Her', 'His', 'She', 'They',
+        'Mr', 'Mrs', 'Ms', 'Dr', 'Age', 'Role', 'Name', 'Description', 'Background',
+        'Personality', 'Appearance', 'Motivation', 'Main', 'Character', 'Location'
+    }
+
+    HEADER_PATTERNS = (
+        re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$'),               # ## Characters
+        re.compile(r'^()\*\*([^*]+?)\*\*:?\s*$'),                # **CHARACTERS:**
+        re.compile(r'^()\d+\.\s*\*\*([^*]+?)\*\*:?\s*$'),        # 1. **Characters**
+        re.compile(r"^()([A-Z][A-Z0-9 &/',-]{2,}):?\s*$"),       # CHARACTERS:
+    )
+
+    ENTRY_MARKERS = (
+        ('bold', re.compile(r'^\*\*[^*]+\*\*')),
+        ('bullet', re.compile(r'^[-*•]\s+')),
+        ('number', re.compile(r'^\d+[.)]\s+')),
+    )
+
+    SAFETY_MARGIN_TOKENS = 256  # Template overhead and estimate error
+    MIN_BIBLE_TOKENS = 1024     # Opening of the bible (premise, characters) kept before output is capped
+    MIN_OUTPUT_TOKENS = 512     # Output is never capped below this; past it the bible has to go
+    REPORT_NAMES = 3            # Dropped entries named on the console (all of them go to the prompt log)
+
+    def __init__(self, context_window, trim_bible=True):
+        self.context_window = context_window
+        self.trim_bible = trim_bible
+
+    @staticmethod
+    def estimate_tokens(text):
+        return StoryUtils.estimate_tokens(text or "")
+
+    def _match_header(self, line):
+        """Return (level, title) if the line is a section header"""
+        stripped = line.strip()
+        if not stripped or len(stripped) > 80:
+            return None
+        for pattern in self.HEADER_PATTERNS:
+            match = pattern.match(stripped)
+            if match:
+                level = len(match.group(1)) if match.group(1) else 0
+                return level, match.group(2).strip().strip(':').strip()
+        return None
+
+    def _entry_marker(self, line):
+        """Marker style if the line starts a list entry at the left margin, else None"""
+        if not line or line[0].isspace():
+            return None
+        for kind, pattern in self.ENTRY_MARKERS:
+            if pattern.match(line):
+                return kind
+        return None
+
+    def _is_entity_title(self, title):
+        lowered = title.lower()
+        return any(keyword in lowered for keyword in self.ENTITY_SECTION_KEYWORDS)
+
+    def split_sections(self, story_bible):
+        """Split the bible into [{'title', 'entity', 'intro', 'entries'}] keeping original text"""
+        sections = [{'title': None, 'level': 0, 'entity': False, 'intro': [], 'entries': []}]
+
+        for line in story_bible.split('\n'):
+            header = self._match_header(line)
+            current = sections[-1]
+
+            if header:
+                level, title = header
+                # A deeper markdown header inside a character/location section is one entry
+                if current['entity'] and current['level'] and level > current['level']:
+                    current['entries'].append([line])
+                    continue
+                sections.append({
+                    'title': title, 'level': level, 'entity': self._is_entity_title(title),
+                    'header_line': line, 'intro': [], 'entries': []
+                })
+                continue
+
+            if current['entity']:
+                # Entries start with the marker style the section's first entry used, so
+                # "- Age: 32" under "**Alice**" stays part of Alice's entry
+                marker = self._entry_marker(line)
+                if marker and current.setdefault('entry_marker', marker) == marker:
+                    current['entries'].append([line])
+                elif current['entries']:
+                    current['entries'][-1].append(line)
+                else:
+                    current['intro'].append(line)
+            else:
+                current['intro'].append(line)
+
+        return [section for section in sections if section.get('header_line') or ''.join(section['intro']).strip()]
+
+    def _entry_name(self, entry_lines):
+        """Name part of an entry: '- **Alice Grey** (32): ...' -> 'Alice Grey'"""
+        first = entry_lines[0].strip()
+        first = re.sub(r'^(?:#{1,6}\s*|[-*•]\s+|\d+[.)]\s+)', '', first)
+        first = first.replace('**', '').replace('__', '')
+        name = re.split(r'[:(–—]| - ', first, maxsplit=1)[0]
+        return name.strip()
+
+    def _name_tokens(self, name):
+        return [
+            word for word in re.findall(r"[A-Z][\w'-]{2,}", name)
+            if word not in self.NAME_STOPWORDS
+        ]
+
+    def _is_relevant(self, entry_lines, scene_text):
+        """Entry is relevant if any capitalized part of its name appears in the scene text"""
+        for token in self._name_tokens(self._entry_name(entry_lines)):
+            if re.search(rf"\b{re.escape(token)}\b", scene_text):
+                return True
+        return False
+
+    @staticmethod
+    def _render(section, entries):
+        lines = []
+        if section.get('header_line'):
+            lines.append(section['header_line'])
+        lines.extend(section['intro'])
+        for entry in entries:
+            lines.extend(entry)
+        return '\n'.join(lines)
+
+    def select_bible(self, story_bible, scene_text):
+        """Keep core sections and the entity entries named in scene_text; returns (text, dropped_names)"""
+        sections = self.split_sections(story_bible)
+        rendered = []
+        dropped = []
+
+        for section in sections:
+            if not section['entity'] or not section['entries']:
+                rendered.append(self._render(section, section['entries']))
+                continue
+
+            relevant = [entry for entry in section['entries'] if self._is_relevant(entry, scene_text)]
+            if not relevant:
+                # Scene names nobody from this section - can't tell who matters, keep all
+                rendered.append(self._render(section, section['entries']))
+                continue
+
+            for entry in section['entries']:
+                name = f"{section['title']}: {self._entry_name(entry)}"
+                if entry not in relevant and name not in dropped:
+                    dropped.append(name)
+            rendered.append(self._render(section, relevant))
+
+        return '\n'.join(rendered), dropped
+
+    def fit_bible(self, story_bible, scene_text, fixed_prompt_tokens, max_output_tokens):
+        """Return (bible_text, report) so that prompt + output fit the context window
+
+        fixed_prompt_tokens: system prompt + user prompt without the bible
+        max_output_tokens: num_predict reserved for the scene itself
+
+        report['output_tokens'] is the num_predict to send; it is lower than
+        max_output_tokens when report['output_capped'] is set.
+        """
+        original_tokens = self.estimate_tokens(story_bible)
+        report = {
+            'context_window': self.context_window,
+            'output_tokens': max_output_tokens,
+            'requested_output_tokens': max_output_tokens,
+            'fixed_tokens': fixed_prompt_tokens,
+            'bible_tokens_before': original_tokens,
+            'dropped': [],
+            'truncated': False,
+            'output_capped': False,
+            'overflow': False
+        }
+
+        bible_text = story_bible
+        if self.trim_bible:
+            bible_text, report['dropped'] = self.select_bible(story_bible, scene_text)
+
+        available = self.context_window - max_output_tokens - fixed_prompt_tokens - self.SAFETY_MARGIN_TOKENS
+        reserve = min(self.estimate_tokens(bible_text), self.MIN_BIBLE_TOKENS)
+        if available < reserve:
+            # Shrink the scene's output rather than lose the premise and characters
+            capped_output = self.context_window - fixed_prompt_tokens - self.SAFETY_MARGIN_TOKENS - reserve
+            if capped_output >= self.MIN_OUTPUT_TOKENS:
+                report['output_tokens'] = min(capped_output, max_output_tokens)
+                report['output_capped'] = True
+                available = reserve
+
+        if available <= 0:
+            report['overflow'] = True
+            bible_text = ""
+        elif self.estimate_tokens(bible_text) > available:
+            # Keep the beginning (premise, characters) - plot details near the end go first
+            keep_chars = available * 4
+            bible_text = bible_text[:keep_chars].rsplit('\n', 1)[0] + "\n[...story bible shortened to fit the context window...]"
+            report['truncated'] = True
+
+        report['bible_tokens_after'] = self.estimate_tokens(bible_text)
+        report['prompt_tokens'] = fixed_prompt_tokens + report['bible_tokens_after']
+        return bible_text, report
+
+    @staticmethod
+    def show_report(report, scene_number):
+        """Print what the budgeter kept and dropped for a scene"""
+        before, after = report['bible_tokens_before'], report['bible_tokens_after']
+        print(f"   📐 Context budget: ~{report['prompt_tokens']:,} prompt + {report['output_tokens']:,} output "
+              f"of {report['context_window']:,} tokens (bible ~{before:,} → ~{after:,})")
+        if report['dropped']:
+            # Only a few names here - the prompt log keeps the full list
+            count = len(report['dropped'])
+            names = ", ".join(item.split(': ', 1)[-1] for item in report['dropped'][:PromptBudgeter.REPORT_NAMES])
+            more = f" +{count - PromptBudgeter.REPORT_NAMES} more" if count > PromptBudgeter.REPORT_NAMES else ""
+            print(f"   ✂️ Scene {scene_number}: dropped {count} bible {'entry' if count == 1 else 'entries'} "
+                  f"not in this scene ({names}{more})")
+        if report['truncated']:
+            print(f"   ✂️ Scene {scene_number}: story bible shortened to fit the context window")
+        if report.get('output_capped'):
+            print(f"   ⚠️ Scene {scene_number}: output capped {report['requested_output_tokens']:,} → "
+                  f"{report['output_tokens']:,} tokens so the story bible's opening fits the "
+                  f"{report['context_window']:,} token window")
+        if report['overflow']:
+            print(f"   ⚠️ Scene {scene_number}: STORY BIBLE LEFT OUT - the prompt alone nearly fills the "
+                  f"{report['context_window']:,} token window. Lower the scene token budget or raise context_window")
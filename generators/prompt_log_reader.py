@@ -0,0 +1,132 @@
+import os
+import json
+
+from .prompt_logger import PromptLogger
+
+class PromptLogReader:
+    """Random access to the structured (.jsonl) side of a prompt log.
+
+    Listing exchanges only reads the small .index file. Each exchange is
+    loaded on demand by seeking to its byte offset, and shared-text
+    references (the bible) are expanded from their own records. Behaves like
+    a read-only list of exchange dicts in the format StoryLogAnalyzer uses.
+    If the index is missing it is rebuilt with one streaming pass.
+    """
+
+    def __init__(self, prompt_log_file):
+        self.prompt_log_file = prompt_log_file
+        self.structured_log_file, self.index_file = PromptLogger.structured_paths(prompt_log_file)
+        self._entries = None
+        self._shared_offsets = None
+        self._shared_cache = {}
+
+    def available(self):
+        """True if this log was written with the structured format"""
+        return os.path.exists(self.structured_log_file)
+
+    def _load_index(self):
+        if self._entries is not None:
+            return
+        if not os.path.exists(self.index_file):
+            self.rebuild_index()
+
+        entries, shared = [], {}
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written last line
+                if entry.get('kind') == 'shared':
+                    shared[entry['digest']] = entry
+                elif entry.get('kind', 'exchange') == 'exchange':
+                    entries.append(entry)  # Budget reports are skipped
+        self._entries, self._shared_offsets = entries, shared
+
+    def rebuild_index(self):
+        """Recreate the .index file by scanning the .jsonl one line at a time"""
+        with open(self.structured_log_file, 'rb') as src, open(self.index_file, 'w', encoding='utf-8') as dst:
+            offset = 0
+            for line in src:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    offset += len(line)
+                    continue
+                entry = {key: value for key, value in record.items()
+                         if key not in ('system_prompt', 'user_prompt', 'response', 'text', 'metrics')}
+                metrics = record.get('metrics') or {}
+                if record.get('kind') == 'exchange':
+                    entry.update(prompt_tokens=metrics.get('prompt_eval_count'),
+                                 response_tokens=metrics.get('eval_count'),
+                                 response_chars=len(record.get('response', '')))
+                entry.update(offset=offset, length=len(line))
+                dst.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                offset += len(line)
+
+    def _read_record(self, entry):
+        with open(self.structured_log_file, 'rb') as f:
+            f.seek(entry['offset'])
+            return json.loads(f.read(entry['length']))
+
+    def _shared_text(self, digest):
+        if digest not in self._shared_cache:
+            entry = self._shared_offsets.get(digest)
+            self._shared_cache[digest] = self._read_record(entry)['text'] if entry else None
+        return self._shared_cache[digest]
+
+    def _expand(self, text):
+        def replace(match):
+            shared = self._shared_text(match.group(1))
+            return shared if shared is not None else match.group(0)
+        return PromptLogger.SHARED_REFERENCE_PATTERN.sub(replace, text)
+
+    @staticmethod
+    def _tokens_label(entry):
+        if entry.get('response_tokens') is not None:
+            return f"{entry.get('prompt_tokens') or 0:,} in / {entry['response_tokens']:,} out"
+        return f"max {entry.get('max_tokens')}"
+
+    @staticmethod
+    def _type_label(stage):
+        return (stage or 'unknown').replace('_', ' ').title()
+
+    def summaries(self):
+        """Per-exchange info from the index only: number, type, model, tokens, response_chars"""
+        self._load_index()
+        return [
+            {
+                'number': entry['number'],
+                'type': self._type_label(entry.get('stage')),
+                'model': entry.get('model', 'Unknown'),
+                'tokens': self._tokens_label(entry),
+                'timestamp': entry.get('timestamp'),
+                'response_chars': entry.get('response_chars', 0),
+            }
+            for entry in self._entries
+        ]
+
+    def __len__(self):
+        self._load_index()
+        return len(self._entries)
+
+    def __getitem__(self, position):
+        """Load exchange at list position (0-based) with the bible expanded"""
+        self._load_index()
+        entry = self._entries[position]
+        record = self._read_record(entry)
+        return {
+            'number': record['number'],
+            'type': self._type_label(record.get('stage')),
+            'stage': record.get('stage'),
+            'system_prompt': self._expand(record.get('system_prompt', '')),
+            'user_prompt': self._expand(record.get('user_prompt', '')),
+            'response': record.get('response', ''),
+            'model': record.get('model', 'Unknown'),
+            'tokens': self._tokens_label(entry),
+            'metrics': record.get('metrics'),
+        }
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
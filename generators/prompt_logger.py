@@ -1,10 +1,41 @@
 import os
-from datetime import datetime, timedelta
+import re
 import glob
+import json
+import queue
+import hashlib
+import threading
+from datetime import datetime, timedelta
 
 class PromptLogger:
-    def __init__(self, stories_folder, llm_settings, app_settings=None):
+    """Writes every prompt exchange to multiscene/logs/prompt_log_*.txt.
+
+    Exchanges are queued and written by a background thread in batches, so
+    logging never blocks generation. Large texts registered with
+    register_shared_text() (the story bible) are written once as a SHARED
+    TEXT block and later prompts reference them by hash instead of repeating
+    them. flush() waits for the queue; close() (called when each story ends)
+    stops the writer and closes the files until the next exchange is logged.
+    
+    Next to the readable .txt log, every exchange is also written as one JSON
+    record to a .jsonl file, with a .index sidecar holding each record's byte
+    offset (see PromptLogReader) so big logs can be listed and read per exchange.
+    """
+    
+    MAX_BATCH = 50              # Exchanges written per file flush
+    MIN_SHARED_TEXT_CHARS = 200  # Shorter texts aren't worth a reference
+    
+    SHARED_BLOCK_START = "#" * 16 + " SHARED TEXT {label} #{digest} " + "#" * 16
+    SHARED_BLOCK_END = "#" * 16 + " END SHARED TEXT #{digest} " + "#" * 16
+    SHARED_REFERENCE = "[[SHARED TEXT {label} #{digest} - logged once above]]"
+    SHARED_BLOCK_PATTERN = re.compile(
+        r'#{16} SHARED TEXT (\S+) #([0-9a-f]{12}) #{16}\n(.*?)\n#{16} END SHARED TEXT #\2 #{16}', re.DOTALL
+    )
+    SHARED_REFERENCE_PATTERN = re.compile(r'\[\[SHARED TEXT \S+ #([0-9a-f]{12}) - logged once above\]\]')
+    
+    def __init__(self, stories_folder, llm_settings, app_settings=None, run_label=None):
         self.stories_folder = stories_folder
+        self.run_label = run_label  # Keeps log files apart when stories run concurrently
         self.prompt_log_file = None
         self.llm_settings = llm_settings
         self.app_settings = app_settings or {}
@@ -14,6 +45,16 @@ class PromptLogger:
         self.detailed_logging = self.app_settings.get("detailed_logging", True)
         self.log_retention_days = self.app_settings.get("log_retention_days", 30)
         
+        # Background writer - only the writer thread touches the file and the shared texts
+        self._queue = queue.Queue()
+        self._writer_thread = None
+        self._file = None
+        self._jsonl_file = None
+        self._index_file = None
+        self._exchange_count = 0
+        self._shared_texts = {}  # digest -> (label, text), already written to the log
+        self._writer_lock = threading.Lock()
+        
         if self.logging_enabled:
             self._initialize_prompt_logging(stories_folder)
             self._cleanup_old_logs()
@@ -21,7 +62,10 @@ class PromptLogger:
     def _initialize_prompt_logging(self, stories_folder):
         """Initialize prompt logging file"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_filename = f"prompt_log_{timestamp}.txt"
+        if self.run_label:
+            log_filename = f"prompt_log_{timestamp}_{self.run_label}.txt"
+        else:
+            log_filename = f"prompt_log_{timestamp}.txt"
         
         # Create logs directory if it doesn't exist
         logs_dir = os.path.join(os.path.dirname(stories_folder), 'logs')
@@ -38,8 +82,16 @@ class PromptLogger:
             f.write(f"Detailed Logging: {'Enabled' if self.detailed_logging else 'Summary Only'}\n")
             f.write("=" * 80 + "\n\n")
         
+        self.structured_log_file, self.index_file = self.structured_paths(self.prompt_log_file)
+        
         print(f"📝 Prompt logging enabled: {log_filename}")
 
+    @staticmethod
+    def structured_paths(prompt_log_file):
+        """(.jsonl records, .index offsets) belonging to a prompt_log_*.txt file"""
+        base = os.path.splitext(prompt_log_file)[0]
+        return f"{base}.jsonl", f"{base}.index"
+
     def _cleanup_old_logs(self):
         """Remove old log files based on retention setting"""
         if self.log_retention_days <= 0:
@@ -60,6 +112,9 @@ class PromptLogger:
                     if file_time < cutoff_date:
                         os.remove(log_file)
                         deleted_count += 1
+                        for sidecar in self.structured_paths(log_file):
+                            if os.path.exists(sidecar):
+                                os.remove(sidecar)
                 except (OSError, ValueError):
                     continue
             
@@ -69,28 +124,205 @@ class PromptLogger:
         except Exception as e:
             print(f"⚠️ Error cleaning up logs: {e}")
 
-    def log_prompt_exchange(self, stage, system_prompt, user_prompt, response, max_tokens):
-        """Log the complete prompt exchange for analysis"""
+    def _enqueue(self, item):
+        """Queue an item, opening the log files and starting the writer thread if needed
+        
+        The writer runs from the first logged exchange until close(); a generator
+        that is reused for another story starts it again (appending to the same files).
+        """
+        with self._writer_lock:
+            if not self._writer_thread:
+                self._file = open(self.prompt_log_file, 'a', encoding='utf-8')
+                self._jsonl_file = open(self.structured_log_file, 'ab')  # Binary: tell() gives byte offsets
+                self._index_file = open(self.index_file, 'a', encoding='utf-8')
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name=f"PromptLogger-{self.run_label or 'main'}", daemon=True
+                )
+                self._writer_thread.start()
+            self._queue.put(item)
+
+    def _writer_loop(self):
+        """Write queued items in batches and flush once per batch"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            for item in batch:
+                if item is None:
+                    stop = True
+                    continue
+                try:
+                    kind, payload = item
+                    if kind == 'shared':
+                        self._write_shared_text(*payload)
+                    elif kind == 'budget':
+                        self._write_budget_report(*payload)
+                    else:
+                        self._write_exchange(*payload)
+                except Exception as e:
+                    print(f"⚠️ Failed to log prompt exchange: {e}")
+            
+            try:
+                for f in (self._file, self._jsonl_file, self._index_file):
+                    f.flush()
+            except Exception as e:
+                print(f"⚠️ Failed to flush prompt log: {e}")
+            
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def register_shared_text(self, label, text):
+        """Log a large text (e.g. the story bible) once; later prompts containing it reference its hash"""
         if not self.logging_enabled or not self.prompt_log_file:
             return
+        if not text or len(text) < self.MIN_SHARED_TEXT_CHARS:
+            return
+        self._enqueue(('shared', (label, text)))
+
+    def log_prompt_exchange(self, stage, system_prompt, user_prompt, response, max_tokens, metrics=None):
+        """Queue the complete prompt exchange for analysis (written by the background thread)
         
-        try:
-            with open(self.prompt_log_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{'='*20} {stage.upper()} STAGE {'='*20}\n")
-                f.write(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Max Tokens: {max_tokens}\n")
-                f.write(f"System Prompt Length: {len(system_prompt) if system_prompt else 0} chars\n")
-                f.write(f"User Prompt Length: {len(user_prompt)} chars\n")
-                f.write(f"Response Length: {len(response) if response else 0} chars\n")
-                f.write("=" * 60 + "\n\n")
-                
-                if self.detailed_logging:
-                    self._write_detailed_log(f, system_prompt, user_prompt, response)
-                else:
-                    self._write_summary_log(f, system_prompt, user_prompt, response)
-                
-        except Exception as e:
-            print(f"⚠️ Failed to log prompt exchange: {e}")
+        metrics: optional TokenMetrics measured for this call (stored in the JSONL record)
+        """
+        if not self.logging_enabled or not self.prompt_log_file:
+            return
+        
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        metrics_data = metrics.to_dict() if metrics else None
+        self._enqueue(('exchange', (stage, system_prompt, user_prompt, response, max_tokens, timestamp, metrics_data)))
+
+    def log_budget_report(self, scene_number, report):
+        """Queue a PromptBudgeter report (dropped entries, truncation, output cap, overflow)"""
+        if not self.logging_enabled or not self.prompt_log_file:
+            return
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._enqueue(('budget', (scene_number, dict(report), timestamp)))
+
+    def flush(self):
+        """Block until every queued exchange is on disk"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write everything still queued, stop the writer thread and close the files"""
+        with self._writer_lock:
+            if not self._writer_thread:
+                return
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+            for f in (self._file, self._jsonl_file, self._index_file):
+                if f and not f.closed:
+                    f.close()
+            self._file = self._jsonl_file = self._index_file = None
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+    def _write_shared_text(self, label, text):
+        digest = self._digest(text)
+        if digest in self._shared_texts:
+            return
+        label = re.sub(r'\s+', '_', label)
+        self._shared_texts[digest] = (label, text)
+        
+        self._write_record({'kind': 'shared', 'digest': digest, 'label': label, 'text': text},
+                           {'kind': 'shared', 'digest': digest, 'label': label})
+        
+        if self.detailed_logging:
+            f = self._file
+            f.write("\n" + self.SHARED_BLOCK_START.format(label=label, digest=digest) + "\n")
+            f.write(text + "\n")
+            f.write(self.SHARED_BLOCK_END.format(digest=digest) + "\n\n")
+
+    def _write_record(self, record, index_entry):
+        """Append one JSON line and its byte offset/length to the index"""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        offset = self._jsonl_file.tell()
+        self._jsonl_file.write(line)
+        index_entry.update(offset=offset, length=len(line))
+        self._index_file.write(json.dumps(index_entry, ensure_ascii=False) + "\n")
+
+    def _dedupe(self, text):
+        """Replace registered shared texts with their hash reference"""
+        if not text or not self._shared_texts:
+            return text
+        # Longest first, so a full bible wins over any shorter registered excerpt of it
+        for digest, (label, shared) in sorted(self._shared_texts.items(), key=lambda item: -len(item[1][1])):
+            if shared in text:
+                text = text.replace(shared, self.SHARED_REFERENCE.format(label=label, digest=digest))
+        return text
+
+    def _write_budget_report(self, scene_number, report, timestamp):
+        record = {'kind': 'budget', 'scene': scene_number, 'timestamp': timestamp, **report}
+        self._write_record(record, {
+            'kind': 'budget', 'scene': scene_number, 'timestamp': timestamp,
+            'dropped': len(report.get('dropped', [])), 'truncated': report.get('truncated', False),
+            'output_capped': report.get('output_capped', False), 'overflow': report.get('overflow', False),
+        })
+        
+        if report.get('dropped') or report.get('truncated') or report.get('output_capped') or report.get('overflow'):
+            f = self._file
+            f.write(f"\n📐 CONTEXT BUDGET (scene {scene_number}) - {timestamp}\n")
+            for item in report.get('dropped', []):
+                f.write(f"   dropped: {item}\n")
+            if report.get('truncated'):
+                f.write(f"   story bible truncated: ~{report['bible_tokens_before']:,} → ~{report['bible_tokens_after']:,} tokens\n")
+            if report.get('output_capped'):
+                f.write(f"   output capped: {report['requested_output_tokens']:,} → {report['output_tokens']:,} tokens\n")
+            if report.get('overflow'):
+                f.write(f"   OVERFLOW: story bible left out (context window {report['context_window']:,} tokens)\n")
+
+    def _write_exchange(self, stage, system_prompt, user_prompt, response, max_tokens, timestamp, metrics=None):
+        self._exchange_count += 1
+        model = self.llm_settings.get('model', 'unknown')
+        record = {
+            'kind': 'exchange', 'number': self._exchange_count, 'stage': stage, 'timestamp': timestamp,
+            'model': model, 'max_tokens': max_tokens, 'metrics': metrics,
+            'system_prompt': self._dedupe(system_prompt or ""),
+            'user_prompt': self._dedupe(user_prompt or ""),
+            'response': response or "",
+        }
+        self._write_record(record, {
+            'kind': 'exchange', 'number': self._exchange_count, 'stage': stage, 'timestamp': timestamp,
+            'model': model, 'max_tokens': max_tokens,
+            'prompt_tokens': metrics.get('prompt_eval_count') if metrics else None,
+            'response_tokens': metrics.get('eval_count') if metrics else None,
+            'response_chars': len(response or ""),
+        })
+        
+        f = self._file
+        f.write(f"\n{'='*20} {stage.upper()} STAGE {'='*20}\n")
+        f.write(f"Timestamp: {timestamp}\n")
+        f.write(f"Max Tokens: {max_tokens}\n")
+        f.write(f"System Prompt Length: {len(system_prompt) if system_prompt else 0} chars\n")
+        f.write(f"User Prompt Length: {len(user_prompt)} chars\n")
+        f.write(f"Response Length: {len(response) if response else 0} chars\n")
+        f.write("=" * 60 + "\n\n")
+        
+        if self.detailed_logging:
+            self._write_detailed_log(f, self._dedupe(system_prompt), self._dedupe(user_prompt), response)
+        else:
+            self._write_summary_log(f, system_prompt, user_prompt, response)
+
+    @classmethod
+    def expand_shared_text(cls, log_content):
+        """Return the log with every shared-text reference replaced by the full text"""
+        shared = {digest: text for _, digest, text in cls.SHARED_BLOCK_PATTERN.findall(log_content)}
+        if not shared:
+            return log_content
+        without_blocks = cls.SHARED_BLOCK_PATTERN.sub('', log_content)
+        return cls.SHARED_REFERENCE_PATTERN.sub(
+            lambda match: shared.get(match.group(1), match.group(0)), without_blocks
+        )
 
     def _write_detailed_log(self, f, system_prompt, user_prompt, response):
         """Write detailed log with full prompts"""
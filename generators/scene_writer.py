@@ -1,9 +1,11 @@
 import os
 import re
 import time
+import hashlib
 import shutil
 from datetime import datetime
 from .story_utils import StoryUtils
+from .prompt_budgeter import PromptBudgeter
 
 class SceneWriter:
     def __init__(self, api_handler, story_intent_config, system_prompts, context_tracker=None, perspective_controller=None):
@@ -12,6 +14,8 @@ class SceneWriter:
         self.system_prompts = system_prompts
         self.context_tracker = context_tracker
         self.perspective_controller = perspective_controller
+        self.prompt_budgeter = None  # Created on first scene (needs the model's context size)
+        self._cached_prefix = None  # (key, system prompt with bible) for the cache_friendly layout
         
         # Define scene token options
         self.SCENE_TOKENS = {
@@ -20,9 +24,15 @@ class SceneWriter:
             "long_scene": 6000,     # ~4,500 words
             "epic_scene": 8000      # ~6,000 words (max recommended)
         }
+        
+        # Room kept for the per-scene message when the bible lives in the system prefix
+        self.SCENE_MESSAGE_RESERVE_TOKENS = 1024
     
-    def generate_scene_with_prompts(self, scene_description, story_bible, scene_plan, scene_number, total_scenes):
-        """Generate scene and return both content and the prompts used"""
+    def generate_scene_with_prompts(self, scene_description, story_bible, scene_plan, scene_number, total_scenes, on_token=None):
+        """Generate scene and return both content and the prompts used
+        
+        on_token: optional callable receiving streamed text chunks as they arrive
+        """
         print(f"✍️ Writing scene {scene_number}/{total_scenes} with specialized system prompt...")
         
         # DEBUG: Check if we have access to app settings
@@ -71,15 +81,91 @@ class SceneWriter:
         # Calculate max tokens using new system
         max_tokens = self._calculate_scene_tokens()
         
-        # BUILD USER PROMPT (capture it before use)
-        user_prompt = f"""Write this scene in full narrative prose - WRITE A DETAILED SCENE ({max_tokens * 0.75:.0f}-{max_tokens:.0f} words):
+        layout = self.api_handler.llm_settings.get('scene_prompt_layout', 'classic') \
+            if hasattr(self.api_handler, 'llm_settings') else 'classic'
+        
+        if layout == 'cache_friendly':
+            # Static prefix (system prompt + intent + whole bible) is identical for every
+            # scene, so Ollama reuses its KV cache and only prefills the scene message
+            print("   ♻️ Cache-friendly layout: bible in the shared system prefix")
+            system_prompt, max_tokens = self._build_cached_prefix(system_prompt, story_bible, max_tokens)
+            user_prompt = self._build_scene_user_prompt(
+                modified_scene_description, None, scene_number, total_scenes,
+                context_info, story_requirements_reminder, max_tokens
+            )
+        else:
+            # Fit the bible into the context window - only entries relevant to this scene
+            scene_bible = story_bible
+            budgeter = self._get_prompt_budgeter()
+            if budgeter:
+                fixed_tokens = budgeter.estimate_tokens(system_prompt) + budgeter.estimate_tokens(
+                    self._build_scene_user_prompt(modified_scene_description, "", scene_number, total_scenes,
+                                                  context_info, story_requirements_reminder, max_tokens)
+                )
+                scene_bible, budget_report = budgeter.fit_bible(
+                    story_bible, modified_scene_description, fixed_tokens, max_tokens
+                )
+                budgeter.show_report(budget_report, scene_number)
+                self._log_budget_report(budget_report, scene_number)
+                max_tokens = budget_report['output_tokens']
+            
+            self._share_with_prompt_log('scene_bible', scene_bible)
+            
+            # BUILD USER PROMPT (capture it before use)
+            user_prompt = self._build_scene_user_prompt(
+                modified_scene_description, scene_bible, scene_number, total_scenes,
+                context_info, story_requirements_reminder, max_tokens
+            )
+        
+        # Make API call with debug info
+        print(f"   🔧 Sending {max_tokens:,} tokens to Ollama API...")
+        response = self.api_handler.make_api_call_with_system_prompt(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=max_tokens,
+            stage="scene_writing",
+            on_token=on_token,
+            use_chat=(layout == 'cache_friendly')
+        )
+        
+        metrics = self.api_handler.get_last_metrics() if response else None
+        
+        if response:
+            actual_words = len(response.split())
+            if metrics and metrics.eval_count:
+                # Measured by Ollama - no words-per-token guessing needed
+                words_per_token = actual_words / metrics.eval_count
+                print(f"   ✅ Scene {scene_number} completed: {actual_words:,} words from {metrics.eval_count:,}/{max_tokens:,} tokens ({words_per_token:.2f} words/token)")
+                if metrics.eval_count >= max_tokens:
+                    print(f"   ⚠️ Scene hit the {max_tokens:,} token limit - it may be cut off")
+                elif metrics.eval_count < max_tokens * 0.3:  # Much shorter than the budget
+                    print(f"   ⚠️ Scene much shorter than expected - check Ollama model limits")
+            else:
+                expected_words = max_tokens * 0.75
+                print(f"   ✅ Scene {scene_number} completed: {actual_words:,} words (expected ~{expected_words:.0f})")
+                if actual_words < max_tokens * 0.3:  # Much shorter than expected
+                    print(f"   ⚠️ Scene much shorter than expected - check Ollama model limits")
+        
+        # RETURN BOTH CONTENT AND PROMPTS
+        return {
+            'content': response,
+            'system_prompt': system_prompt,
+            'user_prompt': user_prompt,
+            'metrics': metrics
+        }
 
-SCENE TO WRITE:
-{modified_scene_description}
+    def _build_scene_user_prompt(self, scene_description, story_bible, scene_number, total_scenes,
+                                 context_info, story_requirements_reminder, max_tokens):
+        """Scene writing user prompt (also used to measure everything except the bible)
 
-STORY BIBLE (for consistency):
-{story_bible}
+        story_bible=None leaves the bible out (cache_friendly layout keeps it in the system prefix)
+        """
+        bible_block = "" if story_bible is None else f"\nSTORY BIBLE (for consistency):\n{story_bible}\n"
+        return f"""Write this scene in full narrative prose - WRITE A DETAILED SCENE ({max_tokens * 0.75:.0f}-{max_tokens:.0f} words):
 
+SCENE TO WRITE:
+{scene_description}
+{bible_block}
 SCENE CONTEXT: Scene {scene_number} of {total_scenes}{context_info}{story_requirements_reminder}
 
 WRITING REQUIREMENTS:
@@ -103,29 +189,54 @@ Write an engaging, detailed scene that:
 - INCLUDES any mandatory events if they belong in this scene
 
 CRITICAL: Write until you have created a rich, detailed narrative experience."""
+
+    def _get_prompt_budgeter(self):
+        """PromptBudgeter sized to the context window APIHandler sends as num_ctx"""
+        if self.prompt_budgeter is None and hasattr(self.api_handler, 'get_context_window'):
+            self.prompt_budgeter = PromptBudgeter(
+                self.api_handler.get_context_window(),
+                trim_bible=self.api_handler.llm_settings.get('bible_trimming', True)
+            )
+        return self.prompt_budgeter
+
+    def _build_cached_prefix(self, system_prompt, story_bible, max_tokens):
+        """System prompt + full bible, fitted once per story so the prefix never changes between scenes
+
+        Returns (prefix, output_tokens); output_tokens is max_tokens unless the
+        budgeter had to cap it to keep the bible's opening.
+        """
+        key = hashlib.sha256(f"{system_prompt}\0{story_bible}\0{max_tokens}".encode('utf-8')).hexdigest()
+        if self._cached_prefix and self._cached_prefix[0] == key:
+            return self._cached_prefix[1], self._cached_prefix[2]
         
-        # Make API call with debug info
-        print(f"   🔧 Sending {max_tokens:,} tokens to Ollama API...")
-        response = self.api_handler.make_api_call_with_system_prompt(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            max_tokens=max_tokens,
-            stage="scene_writing"
-        )
-        
-        if response:
-            actual_words = len(response.split())
-            expected_words = max_tokens * 0.75
-            print(f"   ✅ Scene {scene_number} completed: {actual_words:,} words (expected ~{expected_words:.0f})")
-            if actual_words < max_tokens * 0.3:  # Much shorter than expected
-                print(f"   ⚠️ Scene much shorter than expected - check Ollama model limits")
+        bible = story_bible
+        budgeter = self._get_prompt_budgeter()
+        if budgeter:
+            # No per-scene relevance trimming here - that would change the prefix every scene.
+            # Reserve room for the longest scene message we expect instead.
+            whole_bible_budgeter = PromptBudgeter(budgeter.context_window, trim_bible=False)
+            fixed_tokens = whole_bible_budgeter.estimate_tokens(system_prompt) + self.SCENE_MESSAGE_RESERVE_TOKENS
+            bible, report = whole_bible_budgeter.fit_bible(story_bible, "", fixed_tokens, max_tokens)
+            whole_bible_budgeter.show_report(report, "prefix")
+            self._log_budget_report(report, "prefix")
+            max_tokens = report['output_tokens']
         
-        # RETURN BOTH CONTENT AND PROMPTS
-        return {
-            'content': response,
-            'system_prompt': system_prompt,
-            'user_prompt': user_prompt
-        }
+        prefix = f"{system_prompt}\n\nSTORY BIBLE (for consistency):\n{bible}"
+        self._share_with_prompt_log('scene_prefix', prefix)
+        self._cached_prefix = (key, prefix, max_tokens)
+        return prefix, max_tokens
+
+    def _share_with_prompt_log(self, label, text):
+        """Let the prompt log store a (trimmed) bible once instead of once per scene"""
+        prompt_logger = getattr(self.api_handler, 'prompt_logger', None)
+        if prompt_logger:
+            prompt_logger.register_shared_text(label, text)
+
+    def _log_budget_report(self, report, scene_number):
+        """Record what the budgeter dropped, truncated or capped in the prompt log"""
+        prompt_logger = getattr(self.api_handler, 'prompt_logger', None)
+        if prompt_logger:
+            prompt_logger.log_budget_report(scene_number, report)
 
     def generate_scene(self, scene_description, story_bible, scene_plan, scene_number, total_scenes):
         """Original method - returns only content for backward compatibility"""
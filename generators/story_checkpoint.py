@@ -0,0 +1,154 @@
+import os
+import json
+import glob
+import threading
+from datetime import datetime
+
+class StoryCheckpoint:
+    """On-disk manifest of a story run so a failed run can be resumed.
+
+    Stores the story bible, scene plan, parsed scene list and every finished
+    scene (text + prompts) in multiscene/stats/checkpoints/. The file is
+    rewritten after each step and removed once the final story is saved.
+    """
+
+    FOLDER_NAME = 'checkpoints'
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, stats_folder, blueprint_name, story_number, generation_config=None):
+        """Start a new checkpoint for a story run"""
+        checkpoint_folder = os.path.join(stats_folder, cls.FOLDER_NAME)
+        os.makedirs(checkpoint_folder, exist_ok=True)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base_name = blueprint_name.replace('.story.txt', '')
+        path = os.path.join(checkpoint_folder, f"{base_name}_{timestamp}_v{story_number}.checkpoint.json")
+
+        data = {
+            'blueprint_name': blueprint_name,
+            'story_number': story_number,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'updated_at': None,
+            'status': 'in_progress',
+            'generation_config': generation_config or {},
+            'story_bible': None,
+            'scene_plan': None,
+            'scenes': [],
+            'completed_scenes': {}
+        }
+        checkpoint = cls(path, data)
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, path):
+        """Load a checkpoint manifest from disk"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, json.load(f))
+
+    @classmethod
+    def list_checkpoints(cls, stats_folder):
+        """Return unfinished checkpoints, newest first"""
+        pattern = os.path.join(stats_folder, cls.FOLDER_NAME, '*.checkpoint.json')
+        checkpoints = []
+        for path in sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True):
+            try:
+                checkpoints.append(cls.load(path))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Skipping unreadable checkpoint {os.path.basename(path)}: {e}")
+        return checkpoints
+
+    @property
+    def blueprint_name(self):
+        return self.data['blueprint_name']
+
+    @property
+    def story_number(self):
+        return self.data['story_number']
+
+    @property
+    def story_bible(self):
+        return self.data['story_bible']
+
+    @property
+    def scene_plan(self):
+        return self.data['scene_plan']
+
+    @property
+    def scenes(self):
+        return self.data['scenes']
+
+    def save(self):
+        """Write the manifest atomically so a crash never leaves a half-written file"""
+        with self._lock:
+            self.data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+
+    def set_story_bible(self, story_bible):
+        self.data['story_bible'] = story_bible
+        self.save()
+
+    def set_scene_plan(self, scene_plan, scenes):
+        """Record the plan together with the scene list parsed from it"""
+        self.data['scene_plan'] = scene_plan
+        self.data['scenes'] = list(scenes)
+        self.save()
+
+    def record_scene(self, scene_number, content, system_prompt, user_prompt,
+                     scene_start, generation_time, execution_mode, metrics=None):
+        """Store a finished scene (safe to call from concurrent scene workers)"""
+        with self._lock:
+            self.data['completed_scenes'][str(scene_number)] = {
+                'content': content,
+                'system_prompt': system_prompt,
+                'user_prompt': user_prompt,
+                'scene_start': scene_start,
+                'generation_time': generation_time,
+                'execution_mode': execution_mode,
+                'metrics': metrics.to_dict() if metrics else None
+            }
+        self.save()
+
+    def get_scene(self, scene_number):
+        """Return the saved scene dict, or None if it still needs writing"""
+        return self.data['completed_scenes'].get(str(scene_number))
+
+    def completed_count(self):
+        return len(self.data['completed_scenes'])
+
+    def first_missing_scene(self):
+        """Scene number the run will continue from (None when all scenes are done)"""
+        for i in range(1, len(self.scenes) + 1):
+            if self.get_scene(i) is None:
+                return i
+        return None
+
+    def mark_failed(self, reason):
+        self.data['status'] = 'failed'
+        self.data['failure_reason'] = reason
+        self.save()
+
+    def describe(self):
+        """One-line summary for the resume menu"""
+        if self.scenes:
+            progress = f"{self.completed_count()}/{len(self.scenes)} scenes"
+        elif self.story_bible:
+            progress = "bible only"
+        else:
+            progress = "nothing saved yet"
+        return f"{self.blueprint_name} (story #{self.story_number}) - {progress} - last saved {self.data.get('updated_at')}"
+
+    def discard(self):
+        """Delete the checkpoint once the story has been saved"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -6,11 +6,15 @@ from .story_validator import StoryValidator
 from .story_bible_generator import StoryBibleGenerator
 from .scene_planner import ScenePlanner
 from .scene_writer import SceneWriter
+from .partial_story_writer import PartialStoryWriter
+from .story_checkpoint import StoryCheckpoint
+from token_metrics import TokenMetrics
 
 from database.story_context import AutoStoryContext
 import os
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from .context_tracker import ContextTracker
 from .story_intent_config import StoryIntentConfigurator
@@ -41,6 +45,12 @@ class StoryGenerator:
         # Extract app settings for prompt logging
         self.app_settings = ollama_settings.get('app_settings', {})
         
+        # Scenes written at once when they don't depend on each other (1 = sequential)
+        self.scene_parallelism = self.app_settings.get('scene_parallelism', 1) or 1
+        
+        # Optional callable(scene_number, content) run as each scene is finished (e.g. audio pipeline)
+        self.scene_listener = None
+        
         # Clean LLM settings (remove non-LLM specific settings)
         self.clean_llm_settings = {
             'model': ollama_settings.get('model'),
@@ -49,7 +59,13 @@ class StoryGenerator:
             'top_p': ollama_settings.get('top_p', 0.9),
             'top_k': ollama_settings.get('top_k', 40),
             'repeat_penalty': ollama_settings.get('repeat_penalty', 1.1),
-            'seed': ollama_settings.get('seed')
+            'seed': ollama_settings.get('seed'),
+            'stream_generation': self.app_settings.get('stream_generation', False),
+            'context_window': self.app_settings.get('context_window', 0),
+            'context_window_cap': self.app_settings.get('context_window_cap', 16384),
+            'bible_trimming': self.app_settings.get('bible_trimming', True),
+            'scene_prompt_layout': self.app_settings.get('scene_prompt_layout', 'classic'),
+            'keep_alive': self.app_settings.get('ollama_keep_alive', '30m')
         }
         
         # Initialize perspective controller
@@ -67,7 +83,8 @@ class StoryGenerator:
         self.prompt_logger = PromptLogger(
             self.stories_folder, 
             self.clean_llm_settings,
-            app_settings=self.app_settings
+            app_settings=self.app_settings,
+            run_label=ollama_settings.get('run_label')
         )
         self.api_handler = APIHandler(self.clean_llm_settings, self.prompt_logger)
         self.generation_stats = GenerationStats()
@@ -98,108 +115,176 @@ class StoryGenerator:
         """🎭 NEW: Configure perspective options"""
         return self.perspective_controller.configure_perspective(blueprint_content)
     
-    def generate_complete_story(self, blueprint_name, story_number=1):
-        """Generate complete story using all specialized modules"""
+    def generate_complete_story(self, blueprint_name, story_number=1, checkpoint=None):
+        """Generate complete story using all specialized modules
+
+        Pass a StoryCheckpoint to resume a failed run: the saved bible, plan
+        and finished scenes are reused and writing continues from the first
+        missing scene.
+        """
+        try:
+            return self._generate_complete_story(blueprint_name, story_number, checkpoint)
+        finally:
+            # Prompt log is written in the background - write this story to disk and
+            # release the writer thread and file handles (a reused generator reopens them)
+            self.prompt_logger.close()
+
+    def _generate_complete_story(self, blueprint_name, story_number, checkpoint):
         print(f"\n🎬 GENERATING COMPLETE STORY #{story_number}")
         print("="*50)
         
-        # Load and process blueprint
-        blueprint_path = os.path.join(self.blueprint_folder, blueprint_name)
-        if not os.path.exists(blueprint_path):
-            print(f"❌ Blueprint not found: {blueprint_name}")
-            return None, None
+        # Token metrics are reported per story
+        self.api_handler.reset_metrics()
+        
+        if checkpoint and checkpoint.story_bible:
+            # Resuming - the blueprint was already turned into a bible
+            story_bible = checkpoint.story_bible
+            print(f"♻️ Resuming from checkpoint: {os.path.basename(checkpoint.path)}")
+            print("   📖 Reusing saved story bible")
+        else:
+            # Load and process blueprint
+            blueprint_path = os.path.join(self.blueprint_folder, blueprint_name)
+            if not os.path.exists(blueprint_path):
+                print(f"❌ Blueprint not found: {blueprint_name}")
+                return None, None
 
-        with open(blueprint_path, 'r', encoding='utf-8') as f:
-            original_blueprint = f.read()
+            with open(blueprint_path, 'r', encoding='utf-8') as f:
+                original_blueprint = f.read()
 
-        # Apply gender swap if configured
-        gender_swap_mode = self.ollama_settings.get('gender_swap_mode', 'none')
-        if gender_swap_mode != "none":
-            print(f"🔄 Applying gender swap: {gender_swap_mode}")
-            blueprint_content = self.blueprint_processor.process_blueprint(original_blueprint, gender_swap_mode)
-        else:
-            blueprint_content = original_blueprint
+            # Apply gender swap if configured
+            gender_swap_mode = self.ollama_settings.get('gender_swap_mode', 'none')
+            if gender_swap_mode != "none":
+                print(f"🔄 Applying gender swap: {gender_swap_mode}")
+                blueprint_content = self.blueprint_processor.process_blueprint(original_blueprint, gender_swap_mode)
+            else:
+                blueprint_content = original_blueprint
 
-        print(f"📋 Using blueprint: {blueprint_name}")
-        
-        # Phase 1: Generate story bible (use processed blueprint)
-        bible_start = time.time()
-        story_bible = self.bible_generator.generate_story_bible(
-            blueprint_content, blueprint_name, self.content_settings, self.language_settings
-        )
-        bible_time = time.time() - bible_start
-        print(f"   ⏱️ Story bible generated in {bible_time:.1f}s")
+            print(f"📋 Using blueprint: {blueprint_name}")
+            
+            # Phase 1: Generate story bible (use processed blueprint)
+            bible_start = time.time()
+            story_bible = self.bible_generator.generate_story_bible(
+                blueprint_content, blueprint_name, self.content_settings, self.language_settings
+            )
+            bible_time = time.time() - bible_start
+            print(f"   ⏱️ Story bible generated in {bible_time:.1f}s")
+            
+            if not story_bible:
+                return None, None
+            
+            # Checkpoint from here on so a later failure doesn't cost the bible
+            if checkpoint is None:
+                checkpoint = StoryCheckpoint.create(
+                    self.stats_folder, blueprint_name, story_number, self._get_checkpoint_config()
+                )
+            checkpoint.set_story_bible(story_bible)
+            print(f"💾 Checkpoint: {checkpoint.path}")
         
-        if not story_bible:
-            return None, None
+        # Every later prompt repeats the bible - log it once and reference it by hash
+        self.prompt_logger.register_shared_text('story_bible', story_bible)
 
-        # Phase 2: Generate scene plan  
-        plan_start = time.time()  
-        scene_plan = self.scene_planner.generate_scene_plan(story_bible, blueprint_name)
-        plan_time = time.time() - plan_start
-        print(f"   ⏱️ Scene plan generated in {plan_time:.1f}s")
-        
-        if not scene_plan:
-            return None, None
+        if checkpoint.scenes:
+            scene_plan = checkpoint.scene_plan
+            scenes = checkpoint.scenes
+            print(f"   📋 Reusing saved scene plan ({len(scenes)} scenes)")
+        else:
+            # Phase 2: Generate scene plan  
+            plan_start = time.time()  
+            scene_plan = self.scene_planner.generate_scene_plan(story_bible, blueprint_name)
+            plan_time = time.time() - plan_start
+            print(f"   ⏱️ Scene plan generated in {plan_time:.1f}s")
+            
+            if not scene_plan:
+                checkpoint.mark_failed("scene plan generation failed")
+                return None, None
 
-        # Validate custom requirements
-        self.story_validator.validate_custom_requirements_in_plan(scene_plan)
+            # Validate custom requirements
+            self.story_validator.validate_custom_requirements_in_plan(scene_plan)
 
-        # Phase 3: Generate all scenes
-        scenes = self.story_validator.extract_scenes_from_plan(scene_plan)
-        if not scenes:
-            print("❌ No scenes found in scene plan")
-            return None, None
+            # Phase 3: Generate all scenes
+            scenes = self.story_validator.extract_scenes_from_plan(scene_plan)
+            if not scenes:
+                print("❌ No scenes found in scene plan")
+                checkpoint.mark_failed("no scenes found in scene plan")
+                return None, None
+            
+            checkpoint.set_scene_plan(scene_plan, scenes)
 
-        # Set up progress tracking
-        self.generation_stats.start_generation(len(scenes))
+        # Scenes finished by an earlier run of this checkpoint
+        resumed_scenes = {i for i in range(1, len(scenes) + 1) if checkpoint.get_scene(i)}
+        resumed_count = len(resumed_scenes)
+        if resumed_count:
+            print(f"♻️ {resumed_count}/{len(scenes)} scenes already written - continuing from scene {checkpoint.first_missing_scene()}")
+
+        # Set up progress tracking (only scenes that still need writing)
+        self.generation_stats.start_generation(len(scenes) - resumed_count)
         
-        print(f"📝 Writing {len(scenes)} scenes...")
+        print(f"📝 Writing {len(scenes) - resumed_count} scenes...")
         self.generation_stats.show_progress()
         
         # CHANGED: Store clean story content WITH scene numbers for readability
         clean_story_scenes = []  # Store scenes with their numbers for the story file
         detailed_scene_info = []  # Scene metadata with prompts instead of content
+        
+        # Streamed tokens / finished scenes go to a partial file so a late failure loses nothing
+        partial_writer = None
+        if self.api_handler.stream_enabled:
+            partial_writer = PartialStoryWriter(self.stories_folder, blueprint_name, story_number)
+            print(f"💾 Streaming scenes to: {partial_writer.path}")
+        
+        # Decide between sequential and concurrent scene writing
+        execution_mode = self._select_scene_execution_mode(len(scenes))
+        if execution_mode == "parallel":
+            scene_results = self._write_scenes_parallel(scenes, story_bible, scene_plan, partial_writer, checkpoint)
+            if scene_results is None:
+                checkpoint.mark_failed("scene generation failed")
+                self._keep_partial_story(partial_writer)
+                self._show_resume_hint(checkpoint)
+                return None, None
     
         for i, scene_desc in enumerate(scenes, 1):
-            scene_start = time.time()
-            
-            # Try new method first, fall back to old method if it doesn't exist
-            try:
-                scene_result = self.scene_writer.generate_scene_with_prompts(
-                    scene_desc, story_bible, scene_plan, i, len(scenes)
-                )
-                if scene_result and scene_result.get('content'):
-                    scene_content = scene_result['content']
-                    system_prompt = scene_result.get('system_prompt', 'System prompt not captured')
-                    user_prompt = scene_result.get('user_prompt', 'User prompt not captured')
-                else:
-                    scene_content = None
-                    system_prompt = 'Method failed'
-                    user_prompt = 'Method failed'
-            except AttributeError:
-                # Fallback to old method if new method doesn't exist yet
-                scene_content = self.scene_writer.generate_scene(
-                    scene_desc, story_bible, scene_plan, i, len(scenes)
+            saved_scene = checkpoint.get_scene(i) if i in resumed_scenes else None
+            if saved_scene:
+                # Written by an earlier run - reuse it as-is
+                scene_content = saved_scene['content']
+                system_prompt = saved_scene['system_prompt']
+                user_prompt = saved_scene['user_prompt']
+                scene_start = saved_scene['scene_start']
+                scene_time = saved_scene['generation_time']
+                scene_metrics = TokenMetrics.from_dict(saved_scene.get('metrics'))
+                if partial_writer and execution_mode != "parallel":
+                    partial_writer.write_scene(i, scene_content)
+                self._notify_scene_listener(i, scene_content)
+            elif execution_mode == "parallel":
+                # Already written concurrently - reassemble in scene order
+                scene_content, system_prompt, user_prompt, scene_start, scene_time, scene_metrics = scene_results[i]
+            else:
+                on_token = None
+                if partial_writer:
+                    partial_writer.begin_scene(i)
+                    on_token = partial_writer.write
+                scene_content, system_prompt, user_prompt, scene_start, scene_time, scene_metrics = self._write_scene(
+                    scene_desc, story_bible, scene_plan, i, len(scenes), on_token
                 )
-                system_prompt = 'Old method used - prompts not captured'
-                user_prompt = 'Old method used - prompts not captured'
-            
-            scene_time = time.time() - scene_start
+                if scene_content:
+                    checkpoint.record_scene(i, scene_content, system_prompt, user_prompt,
+                                            scene_start, scene_time, execution_mode, scene_metrics)
+                    self._notify_scene_listener(i, scene_content)
             
             if scene_content:
                 # Calculate scene stats
                 word_count = len(scene_content.split())
                 char_count = len(scene_content)
                 
-                # Update progress tracking
-                self.generation_stats.complete_scene(scene_time, word_count, char_count)
-                
-                # Show scene completion stats
-                self.generation_stats.show_scene_completion(i, scene_time, word_count, char_count)
-                
-                # Show overall progress
-                self.generation_stats.show_progress()
+                # Update progress tracking (parallel mode already did this as scenes finished)
+                if execution_mode != "parallel" and not saved_scene:
+                    self.generation_stats.complete_scene(scene_time, word_count, char_count, scene_metrics)
+                    
+                    # Show scene completion stats
+                    self.generation_stats.show_scene_completion(i, scene_time, word_count, char_count, scene_metrics)
+                    
+                    # Show overall progress
+                    self.generation_stats.show_progress()
                 
                 # MODIFIED: Add scene header to content for story file
                 scene_with_header = f"Scene {i}\n\n{scene_content}"
@@ -208,10 +293,13 @@ class StoryGenerator:
                 # METADATA: Store detailed scene info with PROMPTS instead of content
                 scene_metadata = {
                     'scene_number': i,
-                    'completed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'started_at': datetime.fromtimestamp(scene_start).strftime('%Y-%m-%d %H:%M:%S'),
+                    'completed_at': datetime.fromtimestamp(scene_start + scene_time).strftime('%Y-%m-%d %H:%M:%S'),
                     'word_count': word_count,
                     'char_count': char_count,
                     'generation_time': scene_time,
+                    'metrics': scene_metrics,
+                    'execution_mode': saved_scene['execution_mode'] + " (resumed)" if saved_scene else execution_mode,
                     'system_prompt': system_prompt,
                     'user_prompt': user_prompt,
                 }
@@ -219,11 +307,16 @@ class StoryGenerator:
                 
             else:
                 print(f"❌ Failed to generate scene {i}")
+                if partial_writer:
+                    partial_writer.mark_failed(i)
+                checkpoint.mark_failed(f"scene {i} generation failed")
+                self._keep_partial_story(partial_writer)
+                self._show_resume_hint(checkpoint)
                 return None, None
 
         # Show final statistics
         total_time = time.time() - self.generation_stats.stats['start_time']
-        self.generation_stats.show_final_stats(total_time)
+        self.generation_stats.show_final_stats(total_time, self.api_handler.get_stage_metrics())
         
         # Join story scenes with headers and separators
         complete_story_with_scenes = "\n\n" + "="*50 + "\n\n".join(clean_story_scenes) + "\n\n" + "="*50
@@ -240,6 +333,11 @@ class StoryGenerator:
         print(f"✅ Clean story saved: {story_filename}")
         print(f"📊 Detailed metadata saved to stats: {metadata_filename}")
         
+        # Final story is on disk - the partial copy and checkpoint are no longer needed
+        if partial_writer:
+            partial_writer.discard()
+        checkpoint.discard()
+        
         # Show logging information if enabled
         if self.prompt_logger and self.prompt_logger.logging_enabled and self.prompt_logger.prompt_log_file:
             log_filename = os.path.basename(self.prompt_logger.prompt_log_file)
@@ -249,6 +347,150 @@ class StoryGenerator:
         
         return story_filename, self.context_tracker
 
+    def _keep_partial_story(self, partial_writer):
+        """Close the partial file on failure and tell the user where the finished scenes are"""
+        if partial_writer:
+            partial_writer.close()
+            print(f"💾 Scenes written so far kept in: {partial_writer.path}")
+
+    def _notify_scene_listener(self, scene_number, scene_content):
+        """Hand a finished scene to the listener - its problems must never stop the story"""
+        if not self.scene_listener:
+            return
+        try:
+            self.scene_listener(scene_number, scene_content)
+        except Exception as e:
+            print(f"⚠️ Scene listener failed for scene {scene_number}: {e}")
+
+    def _show_resume_hint(self, checkpoint):
+        """Tell the user how to pick up a failed run"""
+        print(f"💾 Progress saved: {checkpoint.completed_count()}/{len(checkpoint.scenes)} scenes in {checkpoint.path}")
+        print("   ♻️ Use 'Resume Failed Story' in the Story Generation menu to continue")
+
+    def _get_checkpoint_config(self):
+        """Settings saved with a checkpoint so a resumed run writes scenes the same way"""
+        return {
+            'llm_settings': {key: value for key, value in self.clean_llm_settings.items() if key != 'stream_generation'},
+            'narrative_consistency': self.narrative_consistency,
+            'content_settings': self.content_settings,
+            'language_settings': self.language_settings,
+            'system_prompts': self.system_prompts,
+            'gender_swap_mode': self.ollama_settings.get('gender_swap_mode', 'none'),
+            'custom_story_title': getattr(self, 'custom_story_title', None)
+        }
+
+    def _write_scene(self, scene_desc, story_bible, scene_plan, scene_number, total_scenes, on_token=None):
+        """Write one scene; returns (content, system_prompt, user_prompt, start_time, duration, metrics)"""
+        scene_start = time.time()
+        metrics = None
+        
+        # Try new method first, fall back to old method if it doesn't exist
+        try:
+            scene_result = self.scene_writer.generate_scene_with_prompts(
+                scene_desc, story_bible, scene_plan, scene_number, total_scenes, on_token=on_token
+            )
+            if scene_result and scene_result.get('content'):
+                scene_content = scene_result['content']
+                system_prompt = scene_result.get('system_prompt', 'System prompt not captured')
+                user_prompt = scene_result.get('user_prompt', 'User prompt not captured')
+                metrics = scene_result.get('metrics')
+            else:
+                scene_content = None
+                system_prompt = 'Method failed'
+                user_prompt = 'Method failed'
+        except AttributeError:
+            # Fallback to old method if new method doesn't exist yet
+            scene_content = self.scene_writer.generate_scene(
+                scene_desc, story_bible, scene_plan, scene_number, total_scenes
+            )
+            system_prompt = 'Old method used - prompts not captured'
+            user_prompt = 'Old method used - prompts not captured'
+        
+        return scene_content, system_prompt, user_prompt, scene_start, time.time() - scene_start, metrics
+
+    def _get_scene_feedback_sources(self):
+        """List context sources that feed earlier scenes' text into later scene prompts"""
+        feedback_sources = []
+        
+        # ContextTracker summary is rebuilt from tracked scene content for every prompt
+        if self.scene_writer.context_tracker is not None:
+            feedback_sources.append("ContextTracker (auto-tracking consistency)")
+        
+        return feedback_sources
+
+    def _select_scene_execution_mode(self, total_scenes):
+        """Pick 'parallel' when scenes only depend on bible/plan/description, else 'sequential'"""
+        if self.scene_parallelism <= 1 or total_scenes <= 1:
+            return "sequential"
+        
+        feedback_sources = self._get_scene_feedback_sources()
+        if feedback_sources:
+            print(f"   🔗 Scenes depend on earlier scenes via: {', '.join(feedback_sources)}")
+            print("   ➡️ Writing scenes sequentially")
+            return "sequential"
+        
+        print(f"   ⚡ Scenes are independent - writing up to {self.scene_parallelism} at once")
+        return "parallel"
+
+    def _write_scenes_parallel(self, scenes, story_bible, scene_plan, partial_writer=None, checkpoint=None):
+        """Write independent scenes concurrently; returns {scene_number: result} or None on failure"""
+        results = {}
+        
+        if partial_writer and checkpoint:
+            # Scenes from an earlier run go into the partial file first
+            for i in range(1, len(scenes) + 1):
+                saved_scene = checkpoint.get_scene(i)
+                if saved_scene:
+                    partial_writer.write_scene(i, saved_scene['content'])
+        
+        failed = False
+        with ThreadPoolExecutor(max_workers=self.scene_parallelism) as executor:
+            futures = {
+                executor.submit(self._write_scene, scene_desc, story_bible, scene_plan, i, len(scenes)): i
+                for i, scene_desc in enumerate(scenes, 1)
+                if not (checkpoint and checkpoint.get_scene(i))
+            }
+            
+            for future in as_completed(futures):
+                scene_number = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ Scene {scene_number} raised an error: {e}")
+                    result = (None, None, None, time.time(), 0, None)
+                
+                scene_content, system_prompt, user_prompt, scene_start, scene_time, scene_metrics = result
+                if not scene_content:
+                    print(f"❌ Failed to generate scene {scene_number}")
+                    if partial_writer:
+                        partial_writer.mark_failed(scene_number)
+                    # Stop queued scenes; ones already running still finish and get checkpointed
+                    for pending in futures:
+                        pending.cancel()
+                    failed = True
+                    continue
+                
+                results[scene_number] = result
+                if checkpoint:
+                    checkpoint.record_scene(scene_number, scene_content, system_prompt, user_prompt,
+                                            scene_start, scene_time, "parallel", scene_metrics)
+                
+                # Concurrent scenes can't share one token stream - persist each scene whole
+                if partial_writer:
+                    partial_writer.write_scene(scene_number, scene_content)
+                self._notify_scene_listener(scene_number, scene_content)
+                
+                # Progress is reported in completion order, content is reassembled in scene order
+                word_count = len(scene_content.split())
+                char_count = len(scene_content)
+                self.generation_stats.complete_scene(scene_time, word_count, char_count, scene_metrics)
+                self.generation_stats.show_scene_completion(scene_number, scene_time, word_count, char_count, scene_metrics)
+                self.generation_stats.show_progress()
+        
+        return None if failed else results
+
     def _save_detailed_metadata_file(self, blueprint_name, story_number, story_title, detailed_scene_info):
         """Save detailed metadata file with scene statistics and prompts used"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -287,6 +529,23 @@ class StoryGenerator:
             f.write(f"Total Generation Time: {self.generation_stats._format_time(total_time)}\n")
             f.write(f"Average Words per Scene: {total_words/len(detailed_scene_info):.1f}\n")
             
+            # Token accounting measured by Ollama (prefill = prompt processing, decode = generation)
+            scene_metrics = TokenMetrics.combine(scene.get('metrics') for scene in detailed_scene_info)
+            if scene_metrics.has_data:
+                f.write(f"\nTOKEN METRICS (measured by Ollama):\n")
+                f.write(f"Scene Prompt Tokens: {scene_metrics.prompt_eval_count:,}\n")
+                f.write(f"Scene Generated Tokens: {scene_metrics.eval_count:,}\n")
+                if scene_metrics.eval_count:
+                    f.write(f"Words per Generated Token: {total_words / scene_metrics.eval_count:.2f}\n")
+                f.write(f"Prefill Speed: {scene_metrics.prefill_tokens_per_second:.1f} tokens/sec\n")
+                f.write(f"Decode Speed: {scene_metrics.decode_tokens_per_second:.1f} tokens/sec\n")
+                
+                stage_metrics = self.api_handler.get_stage_metrics()
+                if stage_metrics:
+                    f.write("By stage (this run):\n")
+                    for stage, metrics in stage_metrics.items():
+                        f.write(f"  {stage}: {metrics.calls} call(s) | {metrics.summary()}\n")
+            
             # MODIFIED: Write detailed scene breakdown with PROMPTS instead of full content
             f.write(f"\n{'='*60}\n")
             f.write("DETAILED SCENE BREAKDOWN WITH PROMPTS USED\n")
@@ -294,10 +553,18 @@ class StoryGenerator:
             
             for scene in detailed_scene_info:
                 f.write(f"=== SCENE {scene['scene_number']} ===\n")
+                if 'started_at' in scene:
+                    f.write(f"Started at: {scene['started_at']}\n")
                 f.write(f"Completed at: {scene['completed_at']}\n")
                 f.write(f"Word count: {scene['word_count']:,} words\n")
                 f.write(f"Character count: {scene['char_count']:,} characters\n")
                 f.write(f"Generation time: {scene['generation_time']:.1f}s\n")
+                metrics = scene.get('metrics')
+                if metrics and metrics.has_data:
+                    f.write(f"Prompt tokens: {metrics.prompt_eval_count:,} ({metrics.prefill_tokens_per_second:.1f} tokens/sec prefill)\n")
+                    f.write(f"Generated tokens: {metrics.eval_count:,} ({metrics.decode_tokens_per_second:.1f} tokens/sec decode)\n")
+                if 'execution_mode' in scene:
+                    f.write(f"Execution mode: {scene['execution_mode']}\n")
                 f.write("-" * 50 + "\n\n")
                 
                 # NEW: Write system prompt
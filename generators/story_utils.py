@@ -1,10 +1,12 @@
-import requests
 import json
 import os
 import re
 import time
 from datetime import datetime, timedelta
 
+from ollama_client import get_ollama_client
+from token_metrics import TokenMetrics
+
 class StoryUtils:
     """Shared utilities for story generation components"""
     
@@ -60,7 +62,10 @@ class StoryUtils:
     
     @staticmethod
     def estimate_tokens(text):
-        """Rough estimate of tokens in text (1 token ≈ 4 characters)"""
+        """Rough estimate of tokens in text (1 token ≈ 4 characters)
+        
+        Only used before a call is made - afterwards use TokenMetrics from the response.
+        """
         return len(text) // 4
     
     @staticmethod
@@ -89,8 +94,6 @@ class StoryUtils:
         print(f"  🔄 {phase_name} in progress...")
         start_time = time.time()
         
-        url = "http://localhost:11434/api/generate"
-        
         # Get base system prompt and combine it
         if blueprint_folder and blueprint_name:
             base_system = StoryUtils.get_base_system_prompt(blueprint_folder, blueprint_name)
@@ -126,24 +129,25 @@ class StoryUtils:
         }
         
         try:
-            response = requests.post(url, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = get_ollama_client().generate(data)
             
             end_time = time.time()
             duration = end_time - start_time
             
             response_text = result.get("response", "No response generated")
-            output_tokens = StoryUtils.estimate_tokens(response_text)
-            total_tokens = input_tokens + output_tokens
-            
-            # Calculate generation speed
-            tokens_per_second = output_tokens / duration if duration > 0 else 0
+            metrics = TokenMetrics.from_response(result, stage=phase_name)
             
             print(f"  ✅ {phase_name} completed!")
             print(f"    ⏱️  Duration: {StoryUtils.format_duration(duration)}")
-            print(f"    📈 Output: ~{output_tokens:,} tokens | Total: ~{total_tokens:,} tokens")
-            print(f"    🚀 Speed: ~{tokens_per_second:.1f} tokens/sec")
+            if metrics.has_data:
+                # Real counts and throughput reported by Ollama
+                print(f"    📈 Input: {metrics.prompt_eval_count:,} tokens | Output: {metrics.eval_count:,} tokens | Total: {metrics.total_tokens:,} tokens")
+                print(f"    🚀 Speed: {metrics.decode_tokens_per_second:.1f} tokens/sec (prefill {metrics.prefill_tokens_per_second:.1f} tokens/sec)")
+            else:
+                output_tokens = StoryUtils.estimate_tokens(response_text)
+                tokens_per_second = output_tokens / duration if duration > 0 else 0
+                print(f"    📈 Output: ~{output_tokens:,} tokens | Total: ~{input_tokens + output_tokens:,} tokens")
+                print(f"    🚀 Speed: ~{tokens_per_second:.1f} tokens/sec")
             
             return response_text
             
@@ -3,6 +3,8 @@
 import requests
 import json
 
+from ollama_client import get_ollama_client
+
 class AIScenePromptCreator:
     def __init__(self, template_manager):
         self.template_manager = template_manager
@@ -370,14 +372,11 @@ Return ONLY the system prompt, no additional commentary."""
         
         try:
             # Use the ModelTester's configuration for the API call
-            import requests
             import json
             
             # Get full configuration from ModelTester
             test_config = self.template_manager.model_tester.test_config
             
-            url = "http://localhost:11434/api/generate"
-            
             data = {
                 "model": configured_model,
                 "prompt": f"System: {ai_system_prompt}\n\nUser: {ai_user_prompt}\n\nAssistant:",
@@ -395,7 +394,7 @@ Return ONLY the system prompt, no additional commentary."""
             if timeout == 0:  # Unlimited timeout
                 timeout = None
             
-            response = requests.post(url, json=data, timeout=timeout)
+            response = get_ollama_client().post("/api/generate", data, timeout=timeout)
             response.raise_for_status()
             result = response.json()
             
@@ -408,7 +407,7 @@ Return ONLY the system prompt, no additional commentary."""
                 return None
                 
         except requests.exceptions.ConnectionError:
-            print("❌ Cannot connect to Ollama. Is Ollama running on http://localhost:11434?")
+            print(f"❌ Cannot connect to Ollama. Is Ollama running on {get_ollama_client().host}?")
             return None
         except requests.exceptions.Timeout:
             print("❌ Request timed out. The model may be taking too long to respond.")
@@ -7,6 +7,11 @@ import glob
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+from ollama_client import get_ollama_client, OllamaError
+from token_metrics import TokenMetrics
+from folder_manager import FolderManager
+from .results_store import ResultsStore
+
 class ModelTester:
     def __init__(self, stories_folder: str):
         self.stories_folder = stories_folder
@@ -33,8 +38,15 @@ class ModelTester:
         # Load saved configuration
         self.test_config = self._load_config()
         
+        # Metadata and metrics of every result (the texts stay in laboratory/scenes)
+        self.results_store = ResultsStore(os.path.join(self.laboratory_base, 'results.db'))
+        self.results_store.import_once(self.laboratory_metadata, self.laboratory_scenes)
+        
         self.current_session = None
         self.test_cancelled = False
+        
+        # Cached single-pass folder scans for the laboratory stats in the testing menu
+        self.folder_manager = FolderManager({'Laboratory': self.laboratory_base})
     
     def _migrate_config_if_needed(self):
         """Migrate config from old location to new location"""
@@ -91,7 +103,7 @@ class ModelTester:
         print(f"Test model set and saved: {model_name}")
     
     def estimate_tokens(self, text: str) -> int:
-        """Rough estimation of tokens from text"""
+        """Rough estimation of tokens from text (fallback when Ollama reports no eval_count)"""
         if not text:
             return 0
         
@@ -104,14 +116,7 @@ class ModelTester:
     
     def get_available_models(self) -> List[str]:
         """Get list of available Ollama models"""
-        try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
-            if response.status_code == 200:
-                models_data = response.json()
-                return [model['name'] for model in models_data.get('models', [])]
-            return []
-        except:
-            return []
+        return get_ollama_client().list_models()
     
     def stream_ollama_request(self, system_prompt: str, user_prompt: str, 
                              config: Dict = None, callback=None) -> Dict:
@@ -141,6 +146,7 @@ class ModelTester:
         start_time = time.time()
         full_response = ""
         actual_tokens_used = 0
+        metrics = TokenMetrics()
         
         # Determine timeouts
         connection_timeout = config.get('connection_timeout', 30)
@@ -161,17 +167,38 @@ class ModelTester:
             elif callback and read_timeout == 0:
                 callback(f"[Starting generation with unlimited timeout - this may take a very long time...]\n", "")
             
-            response = requests.post(
-                "http://localhost:11434/api/chat",
-                json=payload,
-                stream=True,
-                timeout=timeout_config
-            )
+            client = get_ollama_client()
             
-            if response.status_code != 200:
+            try:
+                for data in client.stream("/api/chat", payload, timeout=timeout_config):
+                    if self.test_cancelled:
+                        return {
+                            'success': False,
+                            'error': 'Test cancelled by user',
+                            'response': full_response,
+                            'generation_time': time.time() - start_time,
+                            'word_count': len(full_response.split()),
+                            'token_count': actual_tokens_used,
+                            'estimated_tokens': self.estimate_tokens(full_response),
+                            'timeout_used': timeout_display
+                        }
+                    
+                    content = client.chunk_text(data)
+                    if content:
+                        full_response += content
+                        if callback:
+                            callback(content, full_response)
+                    
+                    if data.get('done', False):
+                        metrics = TokenMetrics.from_response(data, stage="model_test")
+                        if 'eval_count' in data:
+                            actual_tokens_used = data['eval_count']
+            except OllamaError as e:
+                if full_response:
+                    raise
                 return {
                     'success': False,
-                    'error': f"HTTP {response.status_code}: {response.text}",
+                    'error': str(e),
                     'response': '',
                     'generation_time': 0,
                     'word_count': 0,
@@ -180,39 +207,6 @@ class ModelTester:
                     'timeout_used': timeout_display
                 }
             
-            last_activity = time.time()
-            
-            for line in response.iter_lines():
-                if self.test_cancelled:
-                    return {
-                        'success': False,
-                        'error': 'Test cancelled by user',
-                        'response': full_response,
-                        'generation_time': time.time() - start_time,
-                        'word_count': len(full_response.split()),
-                        'token_count': actual_tokens_used,
-                        'estimated_tokens': self.estimate_tokens(full_response),
-                        'timeout_used': timeout_display
-                    }
-                
-                if line:
-                    last_activity = time.time()
-                    try:
-                        data = json.loads(line.decode('utf-8'))
-                        
-                        if 'message' in data and 'content' in data['message']:
-                            content = data['message']['content']
-                            full_response += content
-                            if callback:
-                                callback(content, full_response)
-                        
-                        if data.get('done', False):
-                            if 'eval_count' in data:
-                                actual_tokens_used = data['eval_count']
-                            
-                    except json.JSONDecodeError:
-                        continue
-            
             generation_time = time.time() - start_time
             word_count = len(full_response.split())
             
@@ -226,6 +220,10 @@ class ModelTester:
                 'word_count': word_count,
                 'token_count': actual_tokens_used,
                 'estimated_tokens': self.estimate_tokens(full_response),
+                'prompt_token_count': metrics.prompt_eval_count,
+                'tokens_per_second': metrics.decode_tokens_per_second,
+                'prefill_tokens_per_second': metrics.prefill_tokens_per_second,
+                'metrics': metrics.to_dict(),
                 'config_used': config.copy(),
                 'timeout_used': timeout_display
             }
@@ -325,7 +323,10 @@ class ModelTester:
         return session_folder
     
     def save_test_result(self, result: Dict, test_info: Dict, session_folder: str):
-        """Save test result with new laboratory structure - separate story from metadata"""
+        """Save the story to laboratory/scenes/ and its metadata to the results store
+        
+        Returns (story_filepath, result_id).
+        """
         timestamp = datetime.datetime.now().strftime("%H%M%S")
         short_model = self.get_short_model_name()
         test_type = test_info.get('test_type', 'test')
@@ -333,23 +334,22 @@ class ModelTester:
         # Base filename without extension
         base_filename = f"{short_model}_{test_type}_{timestamp}"
         
-        # Save the story file to laboratory/scenes/
-        story_filename = f"{base_filename}.txt"
-        story_filepath = os.path.join(self.laboratory_scenes, story_filename)
-        
-        # Save metadata to laboratory/metadata/
-        metadata_filename = f"{base_filename}_meta.json"
-        metadata_filepath = os.path.join(self.laboratory_metadata, metadata_filename)
-        
-        # Write story file (just the generated content)
-        with open(story_filepath, 'w', encoding='utf-8') as f:
-            if result.get('success', False):
-                f.write(result.get('response', ''))
-            else:
-                f.write(f"ERROR: {result.get('error', 'Unknown error')}")
+        # Write story file (just the generated content); parallel runs in the same second get a suffix
+        content = result.get('response', '') if result.get('success', False) else f"ERROR: {result.get('error', 'Unknown error')}"
+        story_filepath = os.path.join(self.laboratory_scenes, f"{base_filename}.txt")
+        suffix = 1
+        while True:
+            try:
+                with open(story_filepath, 'x', encoding='utf-8') as f:
+                    f.write(content)
+                break
+            except FileExistsError:
+                suffix += 1
+                story_filepath = os.path.join(self.laboratory_scenes, f"{base_filename}_{suffix}.txt")
         
-        # Write metadata file (system prompt, user prompt, stats)
-        metadata = {
+        # Metadata row (system prompt, user prompt, stats); extra test_info fields are kept too
+        metadata = {k: v for k, v in test_info.items()}
+        metadata.update({
             'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'model': test_info.get('model', 'Unknown'),
             'test_type': test_info.get('test_type', 'Unknown'),
@@ -360,42 +360,28 @@ class ModelTester:
             'word_count': result.get('word_count', 0),
             'token_count': result.get('token_count', 0),
             'estimated_tokens': result.get('estimated_tokens', 0),
+            'prompt_token_count': result.get('prompt_token_count'),
+            'tokens_per_second': result.get('tokens_per_second'),
             'success': result.get('success', False),
             'system_prompt': test_info.get('system_prompt', 'Not specified'),
             'user_prompt': test_info.get('user_prompt', 'Not specified'),
             'config_used': result.get('config_used', {}),
-            'story_file': story_filename,
+            'story_path': story_filepath,
+            'session_folder': session_folder,
             'error': result.get('error', None) if not result.get('success', False) else None
-        }
+        })
         
         # Add performance metrics
         if result.get('generation_time', 0) > 0:
             metadata['words_per_minute'] = (result.get('word_count', 0) / result['generation_time']) * 60
             metadata['tokens_per_minute'] = (result.get('token_count', 0) / result['generation_time']) * 60
         
-        with open(metadata_filepath, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
-        
-        return story_filepath, metadata_filepath
+        result_id = self.results_store.add_result(metadata)
+        return story_filepath, result_id
     
     def get_folder_size(self, folder_path: str) -> int:
         """Calculate total size of a folder in bytes"""
-        if not os.path.exists(folder_path):
-            return 0
-        
-        total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(folder_path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except (OSError, FileNotFoundError):
-                        continue
-        except (OSError, PermissionError):
-            return 0
-        
-        return total_size
+        return self.folder_manager.get_folder_size(folder_path)
     
     def format_size(self, size_bytes: int) -> str:
         """Convert bytes to human readable format"""
@@ -421,17 +407,7 @@ class ModelTester:
     
     def count_files_in_folder(self, folder_path: str) -> int:
         """Count total files in a folder"""
-        if not os.path.exists(folder_path):
-            return 0
-        
-        file_count = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(folder_path):
-                file_count += len(filenames)
-        except (OSError, PermissionError):
-            return 0
-        
-        return file_count
+        return self.folder_manager.count_files_in_folder(folder_path)
     
     def get_test_results_stats(self) -> Dict:
         """Get statistics about laboratory content"""
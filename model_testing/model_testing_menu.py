@@ -133,9 +133,11 @@ class ModelTestingMenu:
                 elif choice == "3":
                     self.single_scene_story_settings()
                 elif choice == "4":
+                    self.run_parameter_sweep()
+                elif choice == "5":
                     break
                 else:
-                    print("Invalid option. Please select 1-4.")
+                    print("Invalid option. Please select 1-5.")
                     input("Press Enter to continue...")
                 
             except KeyboardInterrupt:
@@ -175,8 +177,17 @@ class ModelTestingMenu:
         print("1.  Template Manager (System & User Prompts)")
         print("2.  Scene & Story Creator")
         print("3.  Single Scene & Story LLM Settings") 
-        print("4.  Back to Main Menu")
-        print("\nSelect option (1-4): ", end="")
+        print("4.  Parameter Sweep (compare sampling settings)")
+        print("5.  Back to Main Menu")
+        print("\nSelect option (1-5): ", end="")
+    
+    def run_parameter_sweep(self):
+        """Run or resume a sweep over the single scene LLM settings"""
+        from .parameter_sweep import ParameterSweep
+
+        sweep = ParameterSweep(self.model_tester)
+        sweep.workshop = self.scene_workshop
+        sweep.run_sweep_menu()
     
     def single_scene_story_settings(self):
         """Configure single scene & story LLM settings"""
@@ -267,7 +267,7 @@ class NarrativeLab:
             'style': style['name']
         }
         
-        filepath = self.model_tester.save_test_result(result, test_info, session_folder)
+        filepath, _ = self.model_tester.save_test_result(result, test_info, session_folder)
         print(f"💾 Saved to: {os.path.basename(filepath)}")
         
         input("\nPress Enter to continue...")
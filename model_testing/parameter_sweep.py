@@ -1,16 +1,498 @@
-import itertools
+import os
+import csv
+import json
 import time
+import random
+import hashlib
 import datetime
-import os
-from typing import Dict, List, Tuple, Any, Callable
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Any, Optional
 from .model_tester import ModelTester
 
+
+# Parameters a sweep can vary: name -> (lowest, highest, type). num_predict is
+# sent to Ollama from the tester config's 'max_tokens'.
+SWEEP_PARAMETERS = {
+    'temperature': (0.0, 2.0, float),
+    'top_p': (0.0, 1.0, float),
+    'top_k': (1, 200, int),
+    'repeat_penalty': (0.5, 2.0, float),
+    'num_predict': (16, 32768, int),
+}
+PLAN_TYPES = ('grid', 'random', 'lhs')
+
+RESULT_COLUMNS = [
+    'run_key', 'run_index', 'repeat', 'model', 'temperature', 'top_p', 'top_k', 'repeat_penalty',
+    'num_predict', 'success', 'error', 'generation_time', 'word_count', 'token_count',
+    'prompt_token_count', 'tokens_per_second', 'words_per_minute', 'timestamp', 'response'
+]
+
+
+def _coerce(name: str, value):
+    low, high, kind = SWEEP_PARAMETERS[name]
+    value = min(max(kind(value), kind(low)), kind(high))
+    return value if kind is int else round(value, 4)
+
+
+def _range_values(name: str, low, high, steps: int) -> List:
+    """steps evenly spaced values from low to high (duplicates dropped for ints)"""
+    if steps <= 1:
+        return [_coerce(name, low)]
+    values = [_coerce(name, low + (high - low) * i / (steps - 1)) for i in range(steps)]
+    return list(dict.fromkeys(values))
+
+
+def grid_plan(space: Dict[str, Any], grid_steps: int = 3) -> List[Dict]:
+    """Every combination; (low, high) ranges become grid_steps evenly spaced values"""
+    axes = []
+    for name, spec in space.items():
+        if isinstance(spec, tuple):
+            axes.append([(name, value) for value in _range_values(name, spec[0], spec[1], grid_steps)])
+        else:
+            axes.append([(name, value) for value in spec])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+
+def random_plan(space: Dict[str, Any], samples: int, seed: int) -> List[Dict]:
+    """Independent uniform draws from each range, random choice from each value list"""
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(samples):
+        point = {}
+        for name, spec in space.items():
+            if isinstance(spec, tuple):
+                point[name] = _coerce(name, rng.uniform(spec[0], spec[1]))
+            else:
+                point[name] = rng.choice(spec)
+        plan.append(point)
+    return plan
+
+
+def latin_hypercube_plan(space: Dict[str, Any], samples: int, seed: int) -> List[Dict]:
+    """Latin hypercube: each range is cut into `samples` strata and every stratum is used once
+
+    Value lists are spread the same way, so every listed value is used about
+    equally often. Covers the space far better than random draws of the same size.
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for name, spec in space.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        if isinstance(spec, tuple):
+            low, high = spec
+            columns[name] = [_coerce(name, low + (high - low) * (s + rng.random()) / samples) for s in strata]
+        else:
+            columns[name] = [spec[s * len(spec) // samples] for s in strata]
+    return [{name: columns[name][i] for name in space} for i in range(samples)]
+
+
+def build_plan(plan_type: str, space: Dict[str, Any], samples: int = 10, seed: int = 0,
+               grid_steps: int = 3) -> List[Dict]:
+    if plan_type == 'grid':
+        return grid_plan(space, grid_steps)
+    if plan_type == 'random':
+        return random_plan(space, samples, seed)
+    if plan_type == 'lhs':
+        return latin_hypercube_plan(space, samples, seed)
+    raise ValueError(f"Unknown plan type: {plan_type}")
+
+
+def make_run_key(point: Dict, repeat: int) -> str:
+    encoded = json.dumps({'point': point, 'repeat': repeat}, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
 class ParameterSweep:
+    """Runs one prompt over many sampling settings and collects the results in one table.
+
+    A sweep lives in laboratory/sweeps/<name>/: sweep.json holds the prompts,
+    the parameter space and the plan, results.csv gets one row per run (the
+    response text included) and is flushed after every row. The table doubles
+    as the checkpoint - resuming a sweep skips every run with a successful row,
+    so an interrupted overnight sweep continues where it stopped.
+    Runs go through ModelTester.stream_ollama_request, max_workers at a time.
+    """
+
     def __init__(self, model_tester: ModelTester):
         self.model_tester = model_tester
-    
+        self.sweeps_folder = os.path.join(model_tester.laboratory_base, 'sweeps')
+        self.workshop = None  # Set by the menu so the workshop's current prompts can be reused
+
+    # ---- sweep files -------------------------------------------------------
+
+    def _sweep_paths(self, sweep_folder: str) -> Tuple[str, str]:
+        return os.path.join(sweep_folder, 'sweep.json'), os.path.join(sweep_folder, 'results.csv')
+
+    def create_sweep(self, name: str, system_prompt: str, user_prompt: str, space: Dict[str, Any],
+                     plan_type: str, samples: int = 10, grid_steps: int = 3, repeats: int = 1,
+                     max_workers: int = 2, seed: Optional[int] = None) -> str:
+        """Write sweep.json for a new sweep; returns its folder"""
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_name = "".join(c if c.isalnum() or c in '-_' else '_' for c in name.strip()) or 'sweep'
+        sweep_folder = os.path.join(self.sweeps_folder, f"{safe_name}_{timestamp}")
+        os.makedirs(sweep_folder, exist_ok=True)
+
+        spec = {
+            'name': name,
+            'created': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'system_prompt': system_prompt,
+            'user_prompt': user_prompt,
+            # Ranges are stored as lists of two; value lists as {"values": [...]}
+            'space': {k: list(v) if isinstance(v, tuple) else {'values': list(v)} for k, v in space.items()},
+            'plan_type': plan_type,
+            'samples': samples,
+            'grid_steps': grid_steps,
+            'repeats': repeats,
+            'max_workers': max_workers,
+            'seed': seed if seed is not None else random.randrange(1_000_000),
+            'base_config': dict(self.model_tester.test_config),
+        }
+        sweep_file, _ = self._sweep_paths(sweep_folder)
+        temp_path = f"{sweep_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(spec, f, indent=2)
+        os.replace(temp_path, sweep_file)
+        return sweep_folder
+
+    def load_sweep(self, sweep_folder: str) -> Dict:
+        sweep_file, _ = self._sweep_paths(sweep_folder)
+        with open(sweep_file, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        spec['space'] = {k: v['values'] if isinstance(v, dict) else tuple(v) for k, v in spec['space'].items()}
+        return spec
+
+    def plan_runs(self, spec: Dict) -> List[Tuple[int, int, Dict]]:
+        """[(run_index, repeat, point)] - the same list every time for the same sweep.json"""
+        plan = build_plan(spec['plan_type'], spec['space'], spec['samples'], spec['seed'], spec['grid_steps'])
+        return [(index, repeat, point) for index, point in enumerate(plan, 1)
+                for repeat in range(1, spec.get('repeats', 1) + 1)]
+
+    def load_results(self, sweep_folder: str) -> List[Dict]:
+        _, results_file = self._sweep_paths(sweep_folder)
+        if not os.path.exists(results_file):
+            return []
+        with open(results_file, 'r', encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f))
+
+    def list_sweeps(self) -> List[str]:
+        if not os.path.isdir(self.sweeps_folder):
+            return []
+        folders = [os.path.join(self.sweeps_folder, name) for name in sorted(os.listdir(self.sweeps_folder))]
+        return [folder for folder in folders if os.path.exists(self._sweep_paths(folder)[0])]
+
+    # ---- running -----------------------------------------------------------
+
+    def _run_config(self, spec: Dict, point: Dict) -> Dict:
+        config = dict(spec['base_config'])
+        for name, value in point.items():
+            config['max_tokens' if name == 'num_predict' else name] = value
+        return config
+
+    def _result_row(self, run_key: str, run_index: int, repeat: int, config: Dict, result: Dict) -> Dict:
+        generation_time = result.get('generation_time', 0) or 0
+        return {
+            'run_key': run_key,
+            'run_index': run_index,
+            'repeat': repeat,
+            'model': config.get('model'),
+            'temperature': config.get('temperature'),
+            'top_p': config.get('top_p'),
+            'top_k': config.get('top_k'),
+            'repeat_penalty': config.get('repeat_penalty'),
+            'num_predict': config.get('max_tokens'),
+            'success': result.get('success', False),
+            'error': result.get('error') or '',
+            'generation_time': round(generation_time, 2),
+            'word_count': result.get('word_count', 0),
+            'token_count': result.get('token_count', 0),
+            'prompt_token_count': result.get('prompt_token_count') or '',
+            'tokens_per_second': round(result['tokens_per_second'], 2) if result.get('tokens_per_second') else '',
+            'words_per_minute': round(result.get('word_count', 0) / generation_time * 60, 1) if generation_time else '',
+            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'response': result.get('response', ''),
+        }
+
+    def run_sweep(self, sweep_folder: str) -> Dict[str, int]:
+        """Run every run of the sweep that has no successful row yet; returns counts"""
+        spec = self.load_sweep(sweep_folder)
+        _, results_file = self._sweep_paths(sweep_folder)
+
+        done = {row['run_key'] for row in self.load_results(sweep_folder) if row.get('success') == 'True'}
+        runs = self.plan_runs(spec)
+        pending = []
+        for run_index, repeat, point in runs:
+            run_key = make_run_key(point, repeat)
+            if run_key not in done:
+                pending.append((run_key, run_index, repeat, self._run_config(spec, point)))
+
+        counts = {'total': len(runs), 'skipped': len(runs) - len(pending), 'succeeded': 0, 'failed': 0}
+        if counts['skipped']:
+            print(f"↩️ Resuming: {counts['skipped']}/{len(runs)} runs already done")
+        if not pending:
+            print("✅ Nothing left to run")
+            return counts
+
+        max_workers = max(1, int(spec.get('max_workers', 1)))
+        print(f"🔬 Running {len(pending)} runs, {max_workers} at a time -> {results_file}")
+        print("   Press Ctrl+C to stop - finished runs are kept and the sweep can be resumed")
+
+        write_header = not os.path.exists(results_file) or os.path.getsize(results_file) == 0
+        start = time.time()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            with open(results_file, 'a', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+                if write_header:
+                    writer.writeheader()
+
+                futures = {
+                    executor.submit(self.model_tester.stream_ollama_request,
+                                    spec['system_prompt'], spec['user_prompt'], config): (run_key, run_index, repeat, config)
+                    for run_key, run_index, repeat, config in pending
+                }
+                # Rows are written from this thread only, one at a time
+                for finished, future in enumerate(as_completed(futures), 1):
+                    run_key, run_index, repeat, config = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'success': False, 'error': str(e)}
+
+                    writer.writerow(self._result_row(run_key, run_index, repeat, config, result))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                    counts['succeeded' if result.get('success') else 'failed'] += 1
+                    elapsed = time.time() - start
+                    eta = elapsed / finished * (len(pending) - finished)
+                    status = f"✅ {result.get('word_count', 0)} words" if result.get('success') else f"❌ {result.get('error', 'failed')}"
+                    print(f"   [{finished}/{len(pending)}] run {run_index}.{repeat} {config['model']} "
+                          f"t={config['temperature']} p={config['top_p']} k={config['top_k']} "
+                          f"rp={config['repeat_penalty']} n={config['max_tokens']}: {status} | ETA {eta / 60:.1f} min")
+        except KeyboardInterrupt:
+            print("\n⏹️ Stopping sweep - waiting for running requests to end...")
+            self.model_tester.test_cancelled = True
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.model_tester.test_cancelled = False
+            print(f"💾 Progress saved. Resume the sweep to run the remaining "
+                  f"{len(pending) - counts['succeeded'] - counts['failed']} runs.")
+            return counts
+        finally:
+            executor.shutdown(wait=True)
+
+        print(f"\n✅ Sweep finished in {(time.time() - start) / 60:.1f} min: "
+              f"{counts['succeeded']} succeeded, {counts['failed']} failed")
+        return counts
+
+    def show_summary(self, sweep_folder: str, top: int = 10):
+        """Latest row per run, sorted by tokens per second"""
+        spec = self.load_sweep(sweep_folder)
+        latest = {}
+        for row in self.load_results(sweep_folder):
+            latest[row['run_key']] = row
+        rows = list(latest.values())
+        total_runs = len(self.plan_runs(spec))
+        succeeded = [row for row in rows if row['success'] == 'True']
+
+        print(f"\n📊 {spec['name']} ({spec['plan_type']}, created {spec['created']})")
+        print(f"Runs: {len(succeeded)}/{total_runs} succeeded, {len(rows) - len(succeeded)} failed")
+        print(f"Table: {self._sweep_paths(sweep_folder)[1]}")
+        if not succeeded:
+            return
+
+        def speed(row):
+            try:
+                return float(row['tokens_per_second'])
+            except (TypeError, ValueError):
+                return 0.0
+
+        print(f"\n{'Run':>6} {'Model':<24} {'Temp':>5} {'TopP':>5} {'TopK':>5} {'RepP':>5} "
+              f"{'NumPr':>6} {'Words':>6} {'Tok/s':>7} {'Time':>7}")
+        for row in sorted(succeeded, key=speed, reverse=True)[:top]:
+            print(f"{row['run_index'] + '.' + row['repeat']:>6} {row['model'][:24]:<24} {row['temperature']:>5} "
+                  f"{row['top_p']:>5} {row['top_k']:>5} {row['repeat_penalty']:>5} {row['num_predict']:>6} "
+                  f"{row['word_count']:>6} {speed(row):>7.1f} {float(row['generation_time']):>6.1f}s")
+
+    # ---- menu --------------------------------------------------------------
+
     def run_sweep_menu(self):
-        """Simple parameter sweep menu"""
-        print("\n🔬 Parameter Sweep - Basic version")
-        print("More features coming soon!")
-        input("Press Enter to continue...")
+        """Parameter sweep menu"""
+        while True:
+            sweeps = self.list_sweeps()
+            print("\n" + "="*60)
+            print("🔬 PARAMETER SWEEP")
+            print("="*60)
+            print(f"Saved sweeps: {len(sweeps)} (in {self.sweeps_folder})")
+            print("\n1. New sweep")
+            print("2. Resume a sweep")
+            print("3. View sweep results")
+            print("4. Back")
+
+            choice = input("\nSelect option (1-4): ").strip()
+            if choice == "1":
+                self._new_sweep_menu()
+            elif choice == "2":
+                folder = self._choose_sweep()
+                if folder:
+                    self.run_sweep(folder)
+                    self.show_summary(folder)
+                    input("\nPress Enter to continue...")
+            elif choice == "3":
+                folder = self._choose_sweep()
+                if folder:
+                    self.show_summary(folder)
+                    input("\nPress Enter to continue...")
+            elif choice == "4":
+                break
+            else:
+                print("Invalid option")
+
+    def _choose_sweep(self) -> Optional[str]:
+        sweeps = self.list_sweeps()
+        if not sweeps:
+            print("No saved sweeps yet")
+            input("Press Enter to continue...")
+            return None
+
+        for i, folder in enumerate(sweeps, 1):
+            done = sum(1 for row in self.load_results(folder) if row.get('success') == 'True')
+            try:
+                total = len(self.plan_runs(self.load_sweep(folder)))
+            except (OSError, ValueError, KeyError):
+                total = '?'
+            print(f"{i}. {os.path.basename(folder)} ({done}/{total} runs)")
+
+        choice = input(f"\nSelect sweep (1-{len(sweeps)}, Enter to cancel): ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(sweeps):
+            return sweeps[int(choice) - 1]
+        return None
+
+    def _new_sweep_menu(self):
+        if not self.model_tester.test_config.get('model'):
+            print("❌ Select a Single Scene & Story LLM first (Settings)")
+            input("Press Enter to continue...")
+            return
+
+        prompts = self._choose_prompts()
+        if not prompts:
+            return
+        system_prompt, user_prompt = prompts
+
+        space = {}
+        models = self._choose_models()
+        if models != [self.model_tester.test_config.get('model')]:
+            space['model'] = models
+
+        print("\nFor each parameter enter a list (0.5,0.7,0.9), a range (0.5-1.2) or Enter to keep it fixed")
+        for name in SWEEP_PARAMETERS:
+            current = self.model_tester.test_config.get('max_tokens' if name == 'num_predict' else name)
+            spec = self._ask_parameter(name, current)
+            if spec is not None:
+                space[name] = spec
+        if not space:
+            print("❌ Nothing to sweep - vary at least one parameter or model")
+            input("Press Enter to continue...")
+            return
+
+        has_ranges = any(isinstance(spec, tuple) for spec in space.values())
+        print("\nPlan: 1. Grid (every combination)  2. Random  3. Latin hypercube")
+        plan_type = {"1": 'grid', "2": 'random', "3": 'lhs'}.get(input("Select plan (1-3, default 3): ").strip(), 'lhs')
+        samples, grid_steps = 10, 3
+        if plan_type == 'grid':
+            if has_ranges:
+                grid_steps = self._ask_int("Values per range", 3, 2, 20)
+        else:
+            samples = self._ask_int("Number of samples", 10, 1, 10000)
+        repeats = self._ask_int("Repeats per setting", 1, 1, 100)
+        max_workers = self._ask_int("Parallel requests (match OLLAMA_NUM_PARALLEL)", 2, 1, 16)
+        name = input("Sweep name (default: sweep): ").strip() or 'sweep'
+
+        folder = self.create_sweep(name, system_prompt, user_prompt, space, plan_type,
+                                   samples, grid_steps, repeats, max_workers)
+        total = len(self.plan_runs(self.load_sweep(folder)))
+        print(f"\n📋 {total} runs planned ({plan_type}, {repeats} repeat(s) each)")
+        if input("Start now? (Y/n): ").strip().lower() == 'n':
+            print(f"Saved - resume it later from the sweep menu ({folder})")
+            input("Press Enter to continue...")
+            return
+
+        self.run_sweep(folder)
+        self.show_summary(folder)
+        input("\nPress Enter to continue...")
+
+    def _choose_prompts(self) -> Optional[Tuple[str, str]]:
+        settings = getattr(self.workshop, 'settings', None) if self.workshop else None
+        if settings and settings.get('system_prompt') and settings.get('user_prompt'):
+            if input("Use the Scene Workshop's current prompts? (Y/n): ").strip().lower() != 'n':
+                return settings.get('system_prompt'), settings.get('user_prompt')
+
+        system_prompt = self._choose_template('system_prompts', "System prompt")
+        if system_prompt is None:
+            return None
+        user_prompt = self._choose_template('user_prompts', "User prompt")
+        if user_prompt is None:
+            return None
+        return system_prompt, user_prompt
+
+    def _choose_template(self, kind: str, label: str) -> Optional[str]:
+        folder = os.path.join(self.model_tester.laboratory_templates, kind)
+        files = sorted(f for f in os.listdir(folder) if f.endswith('.txt')) if os.path.isdir(folder) else []
+
+        print(f"\n{label}:")
+        for i, filename in enumerate(files, 1):
+            print(f"{i}. {filename}")
+        print(f"{len(files) + 1}. Enter text")
+
+        choice = input(f"Select (1-{len(files) + 1}, Enter to cancel): ").strip()
+        if not choice.isdigit() or not 1 <= int(choice) <= len(files) + 1:
+            return None
+        if int(choice) <= len(files):
+            with open(os.path.join(folder, files[int(choice) - 1]), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        text = input(f"{label}: ").strip()
+        return text or None
+
+    def _choose_models(self) -> List[str]:
+        try:
+            models = self.model_tester.get_available_models()
+        except Exception as e:
+            print(f"⚠️ Could not list models: {e}")
+            models = []
+        current = self.model_tester.test_config.get('model')
+        if not models:
+            return [current]
+
+        print(f"\nModels (current: {current}):")
+        for i, model in enumerate(models, 1):
+            print(f"{i}. {model}")
+        choice = input("Models to compare (e.g. 1,3 - Enter for current): ").strip()
+        chosen = [models[int(part) - 1] for part in choice.replace(' ', '').split(',')
+                  if part.isdigit() and 1 <= int(part) <= len(models)]
+        return list(dict.fromkeys(chosen)) or [current]
+
+    def _ask_parameter(self, name: str, current):
+        """A value list, a (low, high) range or None to keep the parameter fixed"""
+        low, high, kind = SWEEP_PARAMETERS[name]
+        while True:
+            text = input(f"{name} [{current}] ({low}-{high}): ").strip()
+            if not text:
+                return None
+            try:
+                if ',' in text:
+                    return list(dict.fromkeys(_coerce(name, part) for part in text.split(',') if part.strip()))
+                if '-' in text[1:]:
+                    split_at = text.index('-', 1)
+                    first, last = sorted((kind(text[:split_at]), kind(text[split_at + 1:])))
+                    return (_coerce(name, first), _coerce(name, last))
+                return [_coerce(name, text)]
+            except ValueError:
+                print(f"Invalid value for {name}")
+
+    def _ask_int(self, label: str, default: int, minimum: int, maximum: int) -> int:
+        text = input(f"{label} ({minimum}-{maximum}, default {default}): ").strip()
+        try:
+            return min(max(int(text), minimum), maximum)
+        except ValueError:
+            return default
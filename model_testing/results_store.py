@@ -0,0 +1,193 @@
+import os
+import glob
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+# Columns with their SQLite types; everything else from test_info goes into 'extra' as JSON
+RESULT_COLUMNS = {
+    'timestamp': 'TEXT',
+    'model': 'TEXT',
+    'test_type': 'TEXT',
+    'template_name': 'TEXT',
+    'success': 'INTEGER',
+    'error': 'TEXT',
+    'generation_time': 'REAL',
+    'word_count': 'INTEGER',
+    'token_count': 'INTEGER',
+    'estimated_tokens': 'INTEGER',
+    'prompt_token_count': 'INTEGER',
+    'tokens_per_second': 'REAL',
+    'words_per_minute': 'REAL',
+    'tokens_per_minute': 'REAL',
+    'timeout_used': 'TEXT',
+    'timeout_exceeded': 'INTEGER',
+    'temperature': 'REAL',
+    'top_p': 'REAL',
+    'top_k': 'INTEGER',
+    'repeat_penalty': 'REAL',
+    'max_tokens': 'INTEGER',
+    'story_path': 'TEXT',
+    'metadata_file': 'TEXT',
+    'system_prompt': 'TEXT',
+    'user_prompt': 'TEXT',
+    'extra': 'TEXT',
+}
+PARAMETER_COLUMNS = ('temperature', 'top_p', 'top_k', 'repeat_penalty', 'max_tokens')
+# Fields of the old _meta.json files / test_info that already have a column
+KNOWN_FIELDS = set(RESULT_COLUMNS) | {'config_used', 'parameters_used', 'story_file', 'id'}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {', '.join(f'{name} {kind}' for name, kind in RESULT_COLUMNS.items())}
+);
+CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results (timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_model ON results (model, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_test_type ON results (test_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_parameters ON results (temperature, top_p, top_k, repeat_penalty);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_results_metadata_file ON results (metadata_file);
+CREATE TABLE IF NOT EXISTS store_info (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class ResultsStore:
+    """SQLite index of every laboratory generation.
+
+    One row per saved result with its metadata, metrics and sampling
+    parameters, indexed by model, test type, timestamp and parameters. The
+    generated text stays in laboratory/scenes and is referenced by story_path.
+    Replaces the per-run _meta.json files; import_metadata_folder() loads the
+    existing ones once.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed"""
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def build_row(metadata: Dict) -> Dict:
+        """Column values from a metadata dict (save_test_result or an old _meta.json)"""
+        parameters = dict(metadata.get('config_used') or {})
+        parameters.update(metadata.get('parameters_used') or {})
+
+        row = {name: metadata.get(name) for name in RESULT_COLUMNS if name != 'extra'}
+        for name in PARAMETER_COLUMNS:
+            if row[name] is None:
+                row[name] = parameters.get(name)
+        row['success'] = 1 if row['success'] else 0
+        row['timeout_exceeded'] = 1 if row['timeout_exceeded'] else 0
+
+        # Workshop fields (styles, improvement info, ...) and the full configs are kept as JSON
+        extra = {k: v for k, v in metadata.items() if k not in KNOWN_FIELDS}
+        for name in ('config_used', 'parameters_used'):
+            if metadata.get(name):
+                extra[name] = metadata[name]
+        row['extra'] = json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+        return row
+
+    def add_result(self, metadata: Dict) -> int:
+        """Insert one result; returns its id"""
+        row = self.build_row(metadata)
+        columns = ', '.join(row)
+        placeholders = ', '.join('?' for _ in row)
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(f"INSERT INTO results ({columns}) VALUES ({placeholders})", list(row.values()))
+            return cursor.lastrowid
+
+    def import_metadata_folder(self, metadata_folder: str, scenes_folder: str) -> int:
+        """Load old *_meta.json files once (files already imported are skipped); returns the number added"""
+        rows = []
+        for path in sorted(glob.glob(os.path.join(metadata_folder, '*_meta.json'))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if not isinstance(metadata, dict):
+                continue
+            metadata['metadata_file'] = os.path.basename(path)
+            if metadata.get('story_file') and not metadata.get('story_path'):
+                metadata['story_path'] = os.path.join(scenes_folder, metadata['story_file'])
+            rows.append(self.build_row(metadata))
+
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        with self._lock, self._connect() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                f"INSERT OR IGNORE INTO results ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [[row[name] for name in columns] for row in rows])
+            return connection.total_changes - before
+
+    def import_once(self, metadata_folder: str, scenes_folder: str):
+        """Import the old metadata folder the first time this store is opened"""
+        with self._connect() as connection:
+            done = connection.execute("SELECT value FROM store_info WHERE key = 'metadata_imported'").fetchone()
+        if done:
+            return
+
+        added = self.import_metadata_folder(metadata_folder, scenes_folder)
+        if added:
+            print(f"📥 Imported {added} earlier results from {metadata_folder} into {self.db_path}")
+        with self._lock, self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO store_info (key, value) VALUES ('metadata_imported', '1')")
+
+    def fetch(self, limit: Optional[int] = None, test_type_prefix: Optional[str] = None,
+              model: Optional[str] = None, since: Optional[str] = None, successful_only: bool = False) -> List[Dict]:
+        """Results as dicts, newest first; 'extra' is decoded"""
+        return list(self.iter_results(limit, test_type_prefix, model, since, successful_only))
+
+    def iter_results(self, limit: Optional[int] = None, test_type_prefix: Optional[str] = None,
+                     model: Optional[str] = None, since: Optional[str] = None,
+                     successful_only: bool = False) -> Iterator[Dict]:
+        """Same as fetch() but yields one row at a time"""
+        conditions, values = [], []
+        if test_type_prefix:
+            conditions.append("test_type LIKE ? ESCAPE '\\'")
+            values.append(test_type_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if model:
+            conditions.append("model = ?")
+            values.append(model)
+        if since:
+            conditions.append("timestamp >= ?")
+            values.append(since)
+        if successful_only:
+            conditions.append("success = 1")
+
+        query = "SELECT * FROM results"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            values.append(int(limit))
+
+        with self._connect() as connection:
+            for row in connection.execute(query, values):
+                row = dict(row)
+                row['extra'] = json.loads(row['extra']) if row['extra'] else {}
+                yield row
+
+    def count(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
@@ -1,6 +1,9 @@
 import datetime
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
 
 class BatchGenerator:
     def __init__(self, workshop):
@@ -8,6 +11,8 @@ class BatchGenerator:
         # Use your existing executor
         from .generation.executor import GenerationExecutor
         self.executor = GenerationExecutor(workshop)
+        # Ollama requests in flight across all scenes and improvements of a batch
+        self._request_slots = threading.BoundedSemaphore(self._parallel_workers())
 
     def generate_multiple_scenes(self):
         """Generate multiple scenes with parameter variations - Option 10"""
@@ -54,159 +59,254 @@ class BatchGenerator:
         
         # Start batch timing
         batch_start_time = time.time()
-        results = []
+        
+        # Variations share nothing, so several can run at once on a server with free slots.
+        # Scenes and their improvements share the same parallel_workers request slots.
+        parallel_workers = self._parallel_workers()
+        self._request_slots = threading.BoundedSemaphore(parallel_workers)
+        workers = min(parallel_workers, scene_count)
         
         print("\n" + "="*80)
-        print("BATCH GENERATION PROGRESS")
+        print("BATCH GENERATION PROGRESS" + (f" ({workers} scenes at a time)" if workers > 1 else ""))
         print("="*80)
         
-        for scene_idx, params in enumerate(parameter_sets, 1):
-            scene_start_time = time.time()
-            scene_start_str = datetime.datetime.now().strftime("%H:%M:%S")
-            
-            print(f"\nStarted: {scene_start_str} - Scene {scene_idx}/{scene_count}")
-            
-            # Apply parameters to model tester
-            self._apply_parameters_to_model(params)
-            
-            # Generate original story
+        scene_jobs = [
+            (scene_idx, params, self._build_variation_config(params))
+            for scene_idx, params in enumerate(parameter_sets, 1)
+        ]
+        
+        def run_scene(job, emit):
+            scene_idx, params, config = job
+            return self._generate_scene(scene_idx, scene_count, params, config, system_prompt, enhanced_user_prompt,
+                                        second_prompts, second_prompt_names, improvements_per_scene, emit)
+        
+        if workers == 1:
+            results = []
+            for completed, job in enumerate(scene_jobs, 1):
+                results.append(run_scene(job, self._print_now))
+                self._show_eta(completed, scene_count, batch_start_time)
+        else:
+            results = self._run_scenes_parallel(scene_jobs, run_scene, workers, scene_count, batch_start_time)
+        
+        # Save results and show summary
+        self._save_batch_results(results, system_prompt, enhanced_user_prompt, parameter_sets)
+        self._show_final_summary(results, batch_start_time)
+        
+        input("\nPress Enter to continue...")
+
+    def _parallel_workers(self):
+        """Ollama requests allowed at once (the parallel_workers setting)"""
+        return max(1, int(self.workshop.settings.get('parallel_workers', 1) or 1) if self.workshop.settings else 1)
+    
+    @staticmethod
+    def _print_now(text, end="\n"):
+        print(text, end=end, flush=True)
+    
+    def _build_variation_config(self, params):
+        """Read-only copy of the model config with this variation's sampling parameters"""
+        return MappingProxyType({
+            **self.workshop.model_tester.test_config,
+            'temperature': params['temperature'],
+            'top_p': params['top_p'],
+            'top_k': params['top_k']
+        })
+    
+    def _run_scenes_parallel(self, scene_jobs, run_scene, workers, scene_count, batch_start_time):
+        """Run scenes on a worker pool; each scene's output is printed as one block, in scene order"""
+        outputs = {}
+        results = {}
+        next_to_print = 1
+        
+        def run_buffered(job):
+            lines = []
+            result = run_scene(job, lambda text, end="\n": lines.append(text + end))
+            return result, "".join(lines)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_buffered, job): job for job in scene_jobs}
+            for future in as_completed(futures):
+                scene_idx, params, _ = futures[future]
+                try:
+                    results[scene_idx], outputs[scene_idx] = future.result()
+                except Exception as e:
+                    results[scene_idx] = {'success': False, 'error': str(e), 'scene_parameters': params, 'scene_number': scene_idx}
+                    outputs[scene_idx] = f"\nScene {scene_idx}/{scene_count} FAILED - {e}\n"
+                
+                # Print finished scenes in order; later ones wait for the earlier ones
+                while next_to_print in outputs:
+                    print(outputs.pop(next_to_print), end="", flush=True)
+                    self._show_eta(next_to_print, scene_count, batch_start_time)
+                    next_to_print += 1
+        
+        return [results[scene_idx] for scene_idx in sorted(results)]
+    
+    def _generate_scene(self, scene_idx, scene_count, params, config, system_prompt, enhanced_user_prompt,
+                        second_prompts, second_prompt_names, improvements_per_scene, emit):
+        """Original story plus improvements for one parameter variation; returns the scene result"""
+        scene_start_time = time.time()
+        scene_start_str = datetime.datetime.now().strftime("%H:%M:%S")
+        
+        emit(f"\nStarted: {scene_start_str} - Scene {scene_idx}/{scene_count}")
+        
+        # Generate original story (timed from when a request slot is free)
+        with self._request_slots:
             original_start_time = time.time()
             original_start_str = datetime.datetime.now().strftime("%H:%M:%S")
             
-            print(f"   -> Original Story     ", end="", flush=True)
+            emit(f"   -> Original Story     ", end="")
             
-            result = self.executor.execute_generation(system_prompt, enhanced_user_prompt)
+            result = self.executor.execute_generation(system_prompt, enhanced_user_prompt, config=config)
             
             original_end_time = time.time()
             original_end_str = datetime.datetime.now().strftime("%H:%M:%S")
-            
-            if result.get('success'):
-                original_duration = original_end_time - original_start_time
-                original_words = result.get('word_count', 0)
-                original_tokens = result.get('token_count', 0)
-                original_tok_per_sec = original_tokens / max(original_duration, 1)
-                
-                duration_str = self._format_duration(original_duration)
-                
-                print(f"({original_start_str} → {original_end_str}) {duration_str} → {original_words} words, {original_tokens} tokens ({original_tok_per_sec:.1f} tok/s)")
-                
-                # Store original result
-                scene_result = {
-                    'success': True,
-                    'original_response': result['response'],
-                    'original_word_count': original_words,
-                    'original_token_count': original_tokens,
-                    'original_generation_time': original_duration,
-                    'scene_parameters': params,
-                    'scene_number': scene_idx,
-                    'improvements': []
-                }
-                
-                # Apply improvements - each uses the ORIGINAL story as input
-                if improvements_per_scene > 0:
-                    improvement_results = self._apply_improvements_from_original(
-                        result['response'],  # Original story
-                        system_prompt,
-                        second_prompts,
-                        second_prompt_names,
-                        improvements_per_scene
-                    )
-                    scene_result['improvements'] = improvement_results
-                
-                # Calculate scene totals
-                scene_end_time = time.time()
-                scene_total_duration = scene_end_time - scene_start_time
-                
-                # Get final stats (last successful improvement or original)
-                final_words, final_tokens = self._calculate_final_stats(scene_result)
-                avg_tok_per_sec = final_tokens / max(scene_total_duration, 1)
-                scene_duration_str = self._format_duration(scene_total_duration)
-                
-                print(f"=> Scene Complete     Total: {scene_duration_str} | Final: {final_words} words | {avg_tok_per_sec:.1f} tok/s avg")
-                
-                # Calculate and show ETA
-                self._show_eta(scene_idx, scene_count, batch_start_time)
-                
-                results.append(scene_result)
-                
-            else:
-                print(f"FAILED - {result.get('error', 'Unknown error')}")
-                scene_result = {
-                    'success': False,
-                    'error': result.get('error'),
-                    'scene_parameters': params,
-                    'scene_number': scene_idx
-                }
-                results.append(scene_result)
-            
-            # Restore original parameters
-            self._restore_original_parameters()
         
-        # Save results and show summary
-        self._save_batch_results(results, system_prompt, enhanced_user_prompt, parameter_sets)
-        self._show_final_summary(results, batch_start_time)
+        if not result.get('success'):
+            emit(f"FAILED - {result.get('error', 'Unknown error')}")
+            return {
+                'success': False,
+                'error': result.get('error'),
+                'scene_parameters': params,
+                'scene_number': scene_idx
+            }
+        
+        original_duration = original_end_time - original_start_time
+        original_words = result.get('word_count', 0)
+        original_tokens = result.get('token_count', 0)
+        original_tok_per_sec = self._tokens_per_second(result, original_tokens, original_duration)
+        
+        duration_str = self._format_duration(original_duration)
+        
+        emit(f"({original_start_str} → {original_end_str}) {duration_str} → {original_words} words, {original_tokens} tokens ({original_tok_per_sec:.1f} tok/s)")
+        
+        # Store original result
+        scene_result = {
+            'success': True,
+            'original_response': result['response'],
+            'original_word_count': original_words,
+            'original_token_count': original_tokens,
+            'original_generation_time': original_duration,
+            'scene_parameters': params,
+            'scene_number': scene_idx,
+            'improvements': []
+        }
         
-        input("\nPress Enter to continue...")
+        # Apply improvements - each uses the ORIGINAL story as input
+        if improvements_per_scene > 0:
+            scene_result['improvements'] = self._apply_improvements_from_original(
+                result['response'],  # Original story
+                system_prompt,
+                second_prompts,
+                second_prompt_names,
+                improvements_per_scene,
+                config=config,
+                emit=emit
+            )
+        
+        # Calculate scene totals
+        scene_total_duration = time.time() - scene_start_time
+        
+        # Get final stats (last successful improvement or original)
+        final_words, final_tokens = self._calculate_final_stats(scene_result)
+        avg_tok_per_sec = final_tokens / max(scene_total_duration, 1)
+        scene_duration_str = self._format_duration(scene_total_duration)
+        
+        emit(f"=> Scene Complete     Total: {scene_duration_str} | Final: {final_words} words | {avg_tok_per_sec:.1f} tok/s avg")
+        return scene_result
 
-    def _apply_improvements_from_original(self, original_story, system_prompt, improvement_prompts, improvement_names, total_improvements):
-        """Apply improvements, each using the original story as input"""
-        improvement_results = []
+    def _apply_improvements_from_original(self, original_story, system_prompt, improvement_prompts, improvement_names,
+                                          total_improvements, config=None, emit=None):
+        """Apply improvements, each using the original story as input
         
-        for imp_idx, (improvement_prompt, improvement_name) in enumerate(zip(improvement_prompts, improvement_names), 1):
-            imp_start_time = time.time()
-            imp_start_str = datetime.datetime.now().strftime("%H:%M:%S")
-            
-            # Extract short name for display
-            short_name = self._extract_short_name(improvement_name)
-            print(f"   -> Improvement {imp_idx}/{total_improvements}: [{short_name}]")
-            print(f"      Started: {imp_start_str} - ", end="", flush=True)
-            
-            # Create improvement prompt that includes the original story
-            full_improvement_prompt = f"""Here is a story:
+        They don't depend on each other, so they run side by side on the batch's
+        parallel_workers request slots; each one's output is shown as a block,
+        in improvement order.
+        """
+        emit = emit or self._print_now
+        jobs = list(enumerate(zip(improvement_prompts, improvement_names), 1))
+        
+        def run(job, job_emit):
+            imp_idx, (improvement_prompt, improvement_name) = job
+            return self._run_improvement(imp_idx, improvement_prompt, improvement_name, total_improvements,
+                                         original_story, system_prompt, config, job_emit)
+        
+        if len(jobs) == 1:
+            return [run(jobs[0], emit)]
+        
+        def run_buffered(job):
+            lines = []
+            result = run(job, lambda text, end="\n": lines.append(text + end))
+            return result, "".join(lines)
+        
+        with ThreadPoolExecutor(max_workers=min(len(jobs), self._parallel_workers())) as executor:
+            finished = list(executor.map(run_buffered, jobs))
+        
+        improvement_results = []
+        for result, output in finished:
+            emit(output, end="")
+            improvement_results.append(result)
+        return improvement_results
+    
+    def _run_improvement(self, imp_idx, improvement_prompt, improvement_name, total_improvements,
+                         original_story, system_prompt, config, emit):
+        """One improvement of the original story; returns its result dict"""
+        # Extract short name for display
+        short_name = self._extract_short_name(improvement_name)
+        
+        # Create improvement prompt that includes the original story
+        full_improvement_prompt = f"""Here is a story:
 
 {original_story}
 
 {improvement_prompt}
 
 Please rewrite the story with these improvements:"""
+        
+        # Generate the improved version (timed from when a request slot is free)
+        with self._request_slots:
+            imp_start_time = time.time()
+            imp_start_str = datetime.datetime.now().strftime("%H:%M:%S")
+            emit(f"   -> Improvement {imp_idx}/{total_improvements}: [{short_name}]")
+            emit(f"      Started: {imp_start_str} - ", end="")
             
-            # Generate the improved version
-            improvement_result = self.executor.execute_generation(system_prompt, full_improvement_prompt)
+            improvement_result = self.executor.execute_generation(system_prompt, full_improvement_prompt, config=config)
             
             imp_end_time = time.time()
             imp_end_str = datetime.datetime.now().strftime("%H:%M:%S")
-            imp_duration = imp_end_time - imp_start_time
-            
-            if improvement_result.get('success'):
-                imp_words = improvement_result.get('word_count', 0)
-                imp_tokens = improvement_result.get('token_count', 0)
-                imp_tok_per_sec = imp_tokens / max(imp_duration, 1)
-                
-                imp_duration_str = self._format_duration(imp_duration)
-                print(f"({imp_start_str} → {imp_end_str}) {imp_duration_str} → {imp_words} words, {imp_tokens} tokens ({imp_tok_per_sec:.1f} tok/s)")
-                
-                improvement_results.append({
-                    'success': True,
-                    'response': improvement_result['response'],
-                    'word_count': imp_words,
-                    'token_count': imp_tokens,
-                    'generation_time': imp_duration,
-                    'improvement_prompt': improvement_prompt,
-                    'improvement_name': improvement_name,
-                    'improvement_number': imp_idx
-                })
-            else:
-                print(f"FAILED - {improvement_result.get('error', 'Unknown error')}")
-                improvement_results.append({
-                    'success': False,
-                    'error': improvement_result.get('error'),
-                    'improvement_prompt': improvement_prompt,
-                    'improvement_name': improvement_name,
-                    'improvement_number': imp_idx
-                })
+        imp_duration = imp_end_time - imp_start_time
         
-        return improvement_results
+        if improvement_result.get('success'):
+            imp_words = improvement_result.get('word_count', 0)
+            imp_tokens = improvement_result.get('token_count', 0)
+            imp_tok_per_sec = self._tokens_per_second(improvement_result, imp_tokens, imp_duration)
+            
+            imp_duration_str = self._format_duration(imp_duration)
+            emit(f"({imp_start_str} → {imp_end_str}) {imp_duration_str} → {imp_words} words, {imp_tokens} tokens ({imp_tok_per_sec:.1f} tok/s)")
+            
+            return {
+                'success': True,
+                'response': improvement_result['response'],
+                'word_count': imp_words,
+                'token_count': imp_tokens,
+                'generation_time': imp_duration,
+                'improvement_prompt': improvement_prompt,
+                'improvement_name': improvement_name,
+                'improvement_number': imp_idx
+            }
+        else:
+            emit(f"FAILED - {improvement_result.get('error', 'Unknown error')}")
+            return {
+                'success': False,
+                'error': improvement_result.get('error'),
+                'improvement_prompt': improvement_prompt,
+                'improvement_name': improvement_name,
+                'improvement_number': imp_idx
+            }
 
+    @staticmethod
+    def _tokens_per_second(result, tokens, duration):
+        """Ollama's decode rate (eval_count / eval_duration); wall-clock rate if it wasn't reported"""
+        return result.get('tokens_per_second') or tokens / max(duration, 1)
+    
     def _create_stories_content(self, results):
         """Create stories file content with proper formatting"""
         stories = []
@@ -330,30 +430,6 @@ SCENE DETAILS:
         
         return stats
 
-    def _apply_parameters_to_model(self, params):
-        """Apply parameters to model tester and store originals"""
-        config = self.workshop.model_tester.test_config
-        
-        # Store originals
-        self._original_params = {
-            'temperature': config.get('temperature'),
-            'top_p': config.get('top_p'),
-            'top_k': config.get('top_k')
-        }
-        
-        # Apply new parameters
-        config['temperature'] = params['temperature']
-        config['top_p'] = params['top_p']
-        config['top_k'] = params['top_k']
-
-    def _restore_original_parameters(self):
-        """Restore original parameters"""
-        if hasattr(self, '_original_params'):
-            config = self.workshop.model_tester.test_config
-            for key, value in self._original_params.items():
-                if value is not None:
-                    config[key] = value
-
     def _calculate_final_stats(self, scene_result):
         """Calculate final word and token counts"""
         original_words = scene_result.get('original_word_count', 0)
@@ -18,9 +18,31 @@ class SceneCountConfigurator:
                 if self.workshop.settings:
                     self.workshop.settings.set('scene_count', count)
                 print(f"✅ Scene count set to {count}")
+                if count > 1:
+                    self._configure_parallel_workers(count)
             else:
                 print("Count must be between 1 and 50.")
         except ValueError:
             print("Invalid number.")
         
         input("Press Enter to continue...")
+    
+    def _configure_parallel_workers(self, scene_count):
+        """Ollama requests at the same time (batch scenes and their improvements share them)"""
+        current = self.workshop.settings.get('parallel_workers', 1) if self.workshop.settings else 1
+        print("\nScenes can run at the same time if the Ollama server has parallel slots")
+        print("(OLLAMA_NUM_PARALLEL > 1). Improvements share the same slots. 1 = one request after another.")
+        
+        value = input(f"Requests at once (1-8, Enter keeps {current}): ").strip()
+        if not value:
+            return
+        try:
+            workers = int(value)
+            if 1 <= workers <= 8:
+                if self.workshop.settings:
+                    self.workshop.settings.set('parallel_workers', workers)
+                print(f"✅ Up to {workers} requests at once ({min(workers, scene_count)} scenes)")
+            else:
+                print("Must be between 1 and 8.")
+        except ValueError:
+            print("Invalid number.")
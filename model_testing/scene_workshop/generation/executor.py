@@ -2,6 +2,9 @@ import requests
 import time
 import json
 
+from ollama_client import get_ollama_client
+from token_metrics import TokenMetrics
+
 class GenerationExecutor:
     def __init__(self, workshop):
         self.workshop = workshop
@@ -32,37 +35,43 @@ class GenerationExecutor:
             print(f"❌ Error checking readiness: {e}")
             return False
 
-    def execute_generation(self, system_prompt, user_prompt, callback=None):
-        """Execute the actual generation with instruct model support"""
+    def execute_generation(self, system_prompt, user_prompt, callback=None, config=None):
+        """Execute the actual generation with instruct model support
+        
+        config: model settings for this call only (defaults to the model tester's
+        test_config) - lets batch variations run side by side without touching it
+        """
+        if config is None:
+            config = self.workshop.model_tester.test_config
         try:
             max_tokens = self.workshop.current_settings.get('max_output_tokens', 2048)
-            formatted_prompt = self._format_prompt_for_model(system_prompt, user_prompt)
+            formatted_prompt = self._format_prompt_for_model(system_prompt, user_prompt, config)
             
             # Determine stop tokens based on model type
             stop_tokens = []
-            is_instruct = self.workshop.model_tester.test_config.get('is_instruct_model', False)
+            is_instruct = config.get('is_instruct_model', False)
             if is_instruct:
-                instruct_format = self.workshop.model_tester.test_config.get('instruct_format', 'chatml')
+                instruct_format = config.get('instruct_format', 'chatml')
                 if instruct_format == 'chatml':
                     stop_tokens = ["<|im_end|>"]
                 elif instruct_format == 'alpaca':
                     stop_tokens = ["### Instruction:", "### Response:"]
             
             data = {
-                "model": self.workshop.model_tester.test_config['model'],
+                "model": config['model'],
                 "prompt": formatted_prompt,
                 "options": {
                     "num_predict": max_tokens,
-                    "temperature": self.workshop.model_tester.test_config.get('temperature', 0.8),
-                    "top_p": self.workshop.model_tester.test_config.get('top_p', 0.9),
-                    "top_k": self.workshop.model_tester.test_config.get('top_k', 40),
-                    "repeat_penalty": self.workshop.model_tester.test_config.get('repeat_penalty', 1.1),
+                    "temperature": config.get('temperature', 0.8),
+                    "top_p": config.get('top_p', 0.9),
+                    "top_k": config.get('top_k', 40),
+                    "repeat_penalty": config.get('repeat_penalty', 1.1),
                     "stop": stop_tokens
                 },
                 "stream": callback is not None
             }
             
-            seed = self.workshop.model_tester.test_config.get('seed')
+            seed = config.get('seed')
             if seed is not None:
                 data["options"]["seed"] = seed
             
@@ -72,11 +81,11 @@ class GenerationExecutor:
                     print("Stop tokens:", stop_tokens)
             
             start_time = time.time()
-            timeout = self.workshop.model_tester.test_config.get('timeout_seconds', 0)
+            timeout = config.get('timeout_seconds', 0)
             timeout_val = None if timeout == 0 else timeout
             
-            response = requests.post("http://localhost:11434/api/generate", 
-                                   json=data, 
+            response = get_ollama_client().post("/api/generate", 
+                                   data, 
                                    timeout=timeout_val,
                                    stream=callback is not None)
         
@@ -84,6 +93,7 @@ class GenerationExecutor:
                 full_response = ""
                 final_tokens = 0
                 prompt_tokens = 0
+                metrics = TokenMetrics()
                 
                 for line in response.iter_lines():
                     if line:
@@ -103,6 +113,7 @@ class GenerationExecutor:
                                 # Get final token counts from Ollama
                                 final_tokens = chunk_data.get('eval_count', 0)
                                 prompt_tokens = chunk_data.get('prompt_eval_count', 0)
+                                metrics = TokenMetrics.from_response(chunk_data, stage="workshop")
                                 break
                                 
                         except (json.JSONDecodeError, UnicodeDecodeError):
@@ -117,6 +128,8 @@ class GenerationExecutor:
                     'word_count': len(full_response.split()),
                     'token_count': final_tokens,
                     'prompt_token_count': prompt_tokens,
+                    'tokens_per_second': metrics.decode_tokens_per_second,
+                    'metrics': metrics.to_dict(),
                     'type': 'streaming',
                     'max_tokens_used': max_tokens,
                     'stop_tokens_used': stop_tokens
@@ -126,6 +139,7 @@ class GenerationExecutor:
                 response.raise_for_status()
                 end_time = time.time()
                 api_result = response.json()
+                metrics = TokenMetrics.from_response(api_result, stage="workshop")
                 
                 result = {
                     'success': True,
@@ -134,6 +148,8 @@ class GenerationExecutor:
                     'word_count': len(api_result.get('response', '').split()),
                     'token_count': api_result.get('eval_count', 0),
                     'prompt_token_count': api_result.get('prompt_eval_count', 0),
+                    'tokens_per_second': metrics.decode_tokens_per_second,
+                    'metrics': metrics.to_dict(),
                     'type': 'batch',
                     'max_tokens_used': max_tokens
                 }
@@ -145,9 +161,11 @@ class GenerationExecutor:
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
-    def _format_prompt_for_model(self, system_prompt, user_prompt):
+    def _format_prompt_for_model(self, system_prompt, user_prompt, config=None):
         """Format prompt based on whether it's an instruct model"""
-        is_instruct = self.workshop.model_tester.test_config.get('is_instruct_model', False)
+        if config is None:
+            config = self.workshop.model_tester.test_config
+        is_instruct = config.get('is_instruct_model', False)
         
         # Check if thinking mode is disabled
         disable_thinking = self.workshop.current_settings.get('disable_thinking_mode', False)
@@ -160,7 +178,7 @@ class GenerationExecutor:
         if not is_instruct:
             return system_prompt + "\n\n" + user_prompt
         
-        instruct_format = self.workshop.model_tester.test_config.get('instruct_format', 'chatml')
+        instruct_format = config.get('instruct_format', 'chatml')
         
         if instruct_format == 'chatml':
             return self._build_chatml_prompt(system_prompt, user_prompt)
@@ -88,7 +88,10 @@ class Generator:
             
             # Calculate speeds
             words_per_second = word_count / generation_time if generation_time > 0 else 0
-            tokens_per_second = token_count / generation_time if generation_time > 0 and token_count > 0 else 0
+            # Prefer Ollama's measured decode speed (excludes prompt processing and model load)
+            tokens_per_second = result.get('tokens_per_second') or (
+                token_count / generation_time if generation_time > 0 and token_count > 0 else 0
+            )
             
             # Format timing
             gen_minutes = int(generation_time // 60)
@@ -134,9 +137,9 @@ class Generator:
             
             # Handle both old and new return formats
             if isinstance(save_result, tuple):
-                story_filepath, metadata_filepath = save_result
+                story_filepath, result_id = save_result
                 print(f"💾 Story saved to: laboratory/scenes/{os.path.basename(story_filepath)}")
-                print(f"📊 Metadata saved to: laboratory/metadata/{os.path.basename(metadata_filepath)}")
+                print(f"📊 Metadata saved to: {self.workshop.model_tester.results_store.db_path} (result #{result_id})")
                 main_filepath = story_filepath
             else:
                 # Old single file format
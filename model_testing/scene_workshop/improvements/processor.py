@@ -1,10 +1,37 @@
 import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Modes where each improvement builds on the previous one (must run one after another)
+CHAINED_MODES = ('chained', 'cumulative')
 
 class ImprovementProcessor:
     def __init__(self, workshop):
         self.workshop = workshop
     
+    def _parallel_workers(self):
+        return max(1, int(self.workshop.current_settings.get('parallel_workers', 1) or 1))
+    
+    def _run_concurrently(self, executor, system_prompt, original_response, prompts):
+        """Original mode: every improvement only needs the original story, so they run side by side,
+        at most parallel_workers at a time (the server's parallel slots)
+        
+        Yields (idx, improvement_prompt, start_time, end_time, result, error) as each one finishes.
+        """
+        def run(idx, improvement_prompt):
+            start_time = datetime.datetime.now()
+            improvement_user = f"Here is a story:\n\n{original_response}\n\n{improvement_prompt}"
+            try:
+                result = executor.execute_generation(system_prompt, improvement_user)
+                return idx, improvement_prompt, start_time, datetime.datetime.now(), result, None
+            except Exception as e:
+                return idx, improvement_prompt, start_time, datetime.datetime.now(), None, e
+        
+        with ThreadPoolExecutor(max_workers=min(len(prompts), self._parallel_workers())) as pool:
+            futures = [pool.submit(run, idx, prompt) for idx, prompt in enumerate(prompts, 1)]
+            for future in as_completed(futures):
+                yield future.result()
+    
     def execute_improvements_with_progress(self, original_response, system_prompt, prompts, mode, original_result, enable_streaming=False):
         """Execute improvements with real-time progress display - with optional streaming"""
         from ..generation.executor import GenerationExecutor
@@ -14,6 +41,31 @@ class ImprovementProcessor:
         current_response = original_response
         all_improvements = []
 
+        if mode not in CHAINED_MODES and len(prompts) > 1:
+            # Independent improvements run side by side (no streaming - the outputs would interleave)
+            print(f"\n   -> Running {len(prompts)} improvements, up to {min(len(prompts), self._parallel_workers())} at a time (each from the original story)")
+            finished = {}
+            for idx, improvement_prompt, imp_start_time, imp_end_time, result, error in self._run_concurrently(
+                    executor, system_prompt, original_response, prompts):
+                short_desc = self._get_short_description(improvement_prompt)
+                print(f"   -> Improvement {idx}/{len(prompts)}: [{short_desc}] ", end='')
+                imp_duration = (imp_end_time - imp_start_time).total_seconds()
+                if error:
+                    self._handle_improvement_exception(error, imp_start_time, False)
+                elif result and result.get('success'):
+                    improvements = []
+                    self._handle_successful_improvement(
+                        result, idx, len(prompts), improvement_prompt, short_desc, mode,
+                        original_response, improvements, current_response, imp_start_time,
+                        imp_end_time, imp_duration, False
+                    )
+                    finished[idx] = improvements[0]
+                else:
+                    self._report_failed_improvement(result, imp_duration, False)
+            # Keep prompt order whatever order they finished in
+            all_improvements = [finished[idx] for idx in sorted(finished)]
+            return self._create_final_result(all_improvements, original_response, original_result, mode)
+
         for idx, improvement_prompt in enumerate(prompts, 1):
             # Start improvement
             imp_start_time = datetime.datetime.now()
@@ -33,7 +85,7 @@ class ImprovementProcessor:
 
             try:
                 # Execute single improvement
-                if mode == 'cumulative':
+                if mode in CHAINED_MODES:
                     # Use the current (improved) response as base
                     base_response = current_response
                 else:
@@ -62,12 +114,12 @@ class ImprovementProcessor:
                         imp_end_time, imp_duration, enable_streaming
                     )
 
-                    # Update current response for next iteration ONLY if cumulative mode
-                    if mode == 'cumulative':
+                    # Update current response for next iteration ONLY if chained mode
+                    if mode in CHAINED_MODES:
                         current_response = result['response']
 
                 else:
-                    self._handle_failed_improvement(
+                    self._report_failed_improvement(
                         result, imp_duration, enable_streaming
                     )
 
@@ -88,63 +140,91 @@ class ImprovementProcessor:
         current_response = original_response
         saved_filepaths = [original_filepath]  # Track all saved files
         
-        for idx, improvement_prompt in enumerate(prompts, 1):
-            # Start improvement
-            imp_start_time = datetime.datetime.now()
-            
-            # Create short description for the prompt
-            short_desc = self._get_short_description(improvement_prompt)
-            
-            print(f"\n   -> Improvement {idx}/{len(prompts)}: [{short_desc}]")
-            print(f"      Started: {imp_start_time.strftime('%H:%M:%S')}")
-            print(f"      Streaming output:")
-            print("      " + "-" * 50)
-            
-            try:
-                # Execute single improvement with streaming
-                if mode == 'cumulative':
-                    base_response = current_response
-                else:
-                    base_response = original_response
-                
-                # Create the improvement request
-                improvement_system = system_prompt
-                improvement_user = f"Here is a story:\n\n{base_response}\n\n{improvement_prompt}"
-                
-                # Execute improvement
-                result = executor.execute_generation(improvement_system, improvement_user, StreamingCallbacks.improvement_callback)
-                
-                imp_end_time = datetime.datetime.now()
+        if mode not in CHAINED_MODES and len(prompts) > 1:
+            # Independent improvements run side by side; each is saved the moment it finishes
+            print(f"\n   -> Running {len(prompts)} improvements, up to {min(len(prompts), self._parallel_workers())} at a time (each from the original story)")
+            for idx, improvement_prompt, imp_start_time, imp_end_time, result, error in self._run_concurrently(
+                    executor, system_prompt, original_response, prompts):
+                short_desc = self._get_short_description(improvement_prompt)
+                print(f"\n   -> Improvement {idx}/{len(prompts)}: [{short_desc}]")
                 imp_duration = (imp_end_time - imp_start_time).total_seconds()
-                
-                if result and result.get('success'):
-                    # Handle successful improvement and save immediately
+                if error:
+                    self._handle_exception_immediate_save(
+                        error, idx, improvement_prompt, short_desc, imp_start_time,
+                        file_saver, session_folder, saved_filepaths
+                    )
+                elif result and result.get('success'):
                     improvement_filepath = self._handle_successful_immediate_save(
                         result, idx, len(prompts), improvement_prompt, short_desc,
                         imp_start_time, imp_end_time, imp_duration, file_saver,
                         session_folder, final_system, final_user, params,
-                        original_response, base_response, mode
+                        original_response, original_response, mode
                     )
-                    
                     saved_filepaths.append(improvement_filepath)
                     print(f"      💾 Improvement {idx} saved to: {os.path.basename(improvement_filepath)}")
-                    
-                    # Update current response for next iteration if cumulative mode
-                    if mode == 'cumulative':
-                        current_response = result['response']
-                    
                 else:
-                    # Handle failed improvement
                     self._handle_failed_improvement(
                         result, idx, improvement_prompt, short_desc,
                         imp_duration, file_saver, session_folder, saved_filepaths
                     )
+        else:
+            for idx, improvement_prompt in enumerate(prompts, 1):
+                # Start improvement
+                imp_start_time = datetime.datetime.now()
+            
+                # Create short description for the prompt
+                short_desc = self._get_short_description(improvement_prompt)
+            
+                print(f"\n   -> Improvement {idx}/{len(prompts)}: [{short_desc}]")
+                print(f"      Started: {imp_start_time.strftime('%H:%M:%S')}")
+                print(f"      Streaming output:")
+                print("      " + "-" * 50)
+            
+                try:
+                    # Execute single improvement with streaming
+                    if mode in CHAINED_MODES:
+                        base_response = current_response
+                    else:
+                        base_response = original_response
+                
+                    # Create the improvement request
+                    improvement_system = system_prompt
+                    improvement_user = f"Here is a story:\n\n{base_response}\n\n{improvement_prompt}"
+                
+                    # Execute improvement
+                    result = executor.execute_generation(improvement_system, improvement_user, StreamingCallbacks.improvement_callback)
+                
+                    imp_end_time = datetime.datetime.now()
+                    imp_duration = (imp_end_time - imp_start_time).total_seconds()
+                
+                    if result and result.get('success'):
+                        # Handle successful improvement and save immediately
+                        improvement_filepath = self._handle_successful_immediate_save(
+                            result, idx, len(prompts), improvement_prompt, short_desc,
+                            imp_start_time, imp_end_time, imp_duration, file_saver,
+                            session_folder, final_system, final_user, params,
+                            original_response, base_response, mode
+                        )
                     
-            except Exception as e:
-                self._handle_exception_immediate_save(
-                    e, idx, improvement_prompt, short_desc, imp_start_time,
-                    file_saver, session_folder, saved_filepaths
-                )
+                        saved_filepaths.append(improvement_filepath)
+                        print(f"      💾 Improvement {idx} saved to: {os.path.basename(improvement_filepath)}")
+                    
+                        # Update current response for next iteration if chained mode
+                        if mode in CHAINED_MODES:
+                            current_response = result['response']
+                    
+                    else:
+                        # Handle failed improvement
+                        self._handle_failed_improvement(
+                            result, idx, improvement_prompt, short_desc,
+                            imp_duration, file_saver, session_folder, saved_filepaths
+                        )
+                    
+                except Exception as e:
+                    self._handle_exception_immediate_save(
+                        e, idx, improvement_prompt, short_desc, imp_start_time,
+                        file_saver, session_folder, saved_filepaths
+                    )
 
         # Create summary file with links to all individual files
         summary_filepath = file_saver.save_session_summary(
@@ -188,7 +268,7 @@ class ImprovementProcessor:
         imp_words = result.get('word_count', 0)
         imp_tokens = result.get('token_count', 0)
         imp_time = result.get('generation_time', 0)
-        imp_tok_per_sec = imp_tokens / imp_time if imp_time > 0 and imp_tokens > 0 else 0
+        imp_tok_per_sec = result.get('tokens_per_second') or (imp_tokens / imp_time if imp_time > 0 and imp_tokens > 0 else 0)
         
         # Format timing
         imp_end_formatted = end_time.strftime('%H:%M:%S')
@@ -212,12 +292,12 @@ class ImprovementProcessor:
             'generation_time': imp_time,
             'improvement_prompt': improvement_prompt,
             'short_description': short_desc,
-            'base_used': 'cumulative' if mode == 'cumulative' else 'original',
+            'base_used': 'cumulative' if mode in CHAINED_MODES else 'original',
             'base_story': base_response  # Store what was used as base for this improvement
         }
         all_improvements.append(improvement_data)
     
-    def _handle_failed_improvement(self, result, duration, enable_streaming):
+    def _report_failed_improvement(self, result, duration, enable_streaming):
         """Handle failed improvement"""
         imp_minutes = int(duration // 60)
         imp_seconds = int(duration % 60)
@@ -247,7 +327,7 @@ class ImprovementProcessor:
         """Create final result preserving all versions"""
         if all_improvements:
             # Determine which version to use as the "final" result
-            if mode == 'cumulative':
+            if mode in CHAINED_MODES:
                 # Use the last improvement (which built on all previous ones)
                 final_improvement = all_improvements[-1]
                 final_response = final_improvement['response']
@@ -282,7 +362,7 @@ class ImprovementProcessor:
         imp_words = result.get('word_count', 0)
         imp_tokens = result.get('token_count', 0)
         imp_time = result.get('generation_time', 0)
-        imp_tok_per_sec = imp_tokens / imp_time if imp_time > 0 and imp_tokens > 0 else 0
+        imp_tok_per_sec = result.get('tokens_per_second') or (imp_tokens / imp_time if imp_time > 0 and imp_tokens > 0 else 0)
         
         # Format timing
         imp_end_formatted = end_time.strftime('%H:%M:%S')
@@ -1,7 +1,24 @@
 import os
-import json
 from datetime import datetime
 
+from .word_patterns import WordPatternStats
+
+try:
+    import numpy as np
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    np = pd = None
+    PANDAS_AVAILABLE = False
+
+
+ANALYSIS_LIMIT = 10000  # Most recent workshop results loaded per analysis session
+PERCENTILES = [0.5, 0.9, 0.95]
+# Bands used by "Compare parameter effects": (edges, labels), right edge excluded
+TEMPERATURE_BINS = ([float('-inf'), 0.6, 1.0, float('inf')], ['low', 'med', 'high'])
+TOP_P_BINS = ([float('-inf'), 0.8, 0.95, float('inf')], ['low', 'med', 'high'])
+
+
 class ResultsAnalyzer:
     def __init__(self, workshop):
         self.workshop = workshop
@@ -11,10 +28,15 @@ class ResultsAnalyzer:
         print("\nRESULTS ANALYSIS")
         print("="*40)
         
-        # Get recent test results
-        results = self._get_recent_results()
+        if not PANDAS_AVAILABLE:
+            print("❌ Results analysis needs pandas: pip install pandas")
+            input("Press Enter to continue...")
+            return
         
-        if not results:
+        # Loaded once; every view below works on this frame
+        frame = self._load_results_frame()
+        
+        if frame.empty:
             print("No recent results found")
             print("Generate some scenes first!")
             input("Press Enter to continue...")
@@ -22,7 +44,7 @@ class ResultsAnalyzer:
         
         # Display analysis menu
         while True:
-            print(f"\nFound {len(results)} recent results")
+            print(f"\nFound {len(frame)} recent results")
             print("="*30)
             print("1. View generation statistics")
             print("2. Compare parameter effects")
@@ -34,340 +56,255 @@ class ResultsAnalyzer:
             choice = input("\nSelect option (1-6): ").strip()
             
             if choice == "1":
-                self._show_generation_stats(results)
+                self._show_generation_stats(frame)
             elif choice == "2":
-                self._compare_parameter_effects(results)
+                self._compare_parameter_effects(frame)
             elif choice == "3":
-                self._analyze_word_patterns(results)
+                self._analyze_word_patterns(self._iter_story_texts())
             elif choice == "4":
-                self._show_best_worst_results(results)
+                self._show_best_worst_results(frame)
             elif choice == "5":
-                self._export_results_summary(results)
+                self._export_results_summary(frame)
             elif choice == "6":
                 break
             else:
                 print("Invalid option")
                 input("Press Enter to continue...")
     
-    def _get_recent_results(self):
-        """Get recent workshop results"""
+    def _load_results_frame(self, limit=ANALYSIS_LIMIT):
+        """Workshop results as a DataFrame (one row per result, newest first)"""
         try:
-            results_folder = os.path.join(self.workshop.model_tester.results_folder, "session_results")
-            if not os.path.exists(results_folder):
-                return []
-            
-            results = []
-            
-            # Look through recent session folders
-            for folder_name in sorted(os.listdir(results_folder), reverse=True)[:10]:  # Last 10 sessions
-                if folder_name.startswith("scene_workshop"):
-                    session_path = os.path.join(results_folder, folder_name)
-                    
-                    # Look for result files in this session
-                    for file_name in os.listdir(session_path):
-                        if file_name.endswith('.json'):
-                            file_path = os.path.join(session_path, file_name)
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    result_data = json.load(f)
-                                    
-                                # Add session info
-                                result_data['session_folder'] = folder_name
-                                result_data['file_name'] = file_name
-                                results.append(result_data)
-                                
-                            except Exception:
-                                continue
-            
-            return results[:50]  # Limit to 50 most recent
-            
+            rows = self.workshop.model_tester.results_store.fetch(limit=limit, test_type_prefix='scene_workshop')
         except Exception as e:
             print(f"Error reading results: {e}")
-            return []
+            rows = []
+        
+        frame = pd.DataFrame(rows)
+        if frame.empty:
+            return frame
+        
+        frame['improvement_applied'] = [bool(extra.get('improvement_applied')) for extra in frame['extra']]
+        for column in ('word_count', 'generation_time', 'tokens_per_second', 'temperature', 'top_p', 'top_k'):
+            frame[column] = pd.to_numeric(frame[column], errors='coerce')
+        frame['model'] = frame['model'].fillna('Unknown')
+        frame['generation_type'] = (frame['test_type'].fillna('Unknown')
+                                    .str.replace('scene_workshop_', '', regex=False)
+                                    .str.replace('_', ' ').str.title())
+        
+        valid = (frame['word_count'] > 0) & (frame['generation_time'] > 0)
+        frame['wpm'] = (frame['word_count'] / frame['generation_time'] * 60).where(valid)
+        frame['temperature_bin'] = pd.cut(frame['temperature'], TEMPERATURE_BINS[0], labels=TEMPERATURE_BINS[1], right=False)
+        frame['top_p_bin'] = pd.cut(frame['top_p'], TOP_P_BINS[0], labels=TOP_P_BINS[1], right=False)
+        return frame
+    
+    def _iter_story_texts(self, limit=ANALYSIS_LIMIT):
+        """(model, story text) of recent successful workshop results, read one file at a time"""
+        rows = self.workshop.model_tester.results_store.iter_results(
+            limit=limit, test_type_prefix='scene_workshop', successful_only=True)
+        for row in rows:
+            try:
+                with open(row['story_path'], 'r', encoding='utf-8') as f:
+                    yield row['model'] or 'Unknown', f.read()
+            except (OSError, TypeError):
+                continue
     
-    def _show_generation_stats(self, results):
+    def _percentile_table(self, frame, column, by):
+        """count, mean and p50/p90/p95 of a column per group"""
+        data = frame.dropna(subset=[column])
+        data = data[data[column] > 0]
+        if data.empty:
+            return None
+        grouped = data.groupby(by, observed=True)[column]
+        table = grouped.quantile(PERCENTILES).unstack()
+        table.columns = [f"p{int(q * 100)}" for q in PERCENTILES]
+        table.insert(0, 'mean', grouped.mean())
+        table.insert(0, 'count', grouped.size())
+        return table
+    
+    def _summary_lines(self, frame):
+        """Overall word count, time, WPM and tokens/sec figures"""
+        lines = []
+        for column, title, unit, fmt in (
+            ('word_count', 'WORD COUNT', 'words', '.1f'),
+            ('generation_time', 'GENERATION TIME', 'seconds', '.1f'),
+            ('wpm', 'WORDS PER MINUTE', 'WPM', '.0f'),
+            ('tokens_per_second', 'TOKENS PER SECOND', 'tok/s', '.1f'),
+        ):
+            values = frame[column].dropna()
+            values = values[values > 0].to_numpy()
+            if not len(values):
+                continue
+            p50, p90, p95 = np.percentile(values, [50, 90, 95])
+            lines.append(f"{title} STATISTICS:")
+            lines.append(f"  Average: {values.mean():{fmt}} {unit}")
+            lines.append(f"  Range: {values.min():{fmt}} - {values.max():{fmt}} {unit}")
+            lines.append(f"  Median: {p50:{fmt}} {unit} | p90: {p90:{fmt}} | p95: {p95:{fmt}}")
+            lines.append("")
+        return lines
+    
+    def _show_generation_stats(self, frame):
         """Show generation statistics"""
         print("\nGENERATION STATISTICS")
         print("="*40)
         
-        if not results:
+        if frame.empty:
             print("No results to analyze")
             input("Press Enter to continue...")
             return
         
-        # Calculate stats
-        word_counts = []
-        gen_times = []
-        wpm_rates = []
-        models_used = {}
-        prompt_types = {}
-        improvements = 0
-        
-        for result in results:
-            test_info = result.get('test_info', {})
-            response_info = result.get('response_info', {})
-            
-            # Word counts
-            word_count = response_info.get('word_count', 0)
-            if word_count > 0:
-                word_counts.append(word_count)
-            
-            # Generation times
-            gen_time = response_info.get('generation_time', 0)
-            if gen_time > 0:
-                gen_times.append(gen_time)
-                
-                # WPM calculation
-                if word_count > 0:
-                    wpm = (word_count / gen_time) * 60
-                    wpm_rates.append(wpm)
-            
-            # Models used
-            model = test_info.get('model', 'Unknown')
-            models_used[model] = models_used.get(model, 0) + 1
-            
-            # Prompt types
-            test_type = test_info.get('test_type', 'Unknown')
-            prompt_types[test_type] = prompt_types.get(test_type, 0) + 1
-            
-            # Improvements
-            if test_info.get('improvement_applied'):
-                improvements += 1
-        
-        # Display stats
-        print(f"Total results analyzed: {len(results)}")
-        print(f"Results with improvements: {improvements}")
+        print(f"Total results analyzed: {len(frame)}")
+        print(f"Results with improvements: {int(frame['improvement_applied'].sum())}")
         print()
+        print("\n".join(self._summary_lines(frame)))
         
-        if word_counts:
-            print("WORD COUNT STATISTICS:")
-            print(f"  Average: {sum(word_counts)/len(word_counts):.1f} words")
-            print(f"  Range: {min(word_counts)} - {max(word_counts)} words")
-            print(f"  Median: {sorted(word_counts)[len(word_counts)//2]} words")
-            print()
-        
-        if gen_times:
-            print("GENERATION TIME STATISTICS:")
-            print(f"  Average: {sum(gen_times)/len(gen_times):.1f} seconds")
-            print(f"  Range: {min(gen_times):.1f} - {max(gen_times):.1f} seconds")
-            print()
-        
-        if wpm_rates:
-            print("WORDS PER MINUTE STATISTICS:")
-            print(f"  Average: {sum(wpm_rates)/len(wpm_rates):.0f} WPM")
-            print(f"  Range: {min(wpm_rates):.0f} - {max(wpm_rates):.0f} WPM")
+        for by, title in (('model', 'MODELS USED'), ('generation_type', 'GENERATION TYPES')):
+            print(f"{title}:")
+            for name, count in frame[by].value_counts().items():
+                print(f"  {name}: {count} generations")
             print()
         
-        if models_used:
-            print("MODELS USED:")
-            for model, count in models_used.items():
-                print(f"  {model}: {count} generations")
-            print()
-        
-        if prompt_types:
-            print("GENERATION TYPES:")
-            for ptype, count in prompt_types.items():
-                display_type = ptype.replace('scene_workshop_', '').replace('_', ' ').title()
-                print(f"  {display_type}: {count} generations")
+        for column, title in (('generation_time', 'LATENCY PERCENTILES BY MODEL (seconds)'),
+                              ('tokens_per_second', 'TOKENS/SEC PERCENTILES BY MODEL')):
+            table = self._percentile_table(frame, column, 'model')
+            if table is not None:
+                print(f"{title}:")
+                print(table.to_string(float_format=lambda v: f"{v:.1f}"))
+                print()
         
         input("\nPress Enter to continue...")
     
-    def _compare_parameter_effects(self, results):
+    def _compare_parameter_effects(self, frame):
         """Compare effects of different parameters"""
         print("\nPARAMETER EFFECTS COMPARISON")
         print("="*50)
         
-        # Group results by parameter ranges
-        temp_groups = {'low': [], 'med': [], 'high': []}
-        top_p_groups = {'low': [], 'med': [], 'high': []}
+        data = frame.dropna(subset=['wpm'])
+        if data.empty:
+            print("No results with word counts and timings")
+            input("Press Enter to continue...")
+            return
         
-        for result in results:
-            test_info = result.get('test_info', {})
-            params = test_info.get('parameters_used', {})
-            response_info = result.get('response_info', {})
-            
-            temp = params.get('temperature', 0.8)
-            top_p = params.get('top_p', 0.9)
-            word_count = response_info.get('word_count', 0)
-            gen_time = response_info.get('generation_time', 1)
-            
-            if word_count > 0 and gen_time > 0:
-                wpm = (word_count / gen_time) * 60
-                data_point = {
-                    'word_count': word_count,
-                    'gen_time': gen_time,
-                    'wpm': wpm,
-                    'temp': temp,
-                    'top_p': top_p
-                }
-                
-                # Categorize by temperature
-                if temp < 0.6:
-                    temp_groups['low'].append(data_point)
-                elif temp < 1.0:
-                    temp_groups['med'].append(data_point)
-                else:
-                    temp_groups['high'].append(data_point)
-                
-                # Categorize by top_p
-                if top_p < 0.8:
-                    top_p_groups['low'].append(data_point)
-                elif top_p < 0.95:
-                    top_p_groups['med'].append(data_point)
-                else:
-                    top_p_groups['high'].append(data_point)
-        
-        # Display temperature effects
-        print("TEMPERATURE EFFECTS:")
-        for level, data in temp_groups.items():
-            if data:
-                avg_words = sum(d['word_count'] for d in data) / len(data)
-                avg_wpm = sum(d['wpm'] for d in data) / len(data)
-                temp_range = f"{min(d['temp'] for d in data):.1f}-{max(d['temp'] for d in data):.1f}"
-                print(f"  {level.upper()} ({temp_range}): {len(data)} samples, {avg_words:.0f} words avg, {avg_wpm:.0f} WPM")
-        print()
+        for bin_column, column, title, fmt in (('temperature_bin', 'temperature', 'TEMPERATURE EFFECTS', '.1f'),
+                                               ('top_p_bin', 'top_p', 'TOP-P EFFECTS', '.2f')):
+            print(f"{title}:")
+            groups = data.groupby(bin_column, observed=True).agg(
+                samples=('wpm', 'size'), low=(column, 'min'), high=(column, 'max'),
+                words=('word_count', 'mean'), wpm=('wpm', 'mean'))
+            for level, row in groups.iterrows():
+                print(f"  {str(level).upper()} ({row['low']:{fmt}}-{row['high']:{fmt}}): {int(row['samples'])} samples, "
+                      f"{row['words']:.0f} words avg, {row['wpm']:.0f} WPM")
+            print()
         
-        # Display top_p effects
-        print("TOP-P EFFECTS:")
-        for level, data in top_p_groups.items():
-            if data:
-                avg_words = sum(d['word_count'] for d in data) / len(data)
-                avg_wpm = sum(d['wpm'] for d in data) / len(data)
-                top_p_range = f"{min(d['top_p'] for d in data):.2f}-{max(d['top_p'] for d in data):.2f}"
-                print(f"  {level.upper()} ({top_p_range}): {len(data)} samples, {avg_words:.0f} words avg, {avg_wpm:.0f} WPM")
+        # Same temperature bands split by model and by prompt type
+        for by, title in (('model', 'MODEL'), ('generation_type', 'PROMPT TYPE')):
+            table = data.pivot_table(index=by, columns='temperature_bin', values='wpm',
+                                     aggfunc='mean', observed=True)
+            if table.shape[1] > 1 or table.shape[0] > 1:
+                print(f"AVERAGE WPM BY {title} x TEMPERATURE:")
+                print(table.to_string(float_format=lambda v: f"{v:.0f}", na_rep='-'))
+                print()
         
-        print("\nOBSERVATIONS:")
+        print("OBSERVATIONS:")
         print("• Higher temperature typically increases creativity but may reduce coherence")
         print("• Higher top-p increases vocabulary diversity")
         print("• Lower parameters often generate faster but may be more repetitive")
         
         input("\nPress Enter to continue...")
     
-    def _analyze_word_patterns(self, results):
-        """Analyze word patterns in generated content"""
+    def _analyze_word_patterns(self, stories):
+        """Analyze word patterns in generated content; stories yields (model, text)"""
         print("\nWORD PATTERN ANALYSIS")
         print("="*40)
         
-        all_text = []
-        word_counts = []
+        stats = WordPatternStats()
+        for model, text in stories:
+            stats.add(text, model)
         
-        for result in results:
-            response_info = result.get('response_info', {})
-            response_text = response_info.get('response', '')
-            
-            if response_text:
-                all_text.append(response_text.lower())
-                word_counts.append(len(response_text.split()))
-        
-        if not all_text:
+        if not stats.stories:
             print("No text content found in results")
             input("Press Enter to continue...")
             return
         
-        # Combine all text
-        combined_text = ' '.join(all_text)
-        words = combined_text.split()
-        
-        # Most common words (excluding very common ones)
-        common_words = ['the', 'and', 'a', 'to', 'of', 'in', 'i', 'you', 'it', 'that', 'was', 'is', 'he', 'she', 'his', 'her', 'with', 'as', 'at', 'on', 'for', 'had', 'have', 'but', 'not', 'they', 'this', 'from', 'or', 'by', 'be', 'are', 'an', 'my', 'me', 'we', 'our', 'up', 'out', 'if', 'no', 'so', 'what', 'all', 'were', 'when', 'would', 'there', 'been', 'their', 'said', 'could', 'him', 'her']
-        
-        word_freq = {}
-        for word in words:
-            clean_word = ''.join(c for c in word if c.isalpha())
-            if len(clean_word) > 3 and clean_word not in common_words:
-                word_freq[clean_word] = word_freq.get(clean_word, 0) + 1
-        
-        # Sort by frequency
-        top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
-        
-        print(f"Analyzed {len(results)} generations ({len(words)} total words)")
-        print(f"Average length: {sum(word_counts)/len(word_counts):.1f} words per generation")
+        print(f"Analyzed {stats.stories} generations ({stats.total_words} total words)")
+        print(f"Average length: {stats.total_words / stats.stories:.1f} words per generation")
         print()
         
         print("MOST FREQUENT CONTENT WORDS:")
-        for word, freq in top_words[:10]:
-            percentage = (freq / len(words)) * 100
-            print(f"  {word}: {freq} times ({percentage:.2f}%)")
+        for word, freq in stats.words.most_common(10):
+            print(f"  {word}: {freq} times ({freq / stats.total_words * 100:.2f}%)")
         print()
         
-        # Check for perspective consistency
-        first_person = combined_text.count(' i ') + combined_text.count(' my ') + combined_text.count(' me ')
-        second_person = combined_text.count(' you ') + combined_text.count(' your ')
-        third_person = combined_text.count(' he ') + combined_text.count(' she ') + combined_text.count(' his ') + combined_text.count(' her ')
+        for size, title in ((2, "MOST FREQUENT BIGRAMS"), (3, "MOST FREQUENT TRIGRAMS")):
+            print(f"{title}:")
+            for phrase, freq in stats.top_ngrams(size, 10):
+                print(f"  {phrase}: {freq} times")
+            if stats.ngram_error[size]:
+                print(f"  (rare phrases were pruned - counts may be up to {stats.ngram_error[size]} low)")
+            print()
         
+        print("OVERUSED PHRASES BY MODEL (share of the model's stories):")
+        for model, count in stats.model_stories.most_common():
+            print(f"  {model} ({count} stories, {stats.repetition_rate(model) * 100:.1f}% repeated trigrams within a story):")
+            phrases = stats.overused_phrases(model, 5)
+            for phrase, share in phrases:
+                print(f"    \"{phrase}\" in {share * 100:.0f}%")
+            if not phrases:
+                print("    (no phrase used in more than one story)")
+            elif stats.phrase_error[model]:
+                print(f"    (rare phrases were pruned - shares may be up to {stats.phrase_error[model]} stories low)")
+        print()
+        
+        # Narration only - dialogue is skipped
         print("PERSPECTIVE ANALYSIS:")
-        print(f"  First person indicators: {first_person}")
-        print(f"  Second person indicators: {second_person}")
-        print(f"  Third person indicators: {third_person}")
+        print(f"  First person indicators: {stats.pov_counts['first']}")
+        print(f"  Second person indicators: {stats.pov_counts['second']}")
+        print(f"  Third person indicators: {stats.pov_counts['third']}")
+        for model, povs in stats.model_pov.items():
+            spread = ", ".join(f"{person} {count}" for person, count in povs.most_common())
+            print(f"  {model}: stories by perspective - {spread}")
         
-        if first_person > second_person and first_person > third_person:
-            print("  Primary perspective: First Person")
-        elif second_person > third_person:
-            print("  Primary perspective: Second Person")
-        else:
-            print("  Primary perspective: Third Person")
+        if stats.pov_stories:
+            primary = stats.pov_stories.most_common(1)[0][0]
+            print(f"  Primary perspective: {primary.title()} Person")
         
         input("\nPress Enter to continue...")
     
-    def _show_best_worst_results(self, results):
+    def _show_best_worst_results(self, frame):
         """Show best and worst performing results"""
         print("\nBEST & WORST RESULTS")
         print("="*40)
         
-        # Calculate performance metrics
-        performance_data = []
-        
-        for result in results:
-            response_info = result.get('response_info', {})
-            test_info = result.get('test_info', {})
-            
-            word_count = response_info.get('word_count', 0)
-            gen_time = response_info.get('generation_time', 1)
-            
-            if word_count > 0 and gen_time > 0:
-                wpm = (word_count / gen_time) * 60
-                
-                performance_data.append({
-                    'result': result,
-                    'word_count': word_count,
-                    'gen_time': gen_time,
-                    'wpm': wpm,
-                    'model': test_info.get('model', 'Unknown'),
-                    'params': test_info.get('parameters_used', {}),
-                    'session': result.get('session_folder', 'Unknown')
-                })
-        
-        if not performance_data:
+        data = frame.dropna(subset=['wpm'])
+        if data.empty:
             print("No performance data available")
             input("Press Enter to continue...")
             return
         
-        # Sort by different metrics
-        by_wpm = sorted(performance_data, key=lambda x: x['wpm'], reverse=True)
-        by_word_count = sorted(performance_data, key=lambda x: x['word_count'], reverse=True)
-        by_speed = sorted(performance_data, key=lambda x: x['gen_time'])
+        def describe(row):
+            temperature = row['temperature'] if pd.notna(row['temperature']) else '?'
+            return f"   Model: {row['model']}, T={temperature}"
         
         print("FASTEST GENERATION (WPM):")
-        for i, data in enumerate(by_wpm[:3], 1):
-            print(f"{i}. {data['wpm']:.0f} WPM - {data['word_count']} words in {data['gen_time']:.1f}s")
-            print(f"   Model: {data['model']}, T={data['params'].get('temperature', '?')}")
+        for i, (_, row) in enumerate(data.nlargest(3, 'wpm').iterrows(), 1):
+            print(f"{i}. {row['wpm']:.0f} WPM - {row['word_count']:.0f} words in {row['generation_time']:.1f}s")
+            print(describe(row))
             print()
         
         print("LONGEST STORIES:")
-        for i, data in enumerate(by_word_count[:3], 1):
-            print(f"{i}. {data['word_count']} words - {data['wpm']:.0f} WPM")
-            print(f"   Model: {data['model']}, T={data['params'].get('temperature', '?')}")
+        for i, (_, row) in enumerate(data.nlargest(3, 'word_count').iterrows(), 1):
+            print(f"{i}. {row['word_count']:.0f} words - {row['wpm']:.0f} WPM")
+            print(describe(row))
             print()
         
         print("FASTEST COMPLETION:")
-        for i, data in enumerate(by_speed[:3], 1):
-            print(f"{i}. {data['gen_time']:.1f} seconds - {data['word_count']} words ({data['wpm']:.0f} WPM)")
-            print(f"   Model: {data['model']}, T={data['params'].get('temperature', '?')}")
+        for i, (_, row) in enumerate(data.nsmallest(3, 'generation_time').iterrows(), 1):
+            print(f"{i}. {row['generation_time']:.1f} seconds - {row['word_count']:.0f} words ({row['wpm']:.0f} WPM)")
+            print(describe(row))
             print()
         
         input("Press Enter to continue...")
     
-    def _export_results_summary(self, results):
+    def _export_results_summary(self, frame):
         """Export results summary to file"""
         print("\nEXPORT RESULTS SUMMARY")
         print("="*40)
@@ -375,49 +312,23 @@ class ResultsAnalyzer:
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"workshop_analysis_{timestamp}.txt"
-            filepath = os.path.join(self.workshop.model_tester.results_folder, filename)
+            filepath = os.path.join(self.workshop.model_tester.laboratory_metadata, filename)
             
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write("SCENE WORKSHOP RESULTS ANALYSIS\n")
                 f.write("="*50 + "\n")
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Results analyzed: {len(results)}\n\n")
-                
-                # Write statistics
-                word_counts = []
-                gen_times = []
-                models_used = {}
-                
-                for result in results:
-                    test_info = result.get('test_info', {})
-                    response_info = result.get('response_info', {})
-                    
-                    word_count = response_info.get('word_count', 0)
-                    if word_count > 0:
-                        word_counts.append(word_count)
-                    
-                    gen_time = response_info.get('generation_time', 0)
-                    if gen_time > 0:
-                        gen_times.append(gen_time)
-                    
-                    model = test_info.get('model', 'Unknown')
-                    models_used[model] = models_used.get(model, 0) + 1
-                
-                if word_counts:
-                    f.write("WORD COUNT STATISTICS:\n")
-                    f.write(f"  Average: {sum(word_counts)/len(word_counts):.1f} words\n")
-                    f.write(f"  Range: {min(word_counts)} - {max(word_counts)} words\n")
-                    f.write(f"  Median: {sorted(word_counts)[len(word_counts)//2]} words\n\n")
+                f.write(f"Results analyzed: {len(frame)}\n\n")
+                f.write("\n".join(self._summary_lines(frame)) + "\n")
                 
-                if gen_times:
-                    f.write("GENERATION TIME STATISTICS:\n")
-                    f.write(f"  Average: {sum(gen_times)/len(gen_times):.1f} seconds\n")
-                    f.write(f"  Range: {min(gen_times):.1f} - {max(gen_times):.1f} seconds\n\n")
+                f.write("MODELS USED:\n")
+                for model, count in frame['model'].value_counts().items():
+                    f.write(f"  {model}: {count} generations\n")
                 
-                if models_used:
-                    f.write("MODELS USED:\n")
-                    for model, count in models_used.items():
-                        f.write(f"  {model}: {count} generations\n")
+                table = self._percentile_table(frame, 'generation_time', 'model')
+                if table is not None:
+                    f.write("\nLATENCY PERCENTILES BY MODEL (seconds):\n")
+                    f.write(table.to_string(float_format=lambda v: f"{v:.1f}") + "\n")
             
             print(f"Analysis exported to: {filename}")
             print(f"Location: {filepath}")
@@ -289,6 +289,21 @@ class SecondPromptManager:
         results = []
         current_story = initial_story
         
+        if mode == 'original' and len(prompts) > 1:
+            # Every improvement starts from the same story - run them side by side on the server's parallel slots
+            from concurrent.futures import ThreadPoolExecutor
+            workers = max(1, int(self.workshop.current_settings.get('parallel_workers', 1) or 1))
+            with ThreadPoolExecutor(max_workers=min(len(prompts), workers)) as pool:
+                futures = [
+                    pool.submit(self._execute_single_improvement, initial_story, system_prompt, prompt, i)
+                    for i, (prompt, name) in enumerate(zip(prompts, names), 1)
+                ]
+                # Results stay in prompt order
+                results = [r for r in (future.result() for future in futures) if r and r.get('success')]
+            if results:
+                return self._create_combined_result(initial_story, results, mode, prompts)
+            return None
+        
         for i, (prompt, name) in enumerate(zip(prompts, names), 1):
             # Suppress individual step output - generator will format it
             
@@ -319,8 +334,8 @@ class SecondPromptManager:
     def _execute_single_improvement(self, story, system_prompt, improvement_prompt, step_num):
         """Execute a single improvement step"""
         try:
-            import requests
             import time
+            from ollama_client import get_ollama_client
             
             improvement_user_prompt = f"""Here is a story:
 
@@ -351,13 +366,9 @@ Please provide the improved version. Keep the same characters and general situat
             timeout = self.workshop.model_tester.test_config.get('timeout_seconds', 0)
             timeout_val = None if timeout == 0 else timeout
             
-            response = requests.post("http://localhost:11434/api/generate", 
-                                   json=data, timeout=timeout_val)
+            api_result = get_ollama_client().generate(data, timeout=timeout_val)
             end_time = time.time()
             
-            response.raise_for_status()
-            api_result = response.json()
-            
             result = {
                 'success': True,
                 'response': api_result.get('response', ''),
@@ -22,6 +22,7 @@ class SceneWorkshopSettings:
             'second_user_prompt_names': [],
             'second_prompt_mode': 'original',
             'scene_count': 3,
+            'parallel_workers': 1,  # Ollama requests at once for scenes and improvements (match OLLAMA_NUM_PARALLEL)
             'parameter_mode': 'fixed',
             'temperature': 0.8,
             'top_p': 0.9,
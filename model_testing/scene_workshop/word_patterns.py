@@ -0,0 +1,113 @@
+import re
+from collections import Counter, defaultdict
+
+
+WORD = re.compile(r"[a-z]+(?:['’][a-z]+)*")
+# Dialogue is left out of point-of-view detection ("I" inside quotes says nothing about the narrator)
+DIALOGUE = re.compile(r'"[^"\n]*"|“[^”]*”')
+POV_PATTERNS = {
+    'first': re.compile(r"\b(?:i|me|my|mine|myself)\b"),
+    'second': re.compile(r"\b(?:you|your|yours|yourself)\b"),
+    'third': re.compile(r"\b(?:he|she|him|her|his|hers|himself|herself)\b"),
+}
+
+STOP_WORDS = frozenset(
+    "the and a to of in i you it that was is he she his her with as at on for had have but not they this "
+    "from or by be are an my me we our up out if no so what all were when would there been their said could "
+    "him its into then than them these those just over like did do does some any only very can will about "
+    "one two which who whom while where there's it's i'm".split()
+)
+
+
+class WordPatternStats:
+    """Streaming word, n-gram, repetition and point-of-view counts over many stories.
+
+    add() takes one story at a time and only updates Counters, so no text is
+    kept. Whenever an n-gram Counter grows past max_ngrams it is pruned down to
+    its max_ngrams // 2 most frequent entries, so memory stays bounded for any
+    number of stories. A pruned phrase that comes back starts counting again,
+    so reported counts are lower bounds: the true count is at most
+    count + ngram_error[size] (phrase_error[model] for per-model phrases),
+    the highest count ever pruned. Phrases more frequent than that are exact
+    in rank order.
+    """
+
+    def __init__(self, max_ngrams=200_000):
+        self.max_ngrams = max_ngrams
+        self.stories = 0
+        self.total_words = 0
+        self.words = Counter()
+        self.ngrams = {2: Counter(), 3: Counter()}
+        self.model_stories = Counter()
+        self.model_phrases = defaultdict(Counter)   # model -> trigram -> number of stories using it
+        self.ngram_error = {2: 0, 3: 0}             # size -> highest count pruned so far
+        self.phrase_error = defaultdict(int)        # model -> highest story count pruned so far
+        self.model_repetition = defaultdict(float)  # model -> sum of per-story repetition rates
+        self.pov_counts = Counter()                 # person -> indicator count over all stories
+        self.pov_stories = Counter()                # person -> stories narrated in that person
+        self.model_pov = defaultdict(Counter)
+
+    def add(self, text, model='Unknown'):
+        text = text.lower()
+        tokens = WORD.findall(text)
+        if not tokens:
+            return
+
+        self.stories += 1
+        self.total_words += len(tokens)
+        self.model_stories[model] += 1
+        self.words.update(token for token in tokens if len(token) > 3 and token not in STOP_WORDS)
+
+        story_trigrams = Counter()
+        for size, counter in self.ngrams.items():
+            grams = Counter(zip(*(tokens[offset:] for offset in range(size))))
+            counter.update({gram: count for gram, count in grams.items() if not self._all_stop_words(gram)})
+            if size == 3:
+                story_trigrams = grams
+            if len(counter) > self.max_ngrams:
+                self.ngram_error[size] = max(self.ngram_error[size], self._prune(counter, self.max_ngrams // 2))
+
+        # Phrases a model reaches for in story after story
+        phrases = self.model_phrases[model]
+        phrases.update(gram for gram in story_trigrams if not self._all_stop_words(gram))
+        if len(phrases) > self.max_ngrams:
+            self.phrase_error[model] = max(self.phrase_error[model], self._prune(phrases, self.max_ngrams // 2))
+
+        # Share of trigrams in this story that repeat an earlier one
+        total_trigrams = sum(story_trigrams.values())
+        if total_trigrams:
+            self.model_repetition[model] += 1 - len(story_trigrams) / total_trigrams
+
+        narration = DIALOGUE.sub(' ', text)
+        counts = {person: len(pattern.findall(narration)) for person, pattern in POV_PATTERNS.items()}
+        self.pov_counts.update(counts)
+        if any(counts.values()):
+            person = max(counts, key=counts.get)
+            self.pov_stories[person] += 1
+            self.model_pov[model][person] += 1
+
+    @staticmethod
+    def _all_stop_words(gram):
+        return all(word in STOP_WORDS for word in gram)
+
+    @staticmethod
+    def _prune(counter, keep):
+        """Keep the `keep` most frequent entries; returns the highest count dropped"""
+        kept = dict(counter.most_common(keep))
+        dropped = max((count for gram, count in counter.items() if gram not in kept), default=0)
+        counter.clear()
+        counter.update(kept)
+        return dropped
+
+    def top_ngrams(self, size, n=10):
+        return [(' '.join(gram), count) for gram, count in self.ngrams[size].most_common(n)]
+
+    def overused_phrases(self, model, n=5, min_stories=2):
+        """(phrase, share of the model's stories using it), most widespread first"""
+        stories = self.model_stories[model]
+        return [(' '.join(gram), count / stories) for gram, count in self.model_phrases[model].most_common(n)
+                if count >= min_stories]
+
+    def repetition_rate(self, model):
+        stories = self.model_stories[model]
+        return self.model_repetition[model] / stories if stories else 0.0
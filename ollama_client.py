@@ -0,0 +1,251 @@
+import os
+import json
+import threading
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from response_cache import ResponseCache, DEFAULT_CACHE_FOLDER
+
+
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+
+
+class OllamaError(Exception):
+    """Error reported by the Ollama server (HTTP status or an in-stream error chunk)"""
+
+
+class OllamaClient:
+    """Shared HTTP transport for every Ollama call in the app.
+
+    Wraps a single pooled, keep-alive ``requests.Session`` so that a whole
+    story run (bible, plan, every scene, title, gender swap) reuses a handful
+    of TCP connections instead of opening a new one per request.
+    """
+
+    def __init__(self, host: Optional[str] = None, connect_timeout: float = 10,
+                 read_timeout: Optional[float] = None, max_retries: int = 3,
+                 retry_backoff: float = 1.0, pool_size: int = 10,
+                 response_cache: Optional[ResponseCache] = None):
+        self.host = self._normalize_host(host or os.environ.get("OLLAMA_HOST") or DEFAULT_OLLAMA_HOST)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout  # None = no timeout (long generations)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.pool_size = pool_size
+        self.session = self._build_session()
+        # Deterministic (seeded / temperature 0) responses are served from disk when cached
+        self.response_cache = response_cache
+        self._context_lengths = {}  # model -> trained context length
+        self._model_info_lock = threading.Lock()
+
+    @staticmethod
+    def _normalize_host(host: str) -> str:
+        """Accept 'host:port' or a full URL and return a base URL without trailing slash"""
+        host = host.strip()
+        if not host.startswith(("http://", "https://")):
+            host = f"http://{host}"
+        return host.rstrip("/")
+
+    def _build_session(self) -> requests.Session:
+        """Create a pooled session with retry/backoff on connection failures"""
+        # Only retry failures that happen before Ollama starts generating:
+        # connection errors and 502/503/504 from a proxy or a model still loading.
+        # Read errors are not retried so a long generation is never silently re-run.
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries,
+            backoff_factor=self.retry_backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def url(self, path: str) -> str:
+        """Build a full URL for an API path such as '/api/generate'"""
+        return f"{self.host}/{path.lstrip('/')}"
+
+    def _resolve_timeout(self, timeout):
+        """Turn a per-call timeout override into a (connect, read) tuple"""
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, tuple):
+            return timeout
+        # A single number is a read timeout; 0 keeps the old "unlimited" meaning
+        return (self.connect_timeout, timeout or None)
+
+    def post(self, path: str, payload: Dict[str, Any], timeout=None, stream: bool = False) -> requests.Response:
+        """POST a JSON payload to Ollama through the pooled session"""
+        return self.session.post(self.url(path), json=payload, timeout=self._resolve_timeout(timeout), stream=stream)
+
+    def get(self, path: str, timeout=None) -> requests.Response:
+        """GET an Ollama endpoint through the pooled session"""
+        return self.session.get(self.url(path), timeout=self._resolve_timeout(timeout))
+
+    def generate(self, payload: Dict[str, Any], timeout=None, use_cache: bool = True) -> Dict[str, Any]:
+        """Non-streaming /api/generate call; raises for HTTP errors and returns the JSON body
+
+        use_cache=False bypasses the response cache for this call.
+        """
+        if use_cache:
+            cached = self.cached_result(payload)
+            if cached is not None:
+                return cached
+        
+        response = self.post("/api/generate", payload, timeout=timeout)
+        response.raise_for_status()
+        result = response.json()
+        
+        if use_cache:
+            self.cache_result(payload, result)
+        return result
+
+    def cached_result(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Look up a deterministic payload in the response cache"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(payload)
+
+    def cache_result(self, payload: Dict[str, Any], result: Dict[str, Any]):
+        """Store a finished response (ignored for non-deterministic payloads)
+
+        Results without done=True (a truncated stream or a partial body) are
+        never cached, so a cut-off answer can't be replayed as a hit.
+        """
+        if self.response_cache is not None and result.get('done'):
+            self.response_cache.put(payload, result)
+
+    def stream(self, path: str, payload: Dict[str, Any], timeout=None):
+        """POST with streaming enabled and yield each decoded NDJSON chunk.
+
+        Works for both /api/generate and /api/chat. The final chunk (``done``
+        is true) carries Ollama's metrics such as eval_count/eval_duration.
+        Raises OllamaError if the connection ends before that chunk arrives,
+        so a cut-off response is never mistaken for a finished one.
+        """
+        payload = dict(payload, stream=True)
+        with self.post(path, payload, timeout=timeout, stream=True) as response:
+            if response.status_code != 200:
+                raise OllamaError(f"HTTP {response.status_code}: {response.text}")
+            
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                try:
+                    chunk = line.decode('utf-8')
+                    if chunk.startswith('data: '):
+                        chunk = chunk[6:]
+                    data = json.loads(chunk)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                
+                if 'error' in data:
+                    raise OllamaError(data['error'])
+                
+                yield data
+                
+                if data.get('done', False):
+                    return
+            
+            raise OllamaError("Stream ended before Ollama sent the final (done) chunk - response is incomplete")
+
+    @staticmethod
+    def chunk_text(chunk: Dict[str, Any]) -> str:
+        """Extract generated text from a /api/generate or /api/chat chunk"""
+        if 'message' in chunk:
+            return chunk['message'].get('content', '')
+        return chunk.get('response', '')
+
+    def list_models(self, timeout=5):
+        """Return installed model names, or an empty list if Ollama is unreachable"""
+        try:
+            response = self.get("/api/tags", timeout=(self.connect_timeout, timeout))
+            if response.status_code == 200:
+                return [model['name'] for model in response.json().get('models', [])]
+        except requests.exceptions.RequestException:
+            pass
+        return []
+
+    def get_context_length(self, model: str, timeout=10) -> Optional[int]:
+        """Trained context length of a model from /api/show (cached), or None if unknown"""
+        with self._model_info_lock:
+            if model in self._context_lengths:
+                return self._context_lengths[model]
+        
+        context_length = None
+        try:
+            response = self.post("/api/show", {"model": model}, timeout=(self.connect_timeout, timeout))
+            if response.status_code == 200:
+                model_info = response.json().get("model_info", {})
+                for key, value in model_info.items():
+                    # e.g. "llama.context_length", "qwen2.context_length"
+                    if key.endswith(".context_length"):
+                        context_length = int(value)
+                        break
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        
+        with self._model_info_lock:
+            self._context_lengths[model] = context_length
+        return context_length
+
+    def is_available(self, timeout=5) -> bool:
+        """Check if the Ollama server is reachable"""
+        try:
+            response = self.get("/api/tags", timeout=(self.connect_timeout, timeout))
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaClient:
+    """Return the process-wide Ollama client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient(response_cache=ResponseCache())
+    return _client
+
+
+def configure_ollama_client(settings: Dict[str, Any]) -> OllamaClient:
+    """(Re)build the shared client from app settings (host, timeouts, retries, response cache)"""
+    global _client
+    read_timeout = settings.get("ollama_read_timeout")
+    client = OllamaClient(
+        host=settings.get("ollama_host"),
+        connect_timeout=settings.get("ollama_connect_timeout", 10),
+        read_timeout=read_timeout or None,  # 0 / None = unlimited
+        max_retries=settings.get("ollama_max_retries", 3),
+        retry_backoff=settings.get("ollama_retry_backoff", 1.0),
+        pool_size=settings.get("ollama_pool_size", 10),
+        response_cache=ResponseCache(
+            cache_folder=settings.get("response_cache_folder") or DEFAULT_CACHE_FOLDER,
+            max_entries=settings.get("response_cache_max_entries", 500),
+            max_bytes=int(float(settings.get("response_cache_max_mb", 100)) * 1024 * 1024),
+            enabled=settings.get("response_cache_enabled", True),
+        ),
+    )
+    with _client_lock:
+        old_client, _client = _client, client
+    if old_client is not None:
+        old_client.close()
+    return client
@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+DEFAULT_CACHE_FOLDER = "multiscene/cache/responses"
+
+
+class ResponseCache:
+    """Persistent, content-addressed cache for deterministic Ollama responses.
+
+    Each response is stored as ``<sha256>.json`` where the hash covers the
+    model, the full prompt (system + prompt / chat messages) and the options.
+    Only requests that will give the same answer again are cached: a fixed
+    ``seed`` or ``temperature`` 0. The folder is bounded to ``max_bytes`` and
+    ``max_entries`` files, evicting the least recently used. Sizes and recency
+    are kept in an in-memory index, read from the folder once per session
+    (a hit also refreshes the file mtime, so the order survives restarts).
+    """
+
+    # Payload fields that don't change the generated text
+    IGNORED_FIELDS = ("stream", "keep_alive")
+
+    def __init__(self, cache_folder: str = DEFAULT_CACHE_FOLDER, max_entries: int = 500,
+                 max_bytes: int = 100 * 1024 * 1024, enabled: bool = True):
+        self.cache_folder = cache_folder
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None  # key -> file size, least recently used first
+        self._total_bytes = 0
+
+    def _load_index(self):
+        """Read the folder once: every entry's size, ordered by mtime (call with the lock held)"""
+        if self._index is not None:
+            return
+        entries = []
+        try:
+            names = os.listdir(self.cache_folder)
+        except OSError:
+            names = []
+        for name in names:
+            if name.endswith(".json"):
+                try:
+                    stat = os.stat(os.path.join(self.cache_folder, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+
+    @staticmethod
+    def is_deterministic(payload: Dict[str, Any]) -> bool:
+        """True when Ollama will reproduce the same output (fixed seed or greedy decoding)"""
+        options = payload.get("options") or {}
+        return options.get("seed") is not None or options.get("temperature") == 0
+
+    def make_key(self, payload: Dict[str, Any]) -> str:
+        """Hash everything that influences the output"""
+        keyed = {k: v for k, v in payload.items() if k not in self.IGNORED_FIELDS}
+        encoded = json.dumps(keyed, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_folder, f"{key}.json")
+
+    def get(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached Ollama result for this payload, or None"""
+        if not self.enabled or not self.is_deterministic(payload):
+            return None
+
+        key = self.make_key(payload)
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._load_index()
+            if key in self._index:
+                self._index.move_to_end(key)
+        return entry["result"]
+
+    def put(self, payload: Dict[str, Any], result: Dict[str, Any]):
+        """Store a successful Ollama result and evict old entries if over the limit"""
+        if not self.enabled or not self.is_deterministic(payload):
+            return
+
+        # The token context array is large and only useful for follow-up calls
+        result = {k: v for k, v in result.items() if k != "context"}
+        entry = {
+            "model": payload.get("model"),
+            "cached_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "result": result,
+        }
+
+        try:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            key = self.make_key(payload)
+            path = self._path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+            with self._lock:
+                self._load_index()
+                self._total_bytes += size - self._index.pop(key, 0)
+                self._index[key] = size
+                self._evict()
+        except OSError as e:
+            print(f"⚠️ Could not write response cache: {e}")
+
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes and max_entries (call with the lock held)"""
+        while self._index and (self._total_bytes > self.max_bytes or len(self._index) > self.max_entries):
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> int:
+        """Delete every cached response; returns the number removed"""
+        removed = 0
+        with self._lock:
+            self._index = None
+        if os.path.isdir(self.cache_folder):
+            for name in os.listdir(self.cache_folder):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.cache_folder, name))
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    def entry_count(self) -> int:
+        with self._lock:
+            self._load_index()
+            return len(self._index)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups * 100) if lookups else 0.0,
+                "entries": len(self._index),
+                "max_entries": self.max_entries,
+                "size_mb": self._total_bytes / (1024 * 1024),
+                "max_mb": self.max_bytes / (1024 * 1024),
+                "enabled": self.enabled,
+            }
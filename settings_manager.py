@@ -23,11 +23,33 @@ class SettingsManager:
             "thinking_mode_enabled": False,    # Most models don't show reasoning
             "instruct_mode_enabled": False,    # Most models aren't instruct-tuned
             
+            # Ollama connection settings (shared pooled client)
+            "ollama_host": None,               # None = OLLAMA_HOST env var or http://localhost:11434
+            "ollama_connect_timeout": 10,      # Seconds to establish a connection
+            "ollama_read_timeout": 0,          # 0 = unlimited wait for generation
+            "ollama_max_retries": 3,           # Retries on connection errors / 502-504
+            "ollama_retry_backoff": 1.0,       # Exponential backoff factor between retries
+            "ollama_pool_size": 10,            # Keep-alive connections kept in the pool
+            
+            # Response cache - only used for deterministic calls (seed set or temperature 0)
+            "response_cache_enabled": True,
+            "response_cache_max_entries": 500,  # Least recently used responses are evicted past this
+            "response_cache_max_mb": 100,  # ...or past this total size
+            "response_cache_folder": "multiscene/cache/responses",
+            
             # NEW: Story Generation Menu Settings
             "scene_control_mode": "auto",
             "num_scenes": "auto",
             "narrative_consistency": "auto_tracking",
             "story_variations": 1,
+            "parallel_story_workers": 1,      # Stories written at once (match OLLAMA_NUM_PARALLEL)
+            "scene_parallelism": 1,           # Independent scenes written at once (1 = sequential)
+            "stream_generation": False,       # Stream tokens and save scenes to stories/partial/ as they arrive
+            "context_window": 0,              # num_ctx sent to Ollama (0 = model's own size, capped below)
+            "context_window_cap": 16384,      # Upper limit for the automatic context window (VRAM grows with it)
+            "bible_trimming": True,           # Only send bible entries for characters/places named in the scene
+            "scene_prompt_layout": "classic", # "cache_friendly" = bible in a fixed /api/chat prefix Ollama can reuse
+            "ollama_keep_alive": "30m",       # How long Ollama keeps the model (and its prompt cache) loaded
             
             # Content settings
             "content_rating": "auto",
@@ -52,13 +74,18 @@ class SettingsManager:
             
             # F5-TTS settings
             "f5tts_server_url": "http://127.0.0.1:7860",
+            "f5tts_server_pool": [],          # Extra F5-TTS servers - requests go to the least busy one
             "f5tts_selected_ref": None,
             "f5tts_ref_text": "",
             "f5tts_remove_silence": False,
             "f5tts_cross_fade": 0.15,
             "f5tts_nfe": 16,
             "f5tts_speed": 1.0,
-            "f5tts_timing_data": [],
+            "f5tts_chunk_chars": 1500,        # Longer texts are split and synthesized in parallel (0 = never)
+            "f5tts_parallel_chunks": 2,       # Chunk requests sent to the F5-TTS server at once
+            "f5tts_chunk_retries": 2,         # Extra attempts for chunks that failed
+            "f5tts_audio_cache_enabled": True,  # Re-voicing an edited story only sends the chunks around edited paragraphs
+            "f5tts_audio_cache_mb": 500,      # Size cap of multiscene/audio/cache (least recently used removed first)
             "f5tts_processed_count": 0,
             
             # Folders
@@ -210,6 +237,15 @@ class SettingsManager:
         print(f"  Runs: {self.get('num_runs')}")
         print(f"  Reuse mode: {self.get('storyboard_reuse_mode')}")
         
+        print("\n🔌 OLLAMA CONNECTION:")
+        print(f"  Host: {self.get('ollama_host') or 'Default (OLLAMA_HOST or localhost:11434)'}")
+        read_timeout = self.get('ollama_read_timeout')
+        print(f"  Timeouts: connect {self.get('ollama_connect_timeout')}s | read {f'{read_timeout}s' if read_timeout else 'unlimited'}")
+        print(f"  Retries: {self.get('ollama_max_retries')} (backoff {self.get('ollama_retry_backoff')})")
+        cache_status = 'Enabled' if self.get('response_cache_enabled', True) else 'Disabled'
+        print(f"  Response cache: {cache_status} (max {self.get('response_cache_max_entries', 500)} entries, "
+              f"{self.get('response_cache_max_mb', 100)} MB)")
+        
         # NEW: Story generation menu settings
         print(f"\n STORY CONFIGURATION:")
         print(f"  Scene Control: {self.get('scene_control_mode', 'auto').title()}")
@@ -219,13 +255,31 @@ class SettingsManager:
         print(f"  Language: {self.get('profanity_level', 'moderate').title()}/{self.get('dialogue_intensity', 'moderate').title()}")
         print(f"  Perspective: {self.get('perspective_selected', 'default').replace('_', ' ').title()}")
         print(f"  Story Variations: {self.get('story_variations', 1)}")
+        print(f"  Parallel Stories: {self.get('parallel_story_workers', 1)}")
+        print(f"  Parallel Scenes: {self.get('scene_parallelism', 1)}")
+        context_window = self.get('context_window', 0)
+        if context_window:
+            print(f"  Context Window: {context_window:,} tokens")
+        else:
+            print(f"  Context Window: Auto (model size, max {self.get('context_window_cap', 16384):,})")
+        print(f"  Bible Trimming: {'On' if self.get('bible_trimming', True) else 'Off'}")
+        print(f"  Scene Prompt Layout: {self.get('scene_prompt_layout', 'classic')} (keep_alive {self.get('ollama_keep_alive', '30m')})")
         
         print("\n🎵 F5-TTS:")
         print(f"  Server: {self.get('f5tts_server_url')}")
+        if self.get('f5tts_server_pool'):
+            print(f"  Server pool: +{len(self.get('f5tts_server_pool'))} ({', '.join(self.get('f5tts_server_pool'))})")
         print(f"  Reference audio: {self.get('f5tts_selected_ref') or 'None selected'}")
         print(f"  Auto-generate: {'Enabled' if self.get('auto_generate_audio') else 'Disabled'}")
         print(f"  Speed: {self.get('f5tts_speed')}")
         print(f"  NFE: {self.get('f5tts_nfe')}")
+        chunk_chars = self.get('f5tts_chunk_chars', 1500)
+        if chunk_chars:
+            print(f"  Chunking: {chunk_chars:,} chars, {self.get('f5tts_parallel_chunks', 2)} in parallel")
+        else:
+            print("  Chunking: Off (one request per story)")
+        print(f"  Audio cache: {'On' if self.get('f5tts_audio_cache_enabled', True) else 'Off'} "
+              f"({self.get('f5tts_audio_cache_mb', 500)} MB max)")
         
         print("\n📁 FOLDERS:")
         print(f"  Stories: {self.get('stories_folder')}")
@@ -603,6 +603,122 @@ class SettingsUI:
         
         input("Press Enter to continue...")
 
+    def toggle_stream_generation(self):
+        """Toggle token streaming for multi-scene story generation"""
+        print("\n" + "="*60)
+        print("TOKEN STREAMING")
+        print("="*60)
+        print("Streaming receives the story token by token instead of all at once.\n")
+        
+        current_enabled = self.app.settings.get("stream_generation", False)
+        
+        if current_enabled:
+            print("CURRENTLY ENABLED")
+        else:
+            print("CURRENTLY DISABLED")
+        print("• Shows progress and real tokens/sec while long scenes generate")
+        print("• Saves scenes to stories/partial/ as they are written")
+        print("• If generation fails late, finished scenes are kept on disk")
+        
+        print(f"\n1. {'Disable' if current_enabled else 'Enable'} token streaming")
+        print("2. Keep current setting")
+        
+        try:
+            choice = input("Select (1-2): ").strip()
+            
+            if choice == "1":
+                self.app.settings.set("stream_generation", not current_enabled)
+                status = "enabled" if not current_enabled else "disabled"
+                print(f"✓ Token streaming {status}")
+            elif choice == "2":
+                print("✓ Keeping current setting")
+            else:
+                print("❌ Invalid choice")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        
+        input("Press Enter to continue...")
+
+    def configure_response_cache(self):
+        """Show response cache statistics, toggle it or clear it"""
+        from ollama_client import get_ollama_client
+        
+        cache = get_ollama_client().response_cache
+        
+        print("\n" + "="*60)
+        print("RESPONSE CACHE")
+        print("="*60)
+        print("Identical prompts with a fixed seed (or temperature 0) give identical output,")
+        print("so their responses are reused instead of asking Ollama again.")
+        print("Random-seed generations are never cached.\n")
+        
+        current_enabled = self.app.settings.get("response_cache_enabled", True)
+        print(f"Status: {'ENABLED' if current_enabled else 'DISABLED'}")
+        if cache:
+            stats = cache.get_stats()
+            print(f"Entries: {stats['entries']}/{stats['max_entries']} ({stats['size_mb']:.1f}/{stats['max_mb']:.0f} MB) in {cache.cache_folder}")
+            print(f"This session: {stats['hits']} hits | {stats['misses']} misses ({stats['hit_rate']:.1f}% hit rate)")
+        
+        print(f"\n1. {'Disable' if current_enabled else 'Enable'} response cache")
+        print("2. Clear cached responses")
+        print("3. Keep current setting")
+        
+        try:
+            choice = input("Select (1-3): ").strip()
+            
+            if choice == "1":
+                self.app.settings.set("response_cache_enabled", not current_enabled)
+                if cache:
+                    cache.enabled = not current_enabled
+                status = "enabled" if not current_enabled else "disabled"
+                print(f"✓ Response cache {status}")
+            elif choice == "2":
+                removed = cache.clear() if cache else 0
+                print(f"✓ Removed {removed} cached responses")
+            elif choice == "3":
+                print("✓ Keeping current setting")
+            else:
+                print("❌ Invalid choice")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        
+        input("Press Enter to continue...")
+
+    def toggle_scene_prompt_layout(self):
+        """Switch scene prompts between the classic layout and a KV-cache friendly prefix"""
+        print("\n" + "="*60)
+        print("SCENE PROMPT LAYOUT")
+        print("="*60)
+        print("Classic: each scene prompt starts with the scene description and includes only")
+        print("the bible entries relevant to that scene.")
+        print("Cache-friendly: system prompt, story intent and the whole bible form a fixed")
+        print("/api/chat prefix, so Ollama reuses it and only processes the new scene text.")
+        print(f"The model is kept loaded between calls (keep_alive {self.app.settings.get('ollama_keep_alive', '30m')}).\n")
+        
+        current = self.app.settings.get("scene_prompt_layout", "classic")
+        print(f"CURRENTLY: {'CACHE-FRIENDLY' if current == 'cache_friendly' else 'CLASSIC'}")
+        print("• Cache-friendly cuts prompt processing time from the second scene on")
+        print("• Classic trims the bible per scene (smaller prompts, no prefix reuse)")
+        
+        new_layout = "classic" if current == "cache_friendly" else "cache_friendly"
+        print(f"\n1. Switch to {new_layout.replace('_', '-')} layout")
+        print("2. Keep current setting")
+        
+        try:
+            choice = input("Select (1-2): ").strip()
+            
+            if choice == "1":
+                self.app.settings.set("scene_prompt_layout", new_layout)
+                print(f"✓ Scene prompt layout: {new_layout.replace('_', '-')}")
+            elif choice == "2":
+                print("✓ Keeping current setting")
+            else:
+                print("❌ Invalid choice")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        
+        input("Press Enter to continue...")
+
     def toggle_hide_reasoning(self):
         """Toggle hiding reasoning for thinking models"""
         print("\n" + "="*60)
@@ -317,7 +317,7 @@ class SingleSceneGenerator:
             'user_prompt': user_prompt
         }
         
-        filepath = self.model_tester.save_test_result(result, test_info, session_folder)
+        filepath, _ = self.model_tester.save_test_result(result, test_info, session_folder)
         print(f"💾 Saved to: {os.path.basename(filepath)}")
         
         input("\nPress Enter to continue...")
@@ -1,6 +1,7 @@
 import os
 import time
-import requests
+
+from ollama_client import get_ollama_client
 
 class StoryAnalyzer:
     def __init__(self, stories_folder, blueprint_folder, llm_settings):
@@ -58,8 +59,6 @@ class StoryAnalyzer:
 
     def call_ollama_direct(self, system_prompt, user_prompt, use_analysis_system=False):
         """Direct call to Ollama for story analysis with optional analysis system prompt"""
-        url = "http://localhost:11434/api/generate"
-        
         # Get base analysis system prompt and combine it
         if use_analysis_system:
             base_system = self.get_analysis_system_prompt()
@@ -88,9 +87,7 @@ class StoryAnalyzer:
         }
         
         try:
-            response = requests.post(url, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = get_ollama_client().generate(data)
             return result.get("response", "No response generated")
         except Exception as e:
             return f"Error: {e}"
@@ -0,0 +1,152 @@
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from f5tts_chunked import NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    from f5tts_chunked import read_wav, write_wav, concatenate_with_cross_fade
+
+
+class StoryAudioPipeline:
+    """Renders story audio on a TTS worker thread while Ollama keeps writing.
+
+    Story generators push each finished scene (scene_listener) and the worker
+    synthesizes it right away, so scene 1 is spoken while scene 2 is written.
+    finish_story() adds the title and joins the scene WAVs into the final
+    audio file; close() waits for everything still queued.
+    Without numpy the scenes can't be joined locally, so the whole story is
+    synthesized in one go when it is finished instead.
+    """
+
+    def __init__(self, f5tts_handler):
+        self.handler = f5tts_handler
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.parts_folder = os.path.join(f5tts_handler.audio_folder, 'parts', run_id)
+
+        self._queue = queue.Queue()
+        self._scene_audio = {}    # story_key -> {scene_number: wav path or None if it failed}
+        self._scene_text = {}     # story_key -> {scene_number: text} (needed for retries)
+        self.audio_files = {}     # story file name -> final audio path (None if it failed)
+        self._worker = threading.Thread(target=self._run, name="StoryAudioPipeline", daemon=True)
+        self._worker.start()
+
+    def scene_listener(self, story_key):
+        """Callable for StoryGenerator.scene_listener"""
+        return lambda scene_number, content: self.add_scene(story_key, scene_number, content)
+
+    def add_scene(self, story_key, scene_number, content):
+        self._queue.put(('scene', story_key, scene_number, content))
+
+    def finish_story(self, story_key, story_path):
+        """Queue the join of a finished story (the title is read from its first line)"""
+        self._queue.put(('finish', story_key, story_path))
+
+    def discard_story(self, story_key):
+        """Story failed - drop its scene audio"""
+        self._queue.put(('discard', story_key))
+
+    def pending(self):
+        return self._queue.unfinished_tasks
+
+    def close(self):
+        """Wait for all queued audio, stop the worker; returns {story file: audio path}"""
+        remaining = self.pending()
+        if remaining:
+            print(f"\n🎵 Waiting for {remaining} audio job(s) to finish...")
+        self._queue.put(None)
+        self._worker.join()
+        shutil.rmtree(self.parts_folder, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(self.parts_folder))  # Only if no other run is using it
+        except OSError:
+            pass
+        return self.audio_files
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                kind, story_key = job[0], job[1]
+                if kind == 'scene':
+                    self._render_scene(story_key, job[2], job[3])
+                elif kind == 'finish':
+                    self._finish(story_key, job[2])
+                elif kind == 'discard':
+                    self._discard(story_key)
+            except Exception as e:
+                print(f"⚠️ Audio pipeline error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _scene_path(self, story_key, scene_number):
+        folder = os.path.join(self.parts_folder, f"story_{story_key}")
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"scene_{scene_number:03d}.wav")
+
+    def _render_scene(self, story_key, scene_number, content):
+        self._scene_text.setdefault(story_key, {})[scene_number] = content
+        if not NUMPY_AVAILABLE:
+            return  # Rendered as one piece in _finish
+
+        label = "title" if scene_number == 0 else f"scene {scene_number}"
+        print(f"\n🎵 [Story {story_key}] Rendering audio for {label} while writing continues...")
+        path = self._scene_path(story_key, scene_number)
+        start = time.time()
+        ok = self.handler._call_f5tts_api(content, path)
+        self._scene_audio.setdefault(story_key, {})[scene_number] = path if ok else None
+        if ok:
+            print(f"🎵 [Story {story_key}] {label.capitalize()} audio ready in {time.time() - start:.1f}s")
+
+    def _finish(self, story_key, story_path):
+        story_file = os.path.basename(story_path)
+        output_path = self.handler.get_audio_output_path(story_file)
+        if not output_path:
+            print(f"❌ [Story {story_key}] Too many existing audio files with similar names")
+            self.audio_files[story_file] = None
+            return
+
+        if not NUMPY_AVAILABLE:
+            with open(story_path, 'r', encoding='utf-8') as f:
+                story_text = f.read().strip()
+            ok = self.handler._call_f5tts_api(story_text, output_path)
+            self.audio_files[story_file] = output_path if ok else None
+            return
+
+        # Title (first line of the saved story) is only known once the story is saved
+        with open(story_path, 'r', encoding='utf-8') as f:
+            title = f.readline().strip()
+        if title:
+            self._render_scene(story_key, 0, title)
+
+        # One more try for scenes whose audio failed while the story was being written
+        scene_audio = self._scene_audio.get(story_key, {})
+        for scene_number in sorted(n for n, path in scene_audio.items() if path is None):
+            self._render_scene(story_key, scene_number, self._scene_text[story_key][scene_number])
+
+        missing = [n for n, path in scene_audio.items() if path is None]
+        if missing or not scene_audio:
+            print(f"❌ [Story {story_key}] No audio for scene(s) {', '.join(map(str, sorted(missing)))} - story audio not created")
+            self.audio_files[story_file] = None
+            return
+
+        segments, sample_rate, sample_width = [], None, None
+        for scene_number in sorted(scene_audio):
+            samples, sample_rate, sample_width = read_wav(scene_audio[scene_number])
+            segments.append(samples)
+        audio = concatenate_with_cross_fade(segments, sample_rate, float(self.handler.f5tts_cross_fade or 0))
+        write_wav(output_path, audio, sample_rate, sample_width)
+
+        self.audio_files[story_file] = output_path
+        print(f"✅ [Story {story_key}] Audio ready: {output_path} ({len(audio) / sample_rate / 60:.1f} min)")
+        self._discard(story_key)
+
+    def _discard(self, story_key):
+        self._scene_audio.pop(story_key, None)
+        self._scene_text.pop(story_key, None)
+        shutil.rmtree(os.path.join(self.parts_folder, f"story_{story_key}"), ignore_errors=True)
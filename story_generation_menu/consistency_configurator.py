@@ -63,3 +63,32 @@ class ConsistencyConfigurator:
         
         input("\nPress Enter to continue...")
         return result
+    
+    def configure_scene_parallelism(self, current_parallelism):
+        """Configure how many independent scenes are written at once"""
+        print("\n" + "="*60)
+        print("PARALLEL SCENE WRITING")
+        print("="*60)
+        print("With Basic or No consistency tracking, each scene only depends on the")
+        print("story bible and scene plan, so several scenes can be written at once.")
+        print("Auto Tracking feeds earlier scenes forward and always writes in order.")
+        print("Requires OLLAMA_NUM_PARALLEL > 1 on the Ollama server.\n")
+        
+        print(f"Current: {current_parallelism} {'scene' if current_parallelism == 1 else 'scenes'} at once")
+        
+        try:
+            value = input(f"Scenes to write at once (1-8, Enter to keep {current_parallelism}): ").strip()
+            if not value:
+                result = current_parallelism
+            elif 1 <= int(value) <= 8:
+                result = int(value)
+                print(f"✓ Will write up to {result} {'scene' if result == 1 else 'scenes'} at once")
+            else:
+                print("❌ Invalid number. Must be between 1-8.")
+                result = current_parallelism
+        except ValueError:
+            print("❌ Invalid input.")
+            result = current_parallelism
+        
+        input("\nPress Enter to continue...")
+        return result
@@ -146,10 +146,15 @@ class StoryGenerationMenu:
         print(f"9. Story Intent & Style: {intent_display}")
         print(f"10. Perspective & POV: {perspective_display}")  # This will now show gender swap
         print(f"11. Language & Dialogue: {language_display}")
-        print(f"12. Story Variations: {self.story_variations}")
+        parallel_workers = self.app.settings.get("parallel_story_workers", 1)
+        if self.story_variations > 1 and parallel_workers > 1:
+            print(f"12. Story Variations: {self.story_variations} ({min(parallel_workers, self.story_variations)} at once)")
+        else:
+            print(f"12. Story Variations: {self.story_variations}")
         print("13. Advanced LLM Settings")
         print("14. Generate Stories Now!")
-        print("15. Back to Main Menu")
+        print("15. Resume Failed Story")
+        print("16. Back to Main Menu")
         print("-" * 60)
         
         # Enhanced LLM settings display
@@ -162,7 +167,7 @@ class StoryGenerationMenu:
         model_modes = self.app.get_model_mode_display()
         print(f"{model_modes}")
         
-        print("\nSelect option (1-15): ", end="")  # Updated number
+        print("\nSelect option (1-16): ", end="")  # Updated number
     
     def configure_perspective(self):
         """Configure perspective and POV options"""
@@ -396,7 +401,7 @@ class StoryGenerationMenu:
             self.display_story_generation_menu()
             
             try:
-                choice = input("Select option (1-15): ").strip()
+                choice = input("Select option (1-16): ").strip()
                 
                 if choice == "1":
                     self.selected_blueprint = self.blueprint_selector.select_blueprint_for_generation(self.selected_blueprint)
@@ -408,6 +413,10 @@ class StoryGenerationMenu:
                 elif choice == "4":
                     self.narrative_consistency = self.consistency_configurator.configure_narrative_consistency(
                         self.narrative_consistency)
+                    if self.narrative_consistency != "auto_tracking":
+                        scene_parallelism = self.consistency_configurator.configure_scene_parallelism(
+                            self.app.settings.get("scene_parallelism", 1))
+                        self.app.settings.set("scene_parallelism", scene_parallelism)
                 elif choice == "5":  # Content Rating
                     old_rating = self.content_rating
                     self.content_rating = self.content_configurator.configure_content_rating(self.content_rating)
@@ -464,6 +473,10 @@ class StoryGenerationMenu:
                 
                 elif choice == "12":  # Story Variations
                     self.story_variations = self.variation_configurator.set_story_variations(self.story_variations)
+                    if self.story_variations > 1:
+                        parallel_workers = self.variation_configurator.set_parallel_workers(
+                            self.app.settings.get("parallel_story_workers", 1), self.story_variations)
+                        self.app.settings.set("parallel_story_workers", parallel_workers)
                 elif choice == "13":  # Advanced LLM Settings
                     self.variation_configurator.show_advanced_llm_settings(self.app)
                 elif choice == "14":  # Generate Stories
@@ -484,7 +497,9 @@ class StoryGenerationMenu:
                         self.speech_style,
                         self.custom_story_title  # Pass the title setting
                     )
-                elif choice == "15":  # Back to Main Menu
+                elif choice == "15":  # Resume Failed Story
+                    self.story_runner.resume_story_run(self.story_intent_config, self.perspective_controller)
+                elif choice == "16":  # Back to Main Menu
                     # Auto-save story generation settings on exit if possible
                     if self.settings_manager and hasattr(self.settings_manager, 'save_story_generation_settings'):
                         self.settings_manager.save_story_generation_settings(self)
@@ -492,7 +507,7 @@ class StoryGenerationMenu:
                         self._save_basic_settings()
                     break
                 else:
-                    print("❌ Invalid option. Please select 1-15.")
+                    print("❌ Invalid option. Please select 1-16.")
                     input("Press Enter to continue...")
                     
             except KeyboardInterrupt:
@@ -1,8 +1,13 @@
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from generators.story_generator import StoryGenerator
+from generators.generation_stats import GenerationStats, BatchProgress
+from generators.story_checkpoint import StoryCheckpoint
 from .system_prompt_builder import SystemPromptBuilder
 from blueprint_processor import BlueprintProcessor
+from ollama_client import get_ollama_client
+from story_audio_pipeline import StoryAudioPipeline
 
 class StoryGeneratorRunner:
     def __init__(self, app_instance):
@@ -151,56 +156,8 @@ class StoryGeneratorRunner:
             'app_settings': self.app.settings.settings
         }
         
-        # ... rest of existing code remains the same ...
-        
-        # Create story generator with correct parameters
-        generator = StoryGenerator(
-            blueprint_to_use,  # blueprint_file parameter
-            self.app.stories_folder,  # stories_folder parameter  
-            self.app.storyboard_folder,  # storyboard_folder parameter
-            llm_settings  # ollama_settings parameter - now includes everything
-        )
-        
-        # Pass the custom title setting to the generator
-        generator.custom_story_title = custom_story_title
-        
-        # NEW: Pass app settings to the generator so it can access token distribution settings
-        generator.app_settings = self.app  # This gives generators access to token settings
-        
-        # Ensure the API handler has access to app settings too
-        if hasattr(generator, 'api_handler'):
-            generator.api_handler.app_settings = self.app
-        
-        # Also pass to individual generators
-        if hasattr(generator, 'bible_generator') and hasattr(generator.bible_generator, 'api_handler'):
-            generator.bible_generator.api_handler.app_settings = self.app
-        
-        if hasattr(generator, 'scene_planner') and hasattr(generator.scene_planner, 'api_handler'):
-            generator.scene_planner.api_handler.app_settings = self.app
-        
-        if hasattr(generator, 'scene_writer') and hasattr(generator.scene_writer, 'api_handler'):
-            generator.scene_writer.api_handler.app_settings = self.app
-        
-        # Set additional properties that your StoryGenerator expects
-        generator.narrative_consistency = narrative_consistency
-        generator.content_settings = content_settings
-        generator.language_settings = language_settings
-        generator.story_intent = story_intent_config
-        generator.system_prompts = llm_settings.get('system_prompts', {})
-        generator.clean_llm_settings = {
-            'model': self.app.selected_model,
-            'max_tokens': self.app.max_tokens,
-            'temperature': self.app.temperature,
-            'top_p': self.app.top_p,
-            'top_k': self.app.top_k,
-            'repeat_penalty': self.app.repeat_penalty,
-            'seed': self.app.seed
-        }
-        generator.blueprint_folder = self.app.blueprint_folder  # Add this missing property
-
         # Set the perspective controller if provided
         if perspective_controller:
-            generator.perspective_controller = perspective_controller
             print(f"🎭 Perspective: {perspective_controller.selected_perspective.replace('_', ' ').title()}")
         
         # Show gender swap status
@@ -253,6 +210,230 @@ class StoryGeneratorRunner:
         
         print("-" * 60)
         
+        generator_args = (blueprint_to_use, llm_settings, custom_story_title, perspective_controller)
+        
+        # Scenes are voiced while the next ones are written
+        audio_pipeline = self._start_audio_pipeline()
+        
+        # Parallel variations mode - only worth it when the Ollama server has spare slots
+        parallel_workers = min(self.app.settings.get("parallel_story_workers", 1) or 1, story_variations)
+        if parallel_workers > 1:
+            generated_stories, story_casts = self._generate_stories_parallel(
+                generator_args, story_variations, parallel_workers, narrative_consistency, audio_pipeline
+            )
+        else:
+            generated_stories, story_casts = self._generate_stories_sequential(
+                generator_args, story_variations, narrative_consistency, audio_pipeline
+            )
+        
+        audio_files = self._close_audio_pipeline(audio_pipeline)
+        
+        # Final summary
+        print(f"\n{'='*60}")
+        print(f"GENERATION COMPLETE!")
+        print("="*60)
+        print(f"Generated stories: {len(generated_stories)}/{story_variations}")
+        
+        if narrative_consistency == "auto_tracking" and story_casts:
+            print(f"\n🎭 CAST DIVERSITY SUMMARY:")
+            total_entities = 0
+            for i, cast in enumerate(story_casts, 1):
+                entity_count = cast.count('•')
+                total_entities += entity_count
+                print(f"   Story {i}: {entity_count} unique entities detected")
+            print(f"   Total: {total_entities} entity appearances across all stories")
+        
+        # Response cache only kicks in for seeded / temperature 0 runs
+        response_cache = get_ollama_client().response_cache
+        if response_cache and (response_cache.hits or response_cache.misses):
+            print(f"💾 Response cache: {response_cache.hits} hits | {response_cache.misses} misses this session")
+        
+        print(f"\nCheck the '{self.app.stories_folder}/' folder for your generated stories.")
+        
+        if audio_files:
+            created = sum(1 for path in audio_files.values() if path)
+            print(f"🎵 Audio files created: {created}/{len(audio_files)} in '{self.app.audio_folder}/'")
+        
+        print("\n🧠 SYSTEM PROMPT BENEFITS DELIVERED:")
+        print("   ✓ Content settings were built into AI personality from start")
+        print("   ✓ No fighting against instructions - natural storytelling")
+        print("   ✓ All stages maintained consistent personality")
+    
+    def resume_story_run(self, story_intent_config=None, perspective_controller=None):
+        """Continue a failed story run from its checkpoint (first missing scene onwards)"""
+        checkpoints = StoryCheckpoint.list_checkpoints(self.app.multiscene_stats_folder)
+        
+        print(f"\n{'='*60}")
+        print("RESUME FAILED STORY")
+        print("="*60)
+        
+        if not checkpoints:
+            print("✓ No unfinished story runs found")
+            input("Press Enter to continue...")
+            return
+        
+        for i, checkpoint in enumerate(checkpoints, 1):
+            print(f"{i}. {checkpoint.describe()}")
+            reason = checkpoint.data.get('failure_reason')
+            if reason:
+                print(f"   ❌ {reason}")
+        print(f"{len(checkpoints) + 1}. Back")
+        
+        choice = input(f"\nSelect run to resume (1-{len(checkpoints) + 1}): ").strip()
+        try:
+            index = int(choice) - 1
+        except ValueError:
+            print("❌ Invalid selection")
+            input("Press Enter to continue...")
+            return
+        if index == len(checkpoints):
+            return
+        if not 0 <= index < len(checkpoints):
+            print("❌ Invalid selection")
+            input("Press Enter to continue...")
+            return
+        
+        checkpoint = checkpoints[index]
+        config = checkpoint.data.get('generation_config', {})
+        saved_llm_settings = config.get('llm_settings', {})
+        
+        # Scenes are written with the model/sampling settings the run started with
+        llm_settings = dict(saved_llm_settings)
+        llm_settings.update({
+            'gender_swap_mode': config.get('gender_swap_mode', 'none'),
+            'blueprint_folder': self.app.blueprint_folder,
+            'stats_folder': self.app.multiscene_stats_folder,
+            'narrative_consistency': config.get('narrative_consistency', 'auto_tracking'),
+            'content_settings': config.get('content_settings', {}),
+            'language_settings': config.get('language_settings', {}),
+            'story_intent': story_intent_config,
+            'system_prompts': config.get('system_prompts', {}),
+            'app_settings': self.app.settings.settings
+        })
+        if not llm_settings.get('model'):
+            llm_settings['model'] = self.app.selected_model
+        
+        print(f"\n♻️ Resuming: {checkpoint.describe()}")
+        print(f"Model: {llm_settings['model']}")
+        
+        generator = self._create_generator(
+            checkpoint.blueprint_name, llm_settings, config.get('custom_story_title'), perspective_controller
+        )
+        if saved_llm_settings:
+            generator.clean_llm_settings = dict(saved_llm_settings)
+        
+        audio_pipeline = self._start_audio_pipeline()
+        self._attach_audio_pipeline(generator, audio_pipeline, checkpoint.story_number)
+        
+        story_filename, _ = generator.generate_complete_story(
+            checkpoint.blueprint_name, checkpoint.story_number, checkpoint=checkpoint
+        )
+        
+        self._hand_story_to_audio_pipeline(audio_pipeline, checkpoint.story_number, story_filename)
+        if story_filename:
+            print(f"✓ Story {checkpoint.story_number} completed successfully!")
+        else:
+            print(f"❌ Story {checkpoint.story_number} failed again - the checkpoint was kept")
+        self._close_audio_pipeline(audio_pipeline)
+        
+        input("Press Enter to continue...")
+    
+    def _start_audio_pipeline(self):
+        """TTS worker for auto-generate audio, or None if audio isn't enabled/ready"""
+        if not self.app.auto_generate_audio:
+            return None
+        handler = getattr(self.app, 'f5tts_handler', None)
+        if not handler:
+            print("⚠️ Auto-audio is enabled but F5-TTS is not available - skipping audio")
+            return None
+        if not handler.f5tts_selected_ref or not handler.f5tts_ref_text:
+            print("⚠️ Auto-audio is enabled but no reference audio is selected - skipping audio")
+            return None
+        print("🎵 Audio pipeline started: scenes are voiced as soon as they are written")
+        return StoryAudioPipeline(handler)
+    
+    @staticmethod
+    def _attach_audio_pipeline(generator, audio_pipeline, story_number):
+        generator.scene_listener = audio_pipeline.scene_listener(story_number) if audio_pipeline else None
+    
+    def _hand_story_to_audio_pipeline(self, audio_pipeline, story_number, story_filename):
+        """Queue the final join for a finished story, or drop its scene audio if it failed"""
+        if not audio_pipeline:
+            return
+        if story_filename:
+            audio_pipeline.finish_story(story_number, os.path.join(self.app.stories_folder, story_filename))
+        else:
+            audio_pipeline.discard_story(story_number)
+    
+    def _close_audio_pipeline(self, audio_pipeline):
+        """Wait for queued audio; returns {story file: audio path}"""
+        if not audio_pipeline:
+            return {}
+        return audio_pipeline.close()
+    
+    def _create_generator(self, blueprint_to_use, llm_settings, custom_story_title=None,
+                          perspective_controller=None, story_number=None):
+        """Create a fully configured StoryGenerator (one per story in parallel mode)"""
+        if story_number is not None:
+            # Separate prompt log file per concurrent story
+            llm_settings = dict(llm_settings, run_label=f"v{story_number}")
+        
+        # Create story generator with correct parameters
+        generator = StoryGenerator(
+            blueprint_to_use,  # blueprint_file parameter
+            self.app.stories_folder,  # stories_folder parameter  
+            self.app.storyboard_folder,  # storyboard_folder parameter
+            llm_settings  # ollama_settings parameter - now includes everything
+        )
+        
+        # Pass the custom title setting to the generator
+        generator.custom_story_title = custom_story_title
+        
+        # NEW: Pass app settings to the generator so it can access token distribution settings
+        generator.app_settings = self.app  # This gives generators access to token settings
+        
+        # Ensure the API handler has access to app settings too
+        if hasattr(generator, 'api_handler'):
+            generator.api_handler.app_settings = self.app
+        
+        # Also pass to individual generators
+        if hasattr(generator, 'bible_generator') and hasattr(generator.bible_generator, 'api_handler'):
+            generator.bible_generator.api_handler.app_settings = self.app
+        
+        if hasattr(generator, 'scene_planner') and hasattr(generator.scene_planner, 'api_handler'):
+            generator.scene_planner.api_handler.app_settings = self.app
+        
+        if hasattr(generator, 'scene_writer') and hasattr(generator.scene_writer, 'api_handler'):
+            generator.scene_writer.api_handler.app_settings = self.app
+        
+        # Set additional properties that your StoryGenerator expects
+        generator.narrative_consistency = llm_settings['narrative_consistency']
+        generator.content_settings = llm_settings['content_settings']
+        generator.language_settings = llm_settings['language_settings']
+        generator.story_intent = llm_settings['story_intent']
+        generator.system_prompts = llm_settings.get('system_prompts', {})
+        generator.clean_llm_settings = {
+            'model': self.app.selected_model,
+            'max_tokens': self.app.max_tokens,
+            'temperature': self.app.temperature,
+            'top_p': self.app.top_p,
+            'top_k': self.app.top_k,
+            'repeat_penalty': self.app.repeat_penalty,
+            'seed': self.app.seed
+        }
+        generator.blueprint_folder = self.app.blueprint_folder  # Add this missing property
+
+        # Set the perspective controller if provided
+        if perspective_controller:
+            generator.perspective_controller = perspective_controller
+        
+        return generator
+    
+    def _generate_stories_sequential(self, generator_args, story_variations, narrative_consistency, audio_pipeline=None):
+        """Generate story variations one after another with a single generator"""
+        blueprint_to_use = generator_args[0]
+        generator = self._create_generator(*generator_args)
+        
         generated_stories = []
         story_casts = []  # Store cast info for each story
         
@@ -260,9 +441,9 @@ class StoryGeneratorRunner:
             print(f"\n{'='*20} STORY {i}/{story_variations} {'='*20}")
             
             # Generate story with processed blueprint
+            self._attach_audio_pipeline(generator, audio_pipeline, i)
             story_filename, context_tracker = generator.generate_complete_story(blueprint_to_use, i)
-            
-            # ... rest of existing loop code ...
+            self._hand_story_to_audio_pipeline(audio_pipeline, i, story_filename)
             
             if story_filename:
                 print(f"✓ Story {i} completed successfully!")
@@ -273,12 +454,6 @@ class StoryGeneratorRunner:
                     cast_summary = context_tracker.get_story_cast()
                     story_casts.append(cast_summary)
                     print(f"\n{cast_summary}")
-                
-                # Auto-generate audio if enabled
-                if self.app.auto_generate_audio:
-                    print(f"🎵 Auto-generating audio for story {i}...")
-                    if hasattr(self.app, '_auto_generate_audio'):
-                        self.app._auto_generate_audio(story_filename)
             else:
                 print(f"❌ Error generating story {i}")
             
@@ -286,30 +461,61 @@ class StoryGeneratorRunner:
                 print("Waiting 2 seconds before next story...")
                 time.sleep(2)
         
-        # Final summary
-        print(f"\n{'='*60}")
-        print(f"GENERATION COMPLETE!")
-        print("="*60)
-        print(f"Generated stories: {len(generated_stories)}/{story_variations}")
-        
-        if narrative_consistency == "auto_tracking" and story_casts:
-            print(f"\n🎭 CAST DIVERSITY SUMMARY:")
-            total_entities = 0
-            for i, cast in enumerate(story_casts, 1):
-                entity_count = cast.count('•')
-                total_entities += entity_count
-                print(f"   Story {i}: {entity_count} unique entities detected")
-            print(f"   Total: {total_entities} entity appearances across all stories")
+        return generated_stories, story_casts
+    
+    def _generate_stories_parallel(self, generator_args, story_variations, parallel_workers, narrative_consistency,
+                                   audio_pipeline=None):
+        """Generate story variations concurrently with a bounded worker pool"""
+        print(f"\n⚡ Parallel mode: writing up to {parallel_workers} stories at once")
+        print("   (set OLLAMA_NUM_PARALLEL on the Ollama server to at least this value)")
+        
+        batch_progress = BatchProgress(story_variations)
+        results = {}  # story_number -> (story_filename, context_tracker)
+        
+        def run_story(story_number):
+            batch_progress.story_started(story_number)
+            # Each story gets its own generator, prompt log file and GenerationStats
+            generator = self._create_generator(*generator_args, story_number=story_number)
+            generator.generation_stats = GenerationStats(story_number, batch_progress)
+            self._attach_audio_pipeline(generator, audio_pipeline, story_number)
+            story_filename, context_tracker = generator.generate_complete_story(generator_args[0], story_number)
+            self._hand_story_to_audio_pipeline(audio_pipeline, story_number, story_filename)
+            if not story_filename:
+                raise RuntimeError("Story generation returned no story (see log above)")
+            return story_filename, context_tracker
+        
+        with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+            futures = {executor.submit(run_story, i): i for i in range(1, story_variations + 1)}
+            
+            for future in as_completed(futures):
+                story_number = futures[future]
+                try:
+                    story_filename, context_tracker = future.result()
+                    results[story_number] = (story_filename, context_tracker)
+                    batch_progress.story_finished(story_number, story_filename=story_filename)
+                    print(f"✓ Story {story_number} completed successfully!")
+                except Exception as e:
+                    # One bad story must not stop the rest of the batch
+                    batch_progress.story_finished(story_number, error=str(e))
+                    print(f"❌ Error generating story {story_number}: {e}")
         
-        print(f"\nCheck the '{self.app.stories_folder}/' folder for your generated stories.")
+        generated_stories = []
+        story_casts = []
+        for story_number in sorted(results):
+            story_filename, context_tracker = results[story_number]
+            generated_stories.append(story_filename)
+            
+            if context_tracker and narrative_consistency == "auto_tracking":
+                story_casts.append(context_tracker.get_story_cast())
         
-        if self.app.auto_generate_audio and generated_stories:
-            print(f"🎵 Audio files generated in 'audio_stories/' folder.")
+        # Per-story failure report
+        failures = batch_progress.get_failures()
+        if failures:
+            print(f"\n⚠️ {len(failures)} of {story_variations} stories failed:")
+            for story_number in sorted(failures):
+                print(f"   ❌ Story {story_number}: {failures[story_number]}")
         
-        print("\n🧠 SYSTEM PROMPT BENEFITS DELIVERED:")
-        print("   ✓ Content settings were built into AI personality from start")
-        print("   ✓ No fighting against instructions - natural storytelling")
-        print("   ✓ All stages maintained consistent personality")
+        return generated_stories, story_casts
     
     def _load_blueprint_data(self, blueprint_filename):
         """Load and parse blueprint to extract perspective and narrative style settings"""
@@ -26,6 +26,35 @@ class VariationConfigurator:
         input("\nPress Enter to continue...")
         return result
     
+    def set_parallel_workers(self, current_workers, story_variations):
+        """Set how many story variations are written at the same time"""
+        print("\n" + "="*60)
+        print("PARALLEL STORY GENERATION")
+        print("="*60)
+        print("Write several variations at once to use all of Ollama's parallel slots.")
+        print("Only useful if the Ollama server runs with OLLAMA_NUM_PARALLEL > 1.")
+        print("1 = one story after another (default)\n")
+        
+        print(f"Current: {current_workers} at once ({story_variations} {'story' if story_variations == 1 else 'stories'} planned)")
+        
+        try:
+            workers = int(input(f"Enter stories to write at once (1-8, current: {current_workers}): "))
+            if 1 <= workers <= 8:
+                print(f"✓ Will write up to {workers} {'story' if workers == 1 else 'stories'} at once")
+                result = workers
+            else:
+                print("❌ Invalid number. Must be between 1-8.")
+                result = current_workers
+        except ValueError:
+            print("❌ Invalid input.")
+            result = current_workers
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            result = current_workers
+        
+        input("\nPress Enter to continue...")
+        return result
+    
     def show_advanced_llm_settings(self, app):
         """Enhanced advanced LLM settings with token distribution controls"""
         # Initialize token distribution settings if they don't exist
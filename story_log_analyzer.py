@@ -3,9 +3,19 @@ import os
 import glob
 import re
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from ollama_client import get_ollama_client
+from generators.prompt_logger import PromptLogger
+from generators.prompt_log_reader import PromptLogReader
+
 class StoryLogAnalyzer:
+    AUDIT_FOLDER = "analysis"
+    AUDIT_REGISTRY = "audit_registry.jsonl"  # Content hashes of every exchange already analysed
+    
     def __init__(self, stories_folder, llm_settings):
         self.stories_folder = stories_folder
         self.llm_settings = llm_settings
@@ -72,24 +82,29 @@ class StoryLogAnalyzer:
     
     def analyze_selected_log(self, log_file_path):
         """Analyze a specific log file"""
-        try:
-            with open(log_file_path, 'r', encoding='utf-8') as file:
-                log_content = file.read()
-        except Exception as e:
-            print(f"❌ Error reading log file: {e}")
-            return
-    
-        # Parse the log file to extract exchanges
-        exchanges = self.parse_log_exchanges(log_content)
+        reader = PromptLogReader(log_file_path)
+        if reader.available():
+            # Structured log: list from the index, load exchanges only when selected
+            try:
+                exchanges = reader
+                summaries = reader.summaries()
+            except (OSError, ValueError) as e:
+                print(f"❌ Error reading structured log: {e}")
+                return
+        else:
+            exchanges = self._load_text_log(log_file_path)
+            if exchanges is None:
+                return
+            summaries = exchanges
     
-        if not exchanges:
+        if not summaries:
             print("❌ No valid exchanges found in log file")
             return
     
         filename = os.path.basename(log_file_path)
         print(f"\n📋 ANALYZING LOG: {filename}")
         print("="*80)
-        print(f"Found {len(exchanges)} prompt exchanges in this log file")
+        print(f"Found {len(summaries)} prompt exchanges in this log file")
         print()
         print("💡 TIP: Each exchange represents one conversation with Ollama")
         print("   (e.g., Story Bible generation, Scene Plan creation, Scene 1, Scene 2, etc.)")
@@ -97,7 +112,7 @@ class StoryLogAnalyzer:
         # Show exchange types/names
         print(f"\n🎯 SELECT WHICH EXCHANGE TO ANALYZE:")
         print("-" * 80)
-        for i, exchange in enumerate(exchanges, 1):
+        for i, exchange in enumerate(summaries, 1):
             exchange_type = exchange.get('type', 'Unknown')
             model = exchange.get('model', 'Unknown')
             tokens = exchange.get('tokens', 'Unknown')
@@ -131,6 +146,19 @@ class StoryLogAnalyzer:
         except Exception as e:
             print(f"❌ Error: {e}")
     
+    def _load_text_log(self, log_file_path):
+        """Parse an older text-only log (no .jsonl next to it); returns exchanges or None"""
+        try:
+            with open(log_file_path, 'r', encoding='utf-8') as file:
+                log_content = file.read()
+        except Exception as e:
+            print(f"❌ Error reading log file: {e}")
+            return None
+        
+        # The bible is logged once - put it back into every prompt that references it
+        log_content = PromptLogger.expand_shared_text(log_content)
+        return self.parse_log_exchanges(log_content)
+    
     def get_exchange_description(self, exchange_type):
         """Get helpful description for exchange types"""
         descriptions = {
@@ -356,15 +384,9 @@ class StoryLogAnalyzer:
         print("\n" + "="*80)
         input("Press Enter to continue...")
     
-    def run_ai_prompt_analysis(self, exchange):
-        """Use AI to analyze the prompt effectiveness"""
-        print(f"\n🤖 AI ANALYSIS OF PROMPT EFFECTIVENESS")
-        print("="*60)
-        print("Using AI to analyze this prompt exchange...")
-        print("⏳ This may take a moment...\n")
-        
-        # Create analysis prompt
-        analysis_prompt = f"""Analyze this Ollama prompt exchange for effectiveness:
+    def build_analysis_prompt(self, exchange):
+        """Prompt asking the model to review one exchange"""
+        return f"""Analyze this Ollama prompt exchange for effectiveness:
 
 SYSTEM PROMPT:
 {exchange['system_prompt']}
@@ -390,6 +412,15 @@ Please analyze and provide insights on:
 6. **Adherence Analysis**: Point out any places where Ollama ignored or misinterpreted instructions.
 
 Provide specific, actionable feedback for improving these prompts."""
+    
+    def run_ai_prompt_analysis(self, exchange):
+        """Use AI to analyze the prompt effectiveness"""
+        print(f"\n🤖 AI ANALYSIS OF PROMPT EFFECTIVENESS")
+        print("="*60)
+        print("Using AI to analyze this prompt exchange...")
+        print("⏳ This may take a moment...\n")
+        
+        analysis_prompt = self.build_analysis_prompt(exchange)
         
         # Call Ollama for analysis
         result = self.call_ollama_for_analysis(analysis_prompt)
@@ -655,14 +686,124 @@ Exchange {i}: {exchange['type']}
             except Exception as e:
                 print(f"❌ Error saving analysis: {e}")
         
+        audit_choice = input("\nRun AI analysis of every exchange (bulk audit)? (y/n): ").strip().lower()
+        if audit_choice == 'y':
+            self.run_bulk_ai_audit(exchanges, log_filename)
+        
         input("\nPress Enter to continue...")
     
+    @staticmethod
+    def exchange_content_hash(exchange):
+        """Same prompts + response = same hash, whichever log or run they came from"""
+        content = "\0".join((exchange['system_prompt'], exchange['user_prompt'], exchange['response']))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _load_audit_registry(self):
+        """{content_hash: registry record} for exchanges analysed in earlier bulk audits"""
+        registry = {}
+        path = os.path.join(self.AUDIT_FOLDER, self.AUDIT_REGISTRY)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        registry[record['hash']] = record
+                    except (json.JSONDecodeError, KeyError):
+                        continue  # Interrupted while writing the last line
+        return registry
+    
+    def run_bulk_ai_audit(self, exchanges, log_filename, max_workers=None):
+        """AI-analyse every exchange through a bounded worker pool
+        
+        Results are appended to one report per log as they finish. Exchanges whose
+        content hash is in the audit registry (this report before an interruption,
+        or any earlier report) are skipped, so re-running resumes the audit.
+        """
+        if max_workers is None:
+            workers_input = input("Parallel analysis requests (1-8, Enter = 3): ").strip()
+            max_workers = int(workers_input) if workers_input.isdigit() else 3
+        max_workers = max(1, min(8, max_workers))
+        
+        os.makedirs(self.AUDIT_FOLDER, exist_ok=True)
+        report_path = os.path.join(self.AUDIT_FOLDER, f"bulk_audit_{os.path.splitext(log_filename)[0]}.txt")
+        registry_path = os.path.join(self.AUDIT_FOLDER, self.AUDIT_REGISTRY)
+        registry = self._load_audit_registry()
+        
+        print(f"\n🔍 BULK AI AUDIT: {len(exchanges)} exchanges, {max_workers} at a time")
+        print(f"📄 Report: {report_path}")
+        if registry:
+            print(f"♻️ {len(registry)} exchange(s) already analysed in earlier audits will be skipped")
+        
+        write_lock = threading.Lock()
+        claimed = set()  # Hashes being analysed in this run (a log can repeat an exchange)
+        counts = {'analysed': 0, 'skipped': 0, 'failed': 0}
+        
+        if not os.path.exists(report_path):
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(f"BULK AI AUDIT\n{'='*60}\nSource Log: {log_filename}\n")
+                f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{'='*60}\n")
+        
+        def audit(position):
+            exchange = exchanges[position]  # Structured logs load the exchange here, in the worker
+            content_hash = self.exchange_content_hash(exchange)
+            with write_lock:
+                if content_hash in registry or content_hash in claimed:
+                    return position, exchange, 'skipped', registry.get(content_hash)
+                claimed.add(content_hash)
+            
+            result = self.call_ollama_for_analysis(self.build_analysis_prompt(exchange))
+            if result.startswith("Error:"):
+                with write_lock:
+                    claimed.discard(content_hash)  # Retried on the next run
+                return position, exchange, 'failed', result
+            
+            record = {
+                'hash': content_hash, 'log': log_filename, 'exchange': position + 1,
+                'type': exchange['type'], 'report': report_path,
+                'analysed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            with write_lock:
+                # Report first, then registry: a crash in between only means one re-analysis
+                with open(report_path, 'a', encoding='utf-8') as f:
+                    f.write(f"\n\nEXCHANGE {position + 1}: {exchange['type']}\n")
+                    f.write(f"Model: {exchange['model']} | Tokens: {exchange['tokens']} | Hash: {content_hash[:12]}\n")
+                    f.write("-" * 60 + "\n")
+                    f.write(result.strip() + "\n")
+                with open(registry_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                registry[content_hash] = record
+            return position, exchange, 'analysed', None
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [executor.submit(audit, position) for position in range(len(exchanges))]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    position, exchange, status, detail = future.result()
+                except Exception as e:
+                    counts['failed'] += 1
+                    print(f"   ❌ [{done}/{len(futures)}] Error: {e}")
+                    continue
+                counts[status] += 1
+                if status == 'analysed':
+                    print(f"   ✅ [{done}/{len(futures)}] Exchange {position + 1}: {exchange['type']}")
+                elif status == 'skipped':
+                    source = os.path.basename(detail['report']) if detail else "this run"
+                    print(f"   ⏭️ [{done}/{len(futures)}] Exchange {position + 1}: already analysed ({source})")
+                else:
+                    print(f"   ❌ [{done}/{len(futures)}] Exchange {position + 1}: {detail}")
+        except KeyboardInterrupt:
+            print("\n⏹️ Audit interrupted - finishing requests in flight, run it again to resume")
+            for future in futures:
+                future.cancel()
+        finally:
+            executor.shutdown(wait=True)
+        
+        print(f"\n📊 Audit: {counts['analysed']} analysed | {counts['skipped']} skipped | {counts['failed']} failed")
+        print(f"📄 Report: {report_path}")
+    
     def call_ollama_for_analysis(self, prompt):
         """Call Ollama to analyze prompts"""
-        import requests
-        
-        url = "http://localhost:11434/api/generate"
-        
         system_prompt = "You are an expert prompt engineer and AI interaction analyst. You specialize in evaluating the effectiveness of AI prompts and responses, identifying areas for improvement, and providing actionable feedback for better AI interactions."
         
         full_prompt = f"System: {system_prompt}\n\nUser: {prompt}\n\nAssistant:"
@@ -681,9 +822,7 @@ Exchange {i}: {exchange['type']}
         }
         
         try:
-            response = requests.post(url, json=data, timeout=120)
-            response.raise_for_status()
-            result = response.json()
+            result = get_ollama_client().generate(data, timeout=120)
             return result.get("response", "No response generated")
         except Exception as e:
             return f"Error: {e}"
@@ -0,0 +1,125 @@
+from typing import Dict, Any, Iterable, Optional
+
+
+class TokenMetrics:
+    """Token counts and timings measured by Ollama for one or more calls.
+
+    Built from the final response (or final streamed chunk), which carries
+    prompt_eval_count / eval_count and the matching durations in nanoseconds.
+    Instances add together so per-scene, per-stage and per-story totals use
+    the same object.
+    """
+
+    COUNT_FIELDS = ("prompt_eval_count", "eval_count")
+    DURATION_FIELDS = ("prompt_eval_duration", "eval_duration", "load_duration", "total_duration")
+
+    def __init__(self, prompt_eval_count: int = 0, eval_count: int = 0,
+                 prompt_eval_duration: int = 0, eval_duration: int = 0,
+                 load_duration: int = 0, total_duration: int = 0,
+                 calls: int = 0, cached_calls: int = 0, stage: Optional[str] = None):
+        self.prompt_eval_count = prompt_eval_count
+        self.eval_count = eval_count
+        self.prompt_eval_duration = prompt_eval_duration  # nanoseconds
+        self.eval_duration = eval_duration
+        self.load_duration = load_duration
+        self.total_duration = total_duration
+        self.calls = calls
+        self.cached_calls = cached_calls  # served from the response cache, not timed
+        self.stage = stage
+
+    @classmethod
+    def from_response(cls, result: Optional[Dict[str, Any]], stage: Optional[str] = None, cached: bool = False):
+        """Read Ollama's metrics from a /api/generate or /api/chat result"""
+        result = result or {}
+        if cached:
+            # Counts are still real, but the timings belong to the original run
+            return cls(
+                prompt_eval_count=result.get("prompt_eval_count", 0) or 0,
+                eval_count=result.get("eval_count", 0) or 0,
+                calls=1, cached_calls=1, stage=stage
+            )
+        values = {field: result.get(field, 0) or 0 for field in cls.COUNT_FIELDS + cls.DURATION_FIELDS}
+        return cls(calls=1, stage=stage, **values)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]):
+        """Rebuild from to_dict() output (e.g. a checkpoint)"""
+        if not data:
+            return cls()
+        fields = cls.COUNT_FIELDS + cls.DURATION_FIELDS + ("calls", "cached_calls", "stage")
+        return cls(**{field: data[field] for field in fields if field in data})
+
+    @classmethod
+    def combine(cls, metrics_list: Iterable["TokenMetrics"], stage: Optional[str] = None):
+        total = cls(stage=stage)
+        for metrics in metrics_list:
+            if metrics:
+                total += metrics
+        return total
+
+    def __add__(self, other: "TokenMetrics") -> "TokenMetrics":
+        return TokenMetrics(
+            prompt_eval_count=self.prompt_eval_count + other.prompt_eval_count,
+            eval_count=self.eval_count + other.eval_count,
+            prompt_eval_duration=self.prompt_eval_duration + other.prompt_eval_duration,
+            eval_duration=self.eval_duration + other.eval_duration,
+            load_duration=self.load_duration + other.load_duration,
+            total_duration=self.total_duration + other.total_duration,
+            calls=self.calls + other.calls,
+            cached_calls=self.cached_calls + other.cached_calls,
+            stage=self.stage if self.stage == other.stage else None,
+        )
+
+    @property
+    def has_data(self) -> bool:
+        return bool(self.prompt_eval_count or self.eval_count)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_eval_count + self.eval_count
+
+    @property
+    def prefill_tokens_per_second(self) -> float:
+        """Prompt processing throughput"""
+        if not self.prompt_eval_duration:
+            return 0.0
+        return self.prompt_eval_count / (self.prompt_eval_duration / 1e9)
+
+    @property
+    def decode_tokens_per_second(self) -> float:
+        """Generation throughput"""
+        if not self.eval_duration:
+            return 0.0
+        return self.eval_count / (self.eval_duration / 1e9)
+
+    @property
+    def load_seconds(self) -> float:
+        return self.load_duration / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_eval_count": self.prompt_eval_count,
+            "eval_count": self.eval_count,
+            "prompt_eval_duration": self.prompt_eval_duration,
+            "eval_duration": self.eval_duration,
+            "load_duration": self.load_duration,
+            "total_duration": self.total_duration,
+            "calls": self.calls,
+            "cached_calls": self.cached_calls,
+            "stage": self.stage,
+            "prefill_tokens_per_second": round(self.prefill_tokens_per_second, 2),
+            "decode_tokens_per_second": round(self.decode_tokens_per_second, 2),
+        }
+
+    def summary(self) -> str:
+        """One-line human readable summary"""
+        parts = [f"prompt {self.prompt_eval_count:,} tok", f"generated {self.eval_count:,} tok"]
+        if self.prefill_tokens_per_second:
+            parts.append(f"prefill {self.prefill_tokens_per_second:.1f} tok/s")
+        if self.decode_tokens_per_second:
+            parts.append(f"decode {self.decode_tokens_per_second:.1f} tok/s")
+        if self.load_duration >= 1e8:  # Only worth showing when the model actually loaded
+            parts.append(f"load {self.load_seconds:.1f}s")
+        if self.cached_calls:
+            parts.append(f"{self.cached_calls} cached")
+        return " | ".join(parts)
@@ -0,0 +1,165 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+DEFAULT_AUDIO_CACHE_FOLDER = "multiscene/audio/cache"
+
+
+class TTSAudioCache:
+    """Content-addressed cache of synthesized TTS chunks.
+
+    Each WAV is stored as ``<sha256>.wav`` where the hash covers the text, a
+    hash of the reference audio file and every TTS setting that changes the
+    sound (reference text, NFE, speed, remove silence). Re-voicing an edited
+    story only sends the chunks whose text changed to the server. The folder is kept
+    under ``max_bytes``, evicting the least recently used files. Sizes and
+    recency are kept in an in-memory index, read from the folder once per
+    session (a hit also refreshes the file mtime, so the order survives
+    restarts).
+    """
+
+    def __init__(self, cache_folder: str = DEFAULT_AUDIO_CACHE_FOLDER, max_bytes: int = 500 * 1024 * 1024,
+                 enabled: bool = True):
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._file_hashes = {}  # (path, mtime, size) -> sha256 of the file
+        self._lock = threading.Lock()
+        self._index = None  # key -> file size, least recently used first
+        self._total_bytes = 0
+
+    def _load_index(self):
+        """Read the folder once: every WAV's size, ordered by mtime (call with the lock held)"""
+        if self._index is not None:
+            return
+        entries = sorted((mtime, os.path.basename(path)[:-len(".wav")], size)
+                         for path, size, mtime in self._entries())
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+
+    def file_hash(self, path: str) -> str:
+        """sha256 of a file's content, remembered while the file is unchanged"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+        if key not in self._file_hashes:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            self._file_hashes[key] = digest.hexdigest()
+        return self._file_hashes[key]
+
+    @staticmethod
+    def make_key(text: str, reference_hash: str, params: Dict[str, Any]) -> str:
+        encoded = json.dumps({"text": text, "reference": reference_hash, "params": params},
+                             sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_folder, f"{key}.wav")
+
+    def contains(self, key: str) -> bool:
+        """True if the key is cached (doesn't count as a hit or refresh it)"""
+        return self.enabled and os.path.exists(self._path(key))
+
+    def get(self, key: str, dest_path: str) -> Optional[str]:
+        """Copy the cached WAV for this key to dest_path; returns dest_path, or None on a miss
+
+        The caller gets its own copy, so evicting the entry afterwards can't
+        pull the file from under it.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            os.utime(path)  # Mark as recently used
+            shutil.copyfile(path, dest_path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._load_index()
+            if key in self._index:
+                self._index.move_to_end(key)
+        return dest_path
+
+    def put(self, key: str, source_path: str):
+        """Copy a synthesized WAV into the cache and evict old entries if over the size cap"""
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            path = self._path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            shutil.copyfile(source_path, temp_path)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+            with self._lock:
+                self._load_index()
+                self._total_bytes += size - self._index.pop(key, 0)
+                self._index[key] = size
+                self._evict()
+        except OSError as e:
+            print(f"⚠️ Could not write TTS audio cache: {e}")
+
+    def _entries(self):
+        """[(path, size, mtime)] of the cached WAVs"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_folder)
+        except OSError:
+            return entries
+        for name in names:
+            if name.endswith(".wav"):
+                path = os.path.join(self.cache_folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used WAVs until the folder is under max_bytes (call with the lock held)"""
+        while self._index and self._total_bytes > self.max_bytes:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> int:
+        """Delete every cached WAV; returns the number removed"""
+        removed = 0
+        with self._lock:
+            self._index = None
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_index()
+            entries, total_bytes = len(self._index), self._total_bytes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "size_mb": total_bytes / (1024 * 1024),
+            "max_mb": self.max_bytes / (1024 * 1024),
+            "enabled": self.enabled,
+        }
@@ -0,0 +1,153 @@
+import os
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# Two-sided 95% Student t values by degrees of freedom (normal value beyond 30)
+T_95 = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31, 9: 2.26,
+        10: 2.23, 12: 2.18, 15: 2.13, 20: 2.09, 25: 2.06, 30: 2.04}
+
+
+def _t_value(degrees_of_freedom: int) -> float:
+    for df in sorted(T_95, reverse=True):
+        if degrees_of_freedom >= df:
+            return T_95[df] if degrees_of_freedom <= 30 else 1.96
+    return T_95[1]
+
+
+class TTSDurationModel:
+    """Persistent model of how long F5-TTS takes for a text.
+
+    Every finished synthesis is stored as a (characters, seconds) sample under
+    a key for the settings that change the speed: server, NFE steps, speed and
+    how the text is sent (one request or N parallel chunks). Estimates fit
+    ``seconds = overhead + per_char * characters`` with least squares over all
+    samples of that key and come with a 95% prediction interval. With too few
+    samples (or no numpy) the estimate is the average seconds per character.
+    """
+
+    MAX_SAMPLES_PER_KEY = 500  # Oldest samples dropped first
+    MIN_SAMPLES_FOR_FIT = 3
+
+    def __init__(self, path: str):
+        self.path = path
+        self._samples: Dict[str, List[List[float]]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(server_url: str, nfe: int, speed: float, parallel_chunks: int = 1) -> str:
+        mode = f"chunks x{parallel_chunks}" if parallel_chunks and parallel_chunks > 1 else "single"
+        return f"{server_url} | nfe={nfe} | speed={float(speed):g} | {mode}"
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._samples = json.load(f).get("samples", {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            self._samples = {}
+
+    def _save(self):
+        data = {"updated": time.strftime("%Y-%m-%d %H:%M:%S"), "samples": self._samples}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save TTS timing model: {e}")
+
+    def record(self, key: str, char_count: int, seconds: float):
+        """Add a finished run and persist it"""
+        if char_count <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append([int(char_count), round(float(seconds), 3)])
+            del samples[:-self.MAX_SAMPLES_PER_KEY]
+            self._save()
+
+    def import_samples(self, key: str, samples) -> int:
+        """Merge old (chars, seconds) pairs, e.g. the former f5tts_timing_data setting"""
+        added = 0
+        with self._lock:
+            known = {tuple(sample) for sample in self._samples.get(key, [])}
+            for sample in samples or []:
+                try:
+                    char_count, seconds = int(sample[0]), float(sample[1])
+                except (TypeError, ValueError, IndexError):
+                    continue
+                if (char_count, seconds) not in known and char_count > 0 and seconds > 0:
+                    self._samples.setdefault(key, []).append([char_count, seconds])
+                    known.add((char_count, seconds))
+                    added += 1
+            if added:
+                self._save()
+        return added
+
+    def sample_count(self, key: str) -> int:
+        return len(self._samples.get(key, []))
+
+    def fit(self, key: str) -> Optional[Dict[str, float]]:
+        """Least-squares line for a key: overhead, per_char, residual std error and the fit data"""
+        samples = self._samples.get(key, [])
+        if not NUMPY_AVAILABLE or len(samples) < self.MIN_SAMPLES_FOR_FIT:
+            return None
+
+        data = np.asarray(samples, dtype=float)
+        chars, seconds = data[:, 0], data[:, 1]
+        if np.ptp(chars) == 0:
+            return None  # All runs had the same length - slope is undefined
+
+        design = np.column_stack([np.ones_like(chars), chars])
+        coefficients, _, _, _ = np.linalg.lstsq(design, seconds, rcond=None)
+        residuals = seconds - design @ coefficients
+        degrees_of_freedom = len(samples) - 2
+        residual_std = float(np.sqrt(residuals @ residuals / degrees_of_freedom)) if degrees_of_freedom else 0.0
+        return {
+            "overhead": float(coefficients[0]),
+            "per_char": float(coefficients[1]),
+            "residual_std": residual_std,
+            "degrees_of_freedom": degrees_of_freedom,
+            "xtx_inverse": np.linalg.inv(design.T @ design),
+            "samples": len(samples),
+        }
+
+    def estimate(self, key: str, char_count: int) -> Optional[Tuple[float, Optional[float], Optional[float]]]:
+        """(seconds, low, high) for a text of char_count characters; low/high are None without a fit"""
+        fit = self.fit(key)
+        if fit:
+            point = np.array([1.0, float(char_count)])
+            predicted = fit["overhead"] + fit["per_char"] * char_count
+            if fit["degrees_of_freedom"] > 0:
+                spread = fit["residual_std"] * np.sqrt(1.0 + point @ fit["xtx_inverse"] @ point)
+                margin = _t_value(fit["degrees_of_freedom"]) * float(spread)
+            else:
+                margin = 0.0
+            return max(predicted, 0.0), max(predicted - margin, 0.0), predicted + margin
+
+        samples = self._samples.get(key, [])
+        if not samples:
+            return None
+        total_chars = sum(sample[0] for sample in samples)
+        total_seconds = sum(sample[1] for sample in samples)
+        return total_seconds / total_chars * char_count, None, None
+
+    def describe(self, key: str) -> str:
+        """One line about the current fit for a key"""
+        fit = self.fit(key)
+        if fit:
+            return (f"{fit['overhead']:.1f}s + {fit['per_char'] * 1000:.1f}s per 1k chars "
+                    f"(±{fit['residual_std']:.1f}s, {fit['samples']} runs)")
+        count = self.sample_count(key)
+        return f"average speed from {count} run(s)" if count else "no runs yet"
@@ -0,0 +1,120 @@
+import threading
+import time
+
+
+class TTSServerPool:
+    """Spreads F5-TTS requests over several servers.
+
+    acquire() hands out the healthy server with the fewest requests in flight
+    (least outstanding requests); release() records how the request went.
+    A server that stops answering its health probe is taken out of rotation
+    and probed again after RETRY_DEAD_AFTER seconds. Per-server counts and
+    busy time give the throughput shown in the F5-TTS menu.
+    """
+
+    RETRY_DEAD_AFTER = 60  # Seconds before a dead server is probed again
+
+    def __init__(self, probe):
+        """probe(url) -> True if the server answers"""
+        self.probe = probe
+        self._servers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_stats():
+        return {
+            'healthy': True, 'outstanding': 0, 'completed': 0, 'failed': 0,
+            'chars': 0, 'busy_seconds': 0.0, 'dead_since': None, 'requeued': 0
+        }
+
+    def set_servers(self, urls):
+        """Use these URLs (in order); stats of servers that stay in the pool are kept"""
+        with self._lock:
+            self._servers = {url: self._servers.get(url) or self._new_stats() for url in dict.fromkeys(urls) if url}
+
+    @property
+    def urls(self):
+        return list(self._servers)
+
+    def healthy_count(self):
+        with self._lock:
+            return sum(1 for stats in self._servers.values() if stats['healthy'])
+
+    def acquire(self):
+        """URL of the healthy server with the fewest requests in flight"""
+        self._revive_dead_servers()
+        with self._lock:
+            healthy = [url for url, stats in self._servers.items() if stats['healthy']]
+            if not healthy:
+                raise RuntimeError("No F5-TTS server in the pool is reachable")
+            # Ties go to the server that has done the least work so far
+            url = min(healthy, key=lambda u: (self._servers[u]['outstanding'], self._servers[u]['completed']))
+            self._servers[url]['outstanding'] += 1
+            return url
+
+    def release(self, url, chars=0, seconds=0.0, ok=True):
+        with self._lock:
+            stats = self._servers.get(url)
+            if not stats:
+                return  # Removed from the pool while the request ran
+            stats['outstanding'] = max(0, stats['outstanding'] - 1)
+            if ok:
+                stats['completed'] += 1
+                stats['chars'] += chars
+                stats['busy_seconds'] += seconds
+            else:
+                stats['failed'] += 1
+
+    def check_failed_server(self, url):
+        """After a failed request: True if the server is down (its work should go elsewhere)"""
+        if self.probe(url):
+            return False
+        with self._lock:
+            stats = self._servers.get(url)
+            if stats and stats['healthy']:
+                stats['healthy'] = False
+                stats['dead_since'] = time.time()
+                print(f"⚠️ F5-TTS server {url} is not responding - moving its work to the other servers")
+            if stats:
+                stats['requeued'] += 1
+        return True
+
+    def probe_all(self):
+        """Probe every server now; returns {url: healthy}"""
+        results = {url: bool(self.probe(url)) for url in self.urls}
+        with self._lock:
+            for url, healthy in results.items():
+                stats = self._servers.get(url)
+                if stats:
+                    stats['healthy'] = healthy
+                    stats['dead_since'] = None if healthy else (stats['dead_since'] or time.time())
+        return results
+
+    def _revive_dead_servers(self):
+        with self._lock:
+            now = time.time()
+            due = [url for url, stats in self._servers.items()
+                   if not stats['healthy'] and now - (stats['dead_since'] or 0) >= self.RETRY_DEAD_AFTER]
+            # Nothing healthy left - don't wait for the retry interval
+            if not any(stats['healthy'] for stats in self._servers.values()):
+                due = [url for url, stats in self._servers.items() if not stats['healthy']]
+            for url in due:
+                self._servers[url]['dead_since'] = now  # One prober at a time
+
+        for url in due:
+            if self.probe(url):
+                with self._lock:
+                    if url in self._servers:
+                        self._servers[url].update(healthy=True, dead_since=None)
+                print(f"✅ F5-TTS server {url} is back")
+
+    def show_stats(self):
+        """Print per-server health and throughput"""
+        with self._lock:
+            servers = {url: dict(stats) for url, stats in self._servers.items()}
+        print(f"{'Server':<32} {'Status':<6} {'Busy':>4} {'Done':>5} {'Failed':>6} {'Moved':>5} {'Chars/s':>8}")
+        for url, stats in servers.items():
+            rate = stats['chars'] / stats['busy_seconds'] if stats['busy_seconds'] else 0
+            status = "up" if stats['healthy'] else "down"
+            print(f"{url[:32]:<32} {status:<6} {stats['outstanding']:>4} {stats['completed']:>5} "
+                  f"{stats['failed']:>6} {stats['requeued']:>5} {rate:>8.1f}")